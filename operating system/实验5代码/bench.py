@@ -0,0 +1,256 @@
+"""调度器性能基准与回归检查
+
+在本目录下运行：
+    python -m bench run -o baseline.json
+    python -m bench run --sizes 1000,10000 -a FCFS,RR,MLFQ --repeat 3 -o current.json
+    python -m bench compare baseline.json current.json --threshold 0.1
+
+每个 (算法, 规模) 在单独启动的子进程中运行，负载由固定种子的 workload.generate 生成，
+计时只包含 run() 本身（取 repeat 次中最快的一次），另外记录每秒处理的事件数和子进程的峰值常驻内存。
+结果保存为 JSON 基线；compare 比较两份结果，耗时或内存超过阈值的组合判为退化，退出码为 1。
+全程不创建窗口，MLFQ 使用 silent 日志级别且不画图。
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+from scheduler_cli import ALGORITHMS
+from workload import generate
+
+SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+BENCH_ALGORITHMS = ALGORITHMS + ["MLFQ"]
+SEED = 20240601
+LOAD = 0.9
+# MLFQScheduler 逐个时间片推进，10^6 个作业约需 10 秒；需要更快的基准时可以调小
+MLFQ_MAX_SIZE = 10 ** 6
+
+
+def peak_rss_mb():
+    """当前进程的峰值常驻内存（MB），平台不支持时返回 None"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        peak = getattr(info, 'peak_wset', None)  # Windows
+        return (peak if peak is not None else info.rss) / 2 ** 20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位为 KB，macOS 为字节
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 1024
+
+
+def _time_mlfq(workload):
+    from mlfq import MLFQScheduler
+
+    # 只计调度本身：不输出、不保存队列快照、不画图
+    scheduler = MLFQScheduler(log_level="silent", visualize=False)
+    workload.add_to(scheduler)
+    start = time.perf_counter()
+    scheduler.run()
+    seconds = time.perf_counter() - start
+    return seconds, scheduler.events_handled
+
+
+def _time_simulator(workload, algorithm, quantum):
+    from simulator import SchedulerSimulator
+
+    sim = SchedulerSimulator(workload.processes(), algorithm, quantum, timeline="off", record_gantt=False)
+    start = time.perf_counter()
+    sim.run()
+    seconds = time.perf_counter() - start
+    # FCFS/SJF 走向量化求解时不逐个处理事件，按等价的到达/开始/完成 3 个事件计
+    events = sim.events_handled or 3 * len(workload)
+    return seconds, events
+
+
+def run_case(algorithm, size, repeat=1, quantum=2):
+    """在当前进程中测一个 (算法, 规模) 组合，返回结果字典"""
+    workload = generate(size, seed=SEED, load=LOAD, integer=True)
+    best = None
+    for _ in range(repeat):
+        if algorithm == "MLFQ":
+            seconds, events = _time_mlfq(workload)
+        else:
+            seconds, events = _time_simulator(workload, algorithm, quantum)
+        if best is None or seconds < best[0]:
+            best = (seconds, events)
+    seconds, events = best
+    return {
+        'algorithm': algorithm,
+        'size': size,
+        'seconds': seconds,
+        'events': events,
+        'events_per_sec': events / seconds if seconds > 0 else None,
+        'processes_per_sec': size / seconds if seconds > 0 else None,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def run_suite(algorithms=BENCH_ALGORITHMS, sizes=SIZES, repeat=1, quantum=2, mlfq_max_size=MLFQ_MAX_SIZE,
+              progress=None):
+    """依次在独立的子进程中运行各组合（峰值内存互不影响，也不会并行争用 CPU）"""
+    results = []
+    context = get_context('spawn')
+    for size in sizes:
+        for algorithm in algorithms:
+            if algorithm == "MLFQ" and size > mlfq_max_size:
+                continue
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                try:
+                    result = pool.submit(run_case, algorithm, size, repeat, quantum).result()
+                except ImportError as e:
+                    # 缺少依赖的组合跳过
+                    print(f"跳过 {algorithm}: {e}", file=sys.stderr)
+                    continue
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return {
+        'version': 1,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'numpy': np.__version__,
+        'seed': SEED,
+        'load': LOAD,
+        'repeat': repeat,
+        'quantum': quantum,
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=0.1, rss_threshold=0.25, min_seconds=0.05):
+    """逐个组合比较耗时和峰值内存，返回 (比较行列表, 是否有退化)
+
+    两次耗时都短于 min_seconds 的组合计时噪声太大，只比较内存。
+    """
+    old = {(r['algorithm'], r['size']): r for r in baseline['results']}
+    rows = []
+    regressed = False
+    for r in current['results']:
+        key = (r['algorithm'], r['size'])
+        base = old.get(key)
+        if base is None:
+            rows.append({'algorithm': key[0], 'size': key[1], 'status': 'new'})
+            continue
+        ratio = r['seconds'] / base['seconds'] if base['seconds'] > 0 else 1.0
+        rss_ratio = None
+        if r['peak_rss_mb'] and base['peak_rss_mb']:
+            rss_ratio = r['peak_rss_mb'] / base['peak_rss_mb']
+        timed = max(r['seconds'], base['seconds']) >= min_seconds
+        if timed and ratio > 1 + threshold:
+            status = 'slower'
+        elif rss_ratio is not None and rss_ratio > 1 + rss_threshold:
+            status = 'memory'
+        elif timed and ratio < 1 - threshold:
+            status = 'faster'
+        else:
+            status = 'ok'
+        regressed = regressed or status in ('slower', 'memory')
+        rows.append({'algorithm': key[0], 'size': key[1], 'status': status,
+                     'baseline_seconds': base['seconds'], 'seconds': r['seconds'], 'time_ratio': ratio,
+                     'baseline_rss_mb': base['peak_rss_mb'], 'peak_rss_mb': r['peak_rss_mb'],
+                     'rss_ratio': rss_ratio})
+    return rows, regressed
+
+
+def _format(value, spec):
+    return '-' if value is None else format(value, spec)
+
+
+def format_result(r):
+    return (f"{r['algorithm']:<10}{r['size']:>9}  {r['seconds']:>9.3f}s  "
+            f"{_format(r['events_per_sec'], ',.0f'):>14} 事件/秒  {_format(r['peak_rss_mb'], '.1f'):>8} MB")
+
+
+def format_comparison(rows):
+    lines = [f"{'algorithm':<10}{'size':>9}  {'baseline':>10}  {'current':>10}  {'time':>7}  {'rss':>7}  status"]
+    for row in rows:
+        if row['status'] == 'new':
+            lines.append(f"{row['algorithm']:<10}{row['size']:>9}  {'-':>10}  {'-':>10}  {'-':>7}  {'-':>7}  new")
+            continue
+        lines.append(f"{row['algorithm']:<10}{row['size']:>9}  {row['baseline_seconds']:>9.3f}s  "
+                     f"{row['seconds']:>9.3f}s  {row['time_ratio']:>6.2f}x  {_format(row['rss_ratio'], '>6.2f')}x  "
+                     f"{row['status']}")
+    return '\n'.join(lines)
+
+
+def _parse_list(text, convert, choices=None):
+    items = [item.strip() for item in text.split(',') if item.strip()]
+    if choices is not None and items == ['all']:
+        return list(choices)
+    values = []
+    for item in items:
+        value = convert(item)
+        if choices is not None and value not in choices:
+            raise argparse.ArgumentTypeError(f"未知的算法: {item}")
+        values.append(value)
+    return values
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench', description='调度器性能基准与回归检查')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='运行基准并保存 JSON 结果')
+    run.add_argument('-a', '--algorithms', default='all',
+                     type=lambda s: _parse_list(s, str.upper, BENCH_ALGORITHMS),
+                     help='逗号分隔的算法列表或 all（含 MLFQ），默认 all')
+    run.add_argument('--sizes', default=','.join(str(s) for s in SIZES),
+                     type=lambda s: _parse_list(s, lambda x: int(float(x))),
+                     help='逗号分隔的进程数，默认 1000,10000,100000,1000000')
+    run.add_argument('--repeat', type=int, default=1, help='每个组合重复次数，取最快一次，默认 1')
+    run.add_argument('-q', '--quantum', type=int, default=2, help='RR 时间片大小，默认 2')
+    run.add_argument('--mlfq-max-size', type=int, default=MLFQ_MAX_SIZE,
+                     help=f'MLFQ 测试的最大规模，默认 {MLFQ_MAX_SIZE}')
+    run.add_argument('-o', '--output', default='-', help='结果 JSON 文件，默认标准输出')
+
+    cmp = commands.add_parser('compare', help='比较两份结果，有退化时退出码为 1')
+    cmp.add_argument('baseline', help='基线 JSON')
+    cmp.add_argument('current', help='本次 JSON')
+    cmp.add_argument('--threshold', type=float, default=0.1, help='耗时增加超过该比例判为退化，默认 0.1')
+    cmp.add_argument('--rss-threshold', type=float, default=0.25, help='峰值内存增加超过该比例判为退化，默认 0.25')
+    cmp.add_argument('--min-seconds', type=float, default=0.05, help='耗时都短于该值的组合不比较耗时，默认 0.05')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        if args.repeat < 1 or args.quantum < 1 or not args.sizes or min(args.sizes) < 1:
+            parser.error("规模、重复次数和时间片必须是正整数")
+        report = run_suite(args.algorithms, args.sizes, args.repeat, args.quantum, args.mlfq_max_size,
+                           progress=lambda r: print(format_result(r), file=sys.stderr, flush=True))
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+        if args.output == '-':
+            print(text)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+        return 0
+
+    try:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.current, encoding='utf-8') as f:
+            current = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+    rows, regressed = compare(baseline, current, args.threshold, args.rss_threshold, args.min_seconds)
+    print(format_comparison(rows))
+    if regressed:
+        print("发现性能退化", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
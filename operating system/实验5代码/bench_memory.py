@@ -0,0 +1,91 @@
+"""进程/事件表示的内存对比
+
+在本目录下运行：
+    python -m bench_memory -n 1000000
+
+分别统计原先的 Process（带 __dict__ 和每个进程两个空的区间列表）与现在 __slots__ 版本
+（区间记录在 GanttTable 中，字段更多）每个进程占用的字节数，
+以及事件堆条目 (时间, 序号, Event 对象) 与 (时间, 序号, 事件类型, 进程号) 元组的字节数。
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from simulator import Process
+
+
+class DictProcess:
+    """改动前的进程表示：带 __dict__，并且每个进程有自己的运行区间、等待区间列表"""
+
+    def __init__(self, name, arrival, burst, priority=0):
+        self.name = name
+        self.arrival = arrival
+        self.burst = burst
+        self.priority = priority
+        self.start_time = -1
+        self.finish_time = -1
+        self.remaining = burst
+        self.last_run = arrival
+        self.response_ratio = 0.0
+        self.running_intervals = []  # 记录进程运行的时间区间
+        self.waiting_intervals = []  # 记录进程等待的时间区间
+
+
+class DictEvent:
+    """改动前的事件表示"""
+
+    def __init__(self, time, event_type, process):
+        self.time = time
+        self.type = event_type
+        self.process = process
+
+    def __lt__(self, other):
+        return self.time < other.time
+
+
+def bytes_per_item(make, n):
+    """创建 n 个对象并保留引用，返回平均每个对象新分配的字节数（不含保存它们的列表）"""
+    gc.collect()
+    tracemalloc.start()
+    items = [None] * n
+    base = tracemalloc.get_traced_memory()[0]
+    for i in range(n):
+        items[i] = make(i)
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del items
+    return used / n
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench_memory', description='进程/事件表示的内存对比')
+    parser.add_argument('-n', type=int, default=200000, help='创建的对象个数，默认 200000')
+    args = parser.parse_args(argv)
+    n = args.n
+
+    def named(cls):
+        # 进程名等字段在两种表示下相同，这里同样计入
+        return lambda i: cls(f"P{i}", i, i % 97 + 1, i % 5)
+
+    procs = [DictProcess(f"P{i}", i, 1) for i in range(n)]
+
+    def old_event(i):
+        t = i * 3
+        return t, i, DictEvent(t, 1, procs[i])
+
+    rows = [
+        ('Process (__dict__ + 区间列表)', bytes_per_item(named(DictProcess), n)),
+        ('Process (__slots__)', bytes_per_item(named(Process), n)),
+        ('事件 (time, seq, Event)', bytes_per_item(old_event, n)),
+        ('事件 (time, seq, type, pid)', bytes_per_item(lambda i: (i * 3, i, 1, i), n)),
+    ]
+    print(f"对象个数: {n}  (Python {sys.version.split()[0]})")
+    for label, size in rows:
+        print(f"{label:<32}{size:>8.1f} 字节/个")
+    print(f"进程节省 {1 - rows[1][1] / rows[0][1]:.0%}，事件节省 {1 - rows[3][1] / rows[2][1]:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+from ready_queue import nice_weight
+
+
+class FairnessLedger:
+    """CFS 公平性统计：比较每个进程实际得到的 CPU 份额与按权重应得的份额
+
+    理想的按权重共享下，进程 i 在 [t, t+dt) 内应得 w_i / W(t) * dt 的 CPU 时间，W(t) 为系统中
+    所有未完成进程的权重之和。维护累计量 G(t) = ∫ dt / W(t)，进程应得的 CPU 时间即
+    w_i * (G(完成) - G(到达))，每个事件只需 O(1) 更新。
+    keep_tasks 为 False 时只保留汇总量，适合流式运行。
+    """
+
+    def __init__(self, keep_tasks=True):
+        self.clock = 0.0  # G(t)
+        self.weight = 0  # W(t)
+        self.last_time = None
+        self._joined = {}  # 进程号 -> 到达时的 G
+        self.keep_tasks = keep_tasks
+        self.tasks = []
+        # 份额比值的汇总：个数、和、平方和、最小值、最大值
+        self.count = 0
+        self.ratio_sum = 0.0
+        self.ratio_square_sum = 0.0
+        self.min_ratio = None
+        self.max_ratio = None
+
+    def advance(self, now):
+        if self.last_time is not None and self.weight > 0:
+            self.clock += (now - self.last_time) / self.weight
+        self.last_time = now
+
+    def join(self, p):
+        self._joined[p.pid] = self.clock
+        self.weight += nice_weight(p.priority)
+
+    def leave(self, p):
+        """进程完成，记录它的实际份额和应得份额"""
+        weight = nice_weight(p.priority)
+        self.weight -= weight
+        span = p.finish_time - p.arrival
+        expected = weight * (self.clock - self._joined.pop(p.pid)) / span
+        actual = p.burst / span
+        ratio = actual / expected if expected > 0 else 1.0
+        self.count += 1
+        self.ratio_sum += ratio
+        self.ratio_square_sum += ratio * ratio
+        self.min_ratio = ratio if self.min_ratio is None else min(self.min_ratio, ratio)
+        self.max_ratio = ratio if self.max_ratio is None else max(self.max_ratio, ratio)
+        if self.keep_tasks:
+            self.tasks.append({
+                'name': p.name,
+                'weight': weight,
+                'cpu_share': actual,
+                'expected_share': expected,
+                'ratio': ratio,
+            })
+
+    def jain_index(self):
+        """份额比值的 Jain 公平性指数 (Σx)² / (n·Σx²)，完全公平时为 1"""
+        if self.ratio_square_sum <= 0:
+            return 1.0
+        return self.ratio_sum ** 2 / (self.count * self.ratio_square_sum)
+
+    def report(self):
+        """每个进程的份额明细，以及份额比值的最小值、最大值和 Jain 公平性指数"""
+        return {
+            'tasks': self.tasks,
+            'min_ratio': self.min_ratio if self.count else 1.0,
+            'max_ratio': self.max_ratio if self.count else 1.0,
+            'jain_index': self.jain_index(),
+        }
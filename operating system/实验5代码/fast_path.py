@@ -0,0 +1,180 @@
+import heapq
+from collections.abc import Sequence
+
+import numpy as np
+
+from gantt import RUNNING, WAITING, GanttTable
+
+# 可以用闭式递推直接求解的非抢占算法
+VECTORIZED_ALGORITHMS = ("FCFS", "SJF")
+
+
+def _as_arrays(arrival, burst):
+    arrival = np.asarray(arrival)
+    burst = np.asarray(burst)
+    if arrival.shape != burst.shape or arrival.ndim != 1:
+        raise ValueError("arrival 和 burst 必须是长度相同的一维数组")
+    # 全为整数时用 int64 保证与事件驱动仿真的结果逐位一致
+    if np.issubdtype(arrival.dtype, np.integer) and np.issubdtype(burst.dtype, np.integer):
+        dtype = np.int64
+    else:
+        dtype = np.float64
+    return arrival.astype(dtype, copy=False), burst.astype(dtype, copy=False)
+
+
+def is_exact(arrival, burst):
+    """闭式解是否与逐事件仿真逐位相同：所有时间都是整数值，且时间总量在 float64 能精确表示的 2^53 以内
+
+    非整数时 cumsum 与逐个 max(上一个完成时刻, 到达) + 执行时间 的舍入不同（如 39.6 与 39.599999999999994），
+    SchedulerSimulator 只在这里返回真时才自动走向量化求解。
+    """
+    arrival, burst = _as_arrays(arrival, burst)
+    if np.issubdtype(arrival.dtype, np.integer) or not len(arrival):
+        return True
+    if not (np.all(arrival == np.floor(arrival)) and np.all(burst == np.floor(burst))):
+        return False
+    return float(np.abs(arrival).max() + np.abs(burst).sum()) < 2.0 ** 53
+
+
+def _sjf_order(arrival, burst, by_arrival):
+    """按事件驱动仿真的规则求出 SJF 的调度顺序
+
+    CPU 空闲时等到下一个到达时刻，同一时刻到达的进程一起入队；CPU 忙时，在其完成时刻之前
+    （含该时刻）到达的进程进入就绪队列。每次选执行时间最短者，相同则先入队者优先。
+    每次选择依赖前面所有进程的完成时刻，只能逐个进行，这一步是 Python 的堆循环：
+    1000 万个整数进程时仅求解就约需 10 秒，而 FCFS 的排序和闭式解不到 1 秒（都不含创建 Process 等开销）。
+    """
+    n = len(arrival)
+    a = arrival[by_arrival].tolist()
+    b = burst[by_arrival].tolist()
+    order = []
+    append = order.append
+    heap = []
+    # 整数执行时间可以把 (burst, 入队序号) 编码成一个整数，避免元组比较
+    packed = isinstance(b[0], int) and max(b) < (1 << 62) // max(n, 1)
+    push, pop = heapq.heappush, heapq.heappop
+    t = 0
+    i = 0
+    while i < n or heap:
+        if not heap and a[i] > t:
+            # 就绪队列为空，下一个进程在当前时刻之后才到达，CPU 空闲到它到达
+            t = a[i]
+        while i < n and a[i] <= t:
+            push(heap, b[i] * n + i if packed else (b[i], i))
+            i += 1
+        entry = pop(heap)
+        j = entry % n if packed else entry[1]
+        t += b[j]
+        append(j)
+    return by_arrival[np.array(order, dtype=np.int64)]
+
+
+def vectorized_schedule(arrival, burst, algorithm="FCFS"):
+    """计算非抢占 FCFS/SJF 的开始和完成时间，返回按输入顺序排列的 (start, finish)
+
+    调度顺序确定后，完成时间满足 finish_k = max(finish_{k-1}, arrival_k) + burst_k，
+    展开即 finish_k = C_k + max_{j<=k}(arrival_j - C_{j-1})，其中 C 为执行时间的前缀和，
+    可以用 cumsum 和 maximum.accumulate 一次求出。
+    输入为非整数时舍入方式与逐个累加不同，结果可能与事件驱动仿真差最后几位（见 is_exact()）；
+    SJF 的调度顺序仍需逐个求出（见 _sjf_order()），比 FCFS 慢一个数量级。
+    """
+    if algorithm not in VECTORIZED_ALGORITHMS:
+        raise ValueError(f"算法 {algorithm} 没有向量化实现")
+    arrival, burst = _as_arrays(arrival, burst)
+    n = len(arrival)
+    if n == 0:
+        return arrival.copy(), arrival.copy()
+
+    by_arrival = np.argsort(arrival, kind='stable')
+    order = by_arrival if algorithm == "FCFS" else _sjf_order(arrival, burst, by_arrival)
+
+    a = arrival[order]
+    b = burst[order]
+    cum = np.cumsum(b)
+    finish_sorted = cum + np.maximum.accumulate(a - (cum - b))
+    start = np.empty_like(finish_sorted)
+    finish = np.empty_like(finish_sorted)
+    start[order] = finish_sorted - b
+    finish[order] = finish_sorted
+    return start, finish
+
+
+class ResultTable(Sequence):
+    """按列存储的调度结果，按下标访问时才生成与 run() 相同格式的字典"""
+
+    FIELDS = ('name', 'arrival', 'burst', 'start', 'finish', 'turnaround', 'waiting')
+
+    def __init__(self, names, arrival, burst, start, finish):
+        self.names = names
+        self.arrival = arrival
+        self.burst = burst
+        self.start = start
+        self.finish = finish
+        self.turnaround = finish - arrival
+        self.waiting = self.turnaround - burst
+
+    def __len__(self):
+        return len(self.arrival)
+
+    def _name(self, i):
+        return self.names[i] if self.names is not None else f"P{i}"
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        values = [col[i].item() for col in (self.arrival, self.burst, self.start, self.finish,
+                                            self.turnaround, self.waiting)]
+        return dict(zip(self.FIELDS, [self._name(i)] + values))
+
+    def __iter__(self):
+        # 分块转换成 Python 数值，避免逐个访问 numpy 标量
+        columns = (self.arrival, self.burst, self.start, self.finish, self.turnaround, self.waiting)
+        for lo in range(0, len(self), 65536):
+            chunk = [col[lo:lo + 65536].tolist() for col in columns]
+            for k, values in enumerate(zip(*chunk)):
+                yield dict(zip(self.FIELDS, (self._name(lo + k),) + values))
+
+
+class _DefaultNames(Sequence):
+    """未提供进程名时按下标生成 P0, P1, ..."""
+
+    def __init__(self, n):
+        self.n = n
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if not -self.n <= i < self.n:
+            raise IndexError(i)
+        return f"P{i % self.n}"
+
+
+def _gantt_of(table):
+    """非抢占调度下每个进程依次有一个运行区间 [start, finish] 和一个等待区间 [arrival, start]"""
+    n = len(table)
+    pid = np.repeat(np.arange(n, dtype=np.int64), 2)
+    start = np.empty(2 * n)
+    end = np.empty(2 * n)
+    kind = np.empty(2 * n, dtype=np.int8)
+    start[0::2], end[0::2], kind[0::2] = table.start, table.finish, RUNNING
+    start[1::2], end[1::2], kind[1::2] = table.arrival, table.start, WAITING
+    names = table.names if table.names is not None else _DefaultNames(n)
+    return GanttTable.from_columns(names, pid, start, end, kind)
+
+
+def run_vectorized(arrival, burst, algorithm="FCFS", names=None):
+    """向量化运行 FCFS/SJF，返回与 SchedulerSimulator.run() 相同结构的结果（不含时间线）"""
+    arrival, burst = _as_arrays(arrival, burst)
+    start, finish = vectorized_schedule(arrival, burst, algorithm)
+    table = ResultTable(names, arrival, burst, start, finish)
+    n = len(table)
+    return {
+        'results': table,
+        'avg_turnaround': table.turnaround.sum().item() / n if n > 0 else 0,
+        'avg_waiting': table.waiting.sum().item() / n if n > 0 else 0,
+        'gantt_data': _gantt_of(table),
+        'timeline': []
+    }
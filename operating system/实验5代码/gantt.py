@@ -0,0 +1,153 @@
+import csv
+import itertools
+from array import array
+from collections.abc import Sequence
+
+RUNNING = 0
+WAITING = 1
+KIND_NAMES = ('running', 'waiting')
+
+
+def format_time(t):
+    """整数时刻显示为整数，其余按原样显示"""
+    return f"{t:g}" if isinstance(t, float) and t.is_integer() else str(t)
+
+
+class GanttTable(Sequence):
+    """按列存储的甘特图区间
+
+    每个区间占四列：进程号、开始时间、结束时间、类型（RUNNING/WAITING），
+    分别存放在 array 中，追加时按需扩容，不为每个区间创建 Python 对象。
+    绘图和导出直接使用 columns() 得到的 NumPy 视图；
+    按下标访问或迭代时才生成与原先 gantt_data 相同格式的字典。
+    """
+
+    def __init__(self, names=None):
+        self.names = names if names is not None else []  # 进程号 -> 进程名
+        self.pid = array('q')
+        self.start = array('d')
+        self.end = array('d')
+        self.kind = array('b')
+
+    @classmethod
+    def from_columns(cls, names, pid, start, end, kind):
+        import numpy as np
+
+        table = cls(names)
+        table.pid.frombytes(np.ascontiguousarray(pid, dtype=np.int64).tobytes())
+        table.start.frombytes(np.ascontiguousarray(start, dtype=np.float64).tobytes())
+        table.end.frombytes(np.ascontiguousarray(end, dtype=np.float64).tobytes())
+        table.kind.frombytes(np.ascontiguousarray(kind, dtype=np.int8).tobytes())
+        return table
+
+    def append(self, pid, start, end, kind):
+        self.pid.append(pid)
+        self.start.append(start)
+        self.end.append(end)
+        self.kind.append(kind)
+
+    def append_slices(self, pid, start, quantum, count):
+        """追加 count 个连续的整数时间片
+
+        与逐片仿真一致：每片一个运行区间，后跟片尾处长度为 0 的等待区间（重新入队又立即被调度）。
+        """
+        if count <= 0:
+            return
+        starts = range(start, start + count * quantum, quantum)
+        ends = range(start + quantum, start + (count + 1) * quantum, quantum)
+        self.pid.extend(itertools.repeat(pid, 2 * count))
+        self.start.extend(itertools.chain.from_iterable(zip(starts, ends)))
+        self.end.extend(itertools.chain.from_iterable(zip(ends, ends)))
+        self.kind.extend(bytes((RUNNING, WAITING)) * count)
+
+    def __len__(self):
+        return len(self.pid)
+
+    def columns(self):
+        """返回 (pid, start, end, kind) 四个 NumPy 数组（与内部存储共享内存）"""
+        import numpy as np
+
+        return (np.frombuffer(self.pid, dtype=np.int64) if self.pid else np.empty(0, np.int64),
+                np.frombuffer(self.start, dtype=np.float64) if self.start else np.empty(0),
+                np.frombuffer(self.end, dtype=np.float64) if self.end else np.empty(0),
+                np.frombuffer(self.kind, dtype=np.int8) if self.kind else np.empty(0, np.int8))
+
+    def _time(self, t):
+        return int(t) if t.is_integer() else t
+
+    def _row(self, pid, start, end, kind):
+        start, end = self._time(start), self._time(end)
+        return {
+            'process': self.names[pid],
+            'start': start,
+            'end': end,
+            'duration': end - start,
+            'type': KIND_NAMES[kind]
+        }
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        return self._row(self.pid[i], self.start[i], self.end[i], self.kind[i])
+
+    def __iter__(self):
+        for row in zip(self.pid, self.start, self.end, self.kind):
+            yield self._row(*row)
+
+    def process_names(self):
+        """出现在甘特图中的进程名（按名称排序）"""
+        return sorted({self.names[p] for p in set(self.pid)})
+
+    def max_end(self):
+        return max(self.end) if self.end else 0
+
+    def write_csv(self, stream):
+        """逐行导出为 CSV：process,start,end,duration,type"""
+        writer = csv.writer(stream, lineterminator='\n')
+        writer.writerow(['process', 'start', 'end', 'duration', 'type'])
+        names = self.names
+        for pid, start, end, kind in zip(self.pid, self.start, self.end, self.kind):
+            writer.writerow([names[pid], format_time(start), format_time(end),
+                             format_time(end - start), KIND_NAMES[kind]])
+
+
+class LaneGanttTable(GanttTable):
+    """多核甘特图：每个区间额外记录所在的 CPU（等待区间为 -1），按 CPU 分道显示"""
+
+    def __init__(self, names=None, cpus=1):
+        super().__init__(names)
+        self.cpus = cpus
+        self.cpu = array('h')
+
+    def append(self, pid, start, end, kind, cpu=-1):
+        super().append(pid, start, end, kind)
+        self.cpu.append(cpu)
+
+    def lanes(self):
+        """返回 cpu 列的 NumPy 视图，与 columns() 的四列一一对应"""
+        import numpy as np
+
+        return np.frombuffer(self.cpu, dtype=np.int16) if self.cpu else np.empty(0, np.int16)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        row = super().__getitem__(i)
+        row['cpu'] = self.cpu[i]
+        return row
+
+    def __iter__(self):
+        for row, cpu in zip(super().__iter__(), self.cpu):
+            row['cpu'] = cpu
+            yield row
+
+    def write_csv(self, stream):
+        """逐行导出为 CSV：process,start,end,duration,type,cpu"""
+        writer = csv.writer(stream, lineterminator='\n')
+        writer.writerow(['process', 'start', 'end', 'duration', 'type', 'cpu'])
+        names = self.names
+        for pid, start, end, kind, cpu in zip(self.pid, self.start, self.end, self.kind, self.cpu):
+            writer.writerow([names[pid], format_time(start), format_time(end),
+                             format_time(end - start), KIND_NAMES[kind], cpu])
@@ -0,0 +1,124 @@
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.ticker import FixedLocator, FuncFormatter, MaxNLocator
+
+
+class GanttRenderer:
+    """大规模甘特图的批量绘制
+
+    每种样式（颜色）只用一个 PolyCollection，不为每个区间创建 Rectangle。
+    每次坐标轴范围或窗口大小变化时按当前缩放重新抽稀：只保留可见范围内的区间，
+    同一行同一样式中间隔不到 1 像素的相邻区间合并成一条，合并后仍不足 1 像素的按 1 像素画；
+    行数多于纵向像素数时，落在同一像素行内的若干行按一行合并。
+    因此画出的多边形数只与像素数有关，与区间数无关。
+    可见区间不多（不超过 EDGE_LIMIT 条）时不合并，保留边框，并由 label 回调给每条加上文字。
+    """
+
+    LABEL_LIMIT = 200  # 可见的条数不超过该值时才加文字
+    EDGE_LIMIT = 2000  # 可见的条数超过该值时不画边框
+
+    def __init__(self, ax, row, start, end, style, styles, height=0.8, label=None):
+        """row/start/end/style 为等长数组，style 为 styles（facecolor/edgecolor/alpha 字典列表）的下标；
+        label(style, row, start, end) 返回条上的文字或 None"""
+        row = np.asarray(row, dtype=np.int64)
+        start = np.asarray(start, dtype=np.float64)
+        end = np.asarray(end, dtype=np.float64)
+        style = np.asarray(style, dtype=np.int64)
+        keep = end > start  # 长度为 0 的区间不画
+        order = np.lexsort((start[keep], row[keep], style[keep]))
+        self.row = row[keep][order]
+        self.start = start[keep][order]
+        self.end = end[keep][order]
+        self._bounds = np.searchsorted(style[keep][order], np.arange(len(styles) + 1))
+        self.ax = ax
+        self.styles = styles
+        self.height = height
+        self.label = label
+        self.texts = []
+        self.collections = []
+        for s in styles:
+            collection = PolyCollection([], facecolors=s['facecolor'], edgecolors=s.get('edgecolor', 'none'),
+                                        alpha=s.get('alpha'), linewidths=s.get('linewidth', 1))
+            ax.add_collection(collection)
+            self.collections.append(collection)
+        # 回调中保存 lambda（强引用），渲染器随坐标轴存活
+        ax.callbacks.connect('xlim_changed', lambda _: self.redraw())
+        ax.callbacks.connect('ylim_changed', lambda _: self.redraw())
+        ax.figure.canvas.mpl_connect('resize_event', lambda _: self.redraw())
+        self.redraw()
+
+    def extent(self):
+        """所有区间的 (最早开始, 最晚结束)，没有区间时为 (0, 0)"""
+        if not len(self.start):
+            return 0.0, 0.0
+        return float(self.start.min()), float(self.end.max())
+
+    def _visible(self, x0, x1, y0, y1):
+        return (self.end >= x0) & (self.start <= x1) & (self.row >= y0 - 1) & (self.row <= y1 + 1)
+
+    def _decimate(self, lo, hi, visible, tol, rows_per_bar, merge):
+        """第 lo:hi 个区间（同一样式，按行和开始时刻排序）中可见的部分合并后的 (首行, 开始, 结束)
+
+        merge 为真时横向间隔不超过 tol 的区间合并，rows_per_bar 大于 1 时每 rows_per_bar 行按一行合并；
+        不足 tol 宽的条按 tol 宽画。
+        """
+        visible = visible[lo:hi]
+        start, end, row = self.start[lo:hi][visible], self.end[lo:hi][visible], self.row[lo:hi][visible]
+        if not len(start) or not merge:
+            return row, start, np.maximum(end, start + tol)
+        if rows_per_bar > 1:
+            row = row // rows_per_bar * rows_per_bar
+            order = np.lexsort((start, row))
+            start, end, row = start[order], end[order], row[order]
+        new = np.empty(len(start), dtype=bool)
+        new[0] = True
+        new[1:] = (row[1:] != row[:-1]) | (start[1:] - end[:-1] > tol)
+        first = np.flatnonzero(new)
+        end = np.maximum.reduceat(end, first)
+        start = start[first]
+        return row[first], start, np.maximum(end, start + tol)
+
+    def redraw(self):
+        ax = self.ax
+        x0, x1 = sorted(ax.get_xlim())
+        y0, y1 = sorted(ax.get_ylim())
+        tol = (x1 - x0) / max(ax.bbox.width, 1)  # 1 像素对应的时间
+        rows_per_bar = max(1, int(np.ceil((y1 - y0) / max(ax.bbox.height, 1))))
+        visible = self._visible(x0, x1, y0, y1)
+        merge = rows_per_bar > 1 or np.count_nonzero(visible) > self.EDGE_LIMIT
+        bars = [self._decimate(self._bounds[k], self._bounds[k + 1], visible, tol, rows_per_bar, merge)
+                for k in range(len(self.styles))]
+        total = sum(len(b[0]) for b in bars)
+        half = self.height / 2
+        span = rows_per_bar - 1  # 合并多行时条的高度覆盖这些行
+        for k, (collection, (row, start, end)) in enumerate(zip(self.collections, bars)):
+            verts = np.empty((len(row), 4, 2))
+            verts[:, 0, 0] = verts[:, 1, 0] = start
+            verts[:, 2, 0] = verts[:, 3, 0] = end
+            verts[:, 0, 1] = verts[:, 3, 1] = row - half
+            verts[:, 1, 1] = verts[:, 2, 1] = row + span + half
+            collection.set_verts(verts)
+            collection.set_linewidth(self.styles[k].get('linewidth', 1) if total <= self.EDGE_LIMIT else 0)
+
+        for text in self.texts:
+            text.remove()
+        self.texts = []
+        if self.label is not None and total <= self.LABEL_LIMIT:
+            for k, (row, start, end) in enumerate(bars):
+                for r, s, e in zip(row.tolist(), start.tolist(), end.tolist()):
+                    text = self.label(k, r, s, e)
+                    if text is not None:
+                        self.texts.append(ax.text((s + e) / 2, r, text, ha='center', va='center', fontsize=8,
+                                                  clip_on=True,
+                                                  bbox=dict(boxstyle="round,pad=0.1", facecolor="white", alpha=0.7)))
+
+
+def row_axis(ax, names, max_ticks=50):
+    """纵轴第 i 行标为 names[i]；行数太多时只标一部分"""
+    if len(names) <= max_ticks:
+        ax.yaxis.set_major_locator(FixedLocator(range(len(names))))
+    else:
+        ax.yaxis.set_major_locator(MaxNLocator(max_ticks // 2, integer=True))
+    ax.yaxis.set_major_formatter(FuncFormatter(
+        lambda y, _: names[int(y)] if y == int(y) and 0 <= int(y) < len(names) else ''))
+    ax.set_ylim(-0.5, max(len(names), 1) - 0.5)
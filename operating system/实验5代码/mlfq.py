@@ -0,0 +1,615 @@
+"""多级反馈队列（MLFQ）调度核心
+
+不依赖 PyQt5/pandas/matplotlib，可以直接导入并在脚本中批量运行；run() 默认不画图，
+需要可视化时才导入 matplotlib。图形界面见 tmp.py，多核版本见 mlfq_smp.py。
+
+在本目录下运行：
+    python -m mlfq trace.csv
+    python -m mlfq trace.csv --time-slices 1,2,4,8 --boost-threshold 20 -o result.json
+    python -m mlfq trace.jsonl --levels 5 --output-format csv -o result.csv
+
+轨迹格式与 scheduler_cli 相同（name,arrival,burst[,priority]，优先级不使用）。
+输出为 JSON（参数、平均值、分位数和每个作业的结果）、CSV 或 JSONL（与 scheduler_cli 的记录格式相同）。
+"""
+import argparse
+import json
+import sys
+from collections import deque
+
+from quantiles import METRICS, PERCENTILES, LatencyMetrics
+from trace_io import ResultWriter, read_trace
+
+
+# 日志级别：silent 不输出；summary 只输出平均周转时间；events 逐事件输出并给出结果表；
+# full 另外保存每个事件时的队列快照并在最后打印详细调度日志
+LOG_LEVELS = ("silent", "summary", "events", "full")
+
+# 调度事件类型，事件日志中以编号保存
+START, ARRIVAL, PREEMPT, DISPATCH, COMPLETE, INTERRUPT, DEMOTE, BOOST = range(8)
+EVENT_TEXT = {
+    START: "开始调度",
+    ARRIVAL: "{name}到达",
+    PREEMPT: "抢占{name}",
+    DISPATCH: "{name}开始运行",
+    COMPLETE: "{name}完成",
+    INTERRUPT: "{name}被中断",
+    DEMOTE: "{name}降级到队列{queue}",
+    BOOST: "{name}优先级提升",
+}
+
+
+class Job:
+    """作业类"""
+
+    def __init__(self, name: str, arrival_time: int, service_time: int):
+        self.name = name
+        self.arrival_time = arrival_time
+        self.service_time = service_time
+        self.remaining_time = service_time
+        self.start_time = -1
+        self.end_time = -1
+        self.current_queue = 0  # 当前所在的队列(0 ~ 队列数-1)
+        self.execution_history = []  # 记录执行历史，用于可视化
+        self.queue_entry_time = {}  # 记录进入每个队列的时间
+        self.last_queue_change_time = 0  # 最后一次队列变化的时间
+
+
+class MLFQScheduler:
+    """多级反馈队列调度器类
+
+    队列数和各级时间片可配置：给出 time_slices 时队列数为其长度，否则为 levels 级，
+    第 i 级时间片为 2^i（默认 3 级，即 1, 2, 4）。
+    就绪队列为 deque，入队、出队都是 O(1)。每次入队都记录进入时刻，而时间单调不减，
+    所以每个队列中的作业按进入时刻排列，等待超过阈值的作业总在队首，
+    优先级提升只需从队首依次取出，代价与被提升的作业数成正比，与队列长度无关。
+
+    log_level 见 LOG_LEVELS。除 silent 外，每个事件以 (时间, 事件类型, 作业名, 队列, 附加值) 元组
+    写入 event_log，它是最多保存 log_size 条的环形缓冲。附加值为运行时间（开始运行）、
+    剩余时间（中断、降级）或原队列（提升）。
+    复制全部队列的快照（scheduling_log）代价与队列长度成正比，只在 full 级别或需要可视化时保存。
+    默认不画图（visualize=False），画图用到的 matplotlib 在 visualize_scheduling 中才导入。
+    """
+
+    def __init__(self, enable_priority_boost=False, boost_threshold=5, time_slices=None, levels=3,
+                 log_level="summary", visualize=False, log_size=65536):
+        if log_level not in LOG_LEVELS:
+            raise ValueError(f"不支持的日志级别: {log_level}")
+        if time_slices is None:
+            time_slices = [2 ** i for i in range(levels)]
+        if not time_slices or min(time_slices) <= 0:
+            raise ValueError("至少需要一个队列，且时间片必须是正整数")
+        self.jobs = []  # 所有作业
+        self.time_slices = list(time_slices)  # 时间片大小配置
+        self.levels = len(self.time_slices)  # 队列数
+        self.ready_queues = [deque() for _ in range(self.levels)]  # 各级就绪队列
+        self.current_job = None  # 当前正在运行的作业
+        self.current_time = 0  # 当前系统时间
+        self.next_job_index = 0  # 下一个要处理的作业索引
+        self.scheduling_log = []  # 每个事件时的队列快照，用于可视化和详细日志
+        self.log_level = log_level
+        self.visualize = visualize  # 运行结束后是否生成可视化
+        self.event_log = deque(maxlen=log_size) if log_level != "silent" else None  # 最近的事件
+        self.events_handled = 0  # 已记录的事件数
+        self._echo = log_level in ("events", "full")  # 是否逐事件输出
+        self._snapshots = log_level == "full" or visualize  # 是否保存队列快照
+        self._queue_keys = [f'queue{i}' for i in range(self.levels)]  # 快照中各队列的键
+        self.enable_priority_boost = enable_priority_boost  # 是否启用优先级提升
+        self.boost_threshold = boost_threshold  # 优先级提升阈值
+
+    def add_job(self, job: Job) -> None:
+        """添加作业"""
+        self.jobs.append(job)
+
+    def _enqueue(self, job: Job, queue_idx: int) -> None:
+        """把作业放到第 queue_idx 级队列队尾，并记录进入该队列的时间"""
+        job.current_queue = queue_idx
+        job.queue_entry_time[queue_idx] = self.current_time
+        job.last_queue_change_time = self.current_time
+        self.ready_queues[queue_idx].append(job)
+
+    def run(self) -> None:
+        """运行调度器"""
+        # 按到达时间排序
+        self.jobs.sort(key=lambda x: x.arrival_time)
+
+        if self._echo:
+            print("多级反馈队列调度过程:")
+            print(f"算法: {'变种算法' if self.enable_priority_boost else '原版算法'}")
+            print(f"队列数: {self.levels}，时间片: {self.time_slices}")
+            if self.enable_priority_boost:
+                print(f"优先级提升阈值: {self.boost_threshold}时间单位")
+            print("时间\t事件")
+            print("----------------")
+
+        # 记录初始状态
+        self._log(START)
+
+        # 主循环
+        while True:
+            # 添加所有已到达但未处理的作业到就绪队列0
+            while (self.next_job_index < len(self.jobs) and
+                   self.jobs[self.next_job_index].arrival_time <= self.current_time):
+
+                job = self.jobs[self.next_job_index]
+                if self._echo:
+                    print(f"{self.current_time}\t{job.name} 到达，进入队列0")
+                self._log(ARRIVAL, job, 0)
+
+                if job.start_time == -1:
+                    job.start_time = self.current_time
+
+                # 进入队列0并记录进入时间
+                self._enqueue(job, 0)
+                self.next_job_index += 1
+
+                # 检查是否需要抢占当前作业
+                if (self.current_job is not None and
+                        self.current_job.current_queue > 0):
+                    if self._echo:
+                        print(f"{self.current_time}\t抢占 {self.current_job.name}，新作业{job.name}有更高优先级")
+                    self.ready_queues[self.current_job.current_queue].append(self.current_job)
+                    self._log(PREEMPT, self.current_job, self.current_job.current_queue)
+                    self.current_job = None
+
+            # 检查并处理优先级提升（变种算法）
+            if self.enable_priority_boost:
+                self._check_priority_boost()
+
+            # 如果CPU空闲，从就绪队列中选择作业
+            if self.current_job is None:
+                # 找到最高优先级的非空队列
+                queue_idx = -1
+                for i in range(self.levels):
+                    if self.ready_queues[i]:
+                        queue_idx = i
+                        break
+
+                if queue_idx == -1:
+                    # 如果没有作业在等待，但有作业未到达，跳到下一个作业的到达时间
+                    if self.next_job_index < len(self.jobs):
+                        self.current_time = self.jobs[self.next_job_index].arrival_time
+                        continue
+                    else:
+                        # 所有作业都处理完毕
+                        break
+
+                # 从队列中取出作业
+                self.current_job = self.ready_queues[queue_idx].popleft()
+                self.current_job.current_queue = queue_idx
+
+                # 最低队列中只有这一个作业时，直接执行到完成前的最后一片或下一个作业到达
+                if self._can_coalesce(queue_idx) and self._coalesce_slices(queue_idx):
+                    continue
+
+                # 计算本次运行时间
+                allocated_time = min(self.time_slices[queue_idx], self.current_job.remaining_time)
+                if self._echo:
+                    print(f"{self.current_time}\t{self.current_job.name} 从队列{queue_idx}开始运行 "
+                          f"({allocated_time}时间单位)")
+                self._log(DISPATCH, self.current_job, queue_idx, allocated_time)
+
+                # 记录执行开始
+                execution_start = self.current_time
+
+                # 检查是否有新作业会在此期间到达
+                actual_run_time = allocated_time
+                if self.next_job_index < len(self.jobs):
+                    next_arrival = self.jobs[self.next_job_index].arrival_time
+                    if self.current_time + actual_run_time > next_arrival:
+                        actual_run_time = next_arrival - self.current_time
+                        if self._echo:
+                            print(f"{self.current_time}\t注意: {self.current_job.name} 的运行将被新作业到达中断")
+
+                # 推进时间
+                self.current_time += actual_run_time
+                self.current_job.remaining_time -= actual_run_time
+
+                # 记录执行历史
+                self.current_job.execution_history.append(
+                    (execution_start, self.current_time, self.current_job.current_queue)
+                )
+
+                # 检查作业是否完成
+                if self.current_job.remaining_time == 0:
+                    if self._echo:
+                        print(f"{self.current_time}\t{self.current_job.name} 完成")
+                    self.current_job.end_time = self.current_time
+                    self._log(COMPLETE, self.current_job, self.current_job.current_queue)
+                    self.current_job = None
+                elif actual_run_time < allocated_time:
+                    # 作业被新作业到达中断
+                    if self._echo:
+                        print(f"{self.current_time}\t{self.current_job.name} 被新作业中断，"
+                              f"剩余时间: {self.current_job.remaining_time}")
+
+                    # 回到原队列队尾，记录进入队列的时间
+                    self._enqueue(self.current_job, self.current_job.current_queue)
+                    self._log(INTERRUPT, self.current_job, self.current_job.current_queue,
+                              self.current_job.remaining_time)
+                    self.current_job = None
+                else:
+                    # 时间片用完，但作业未完成
+                    if self._echo:
+                        print(f"{self.current_time}\t{self.current_job.name} 在队列{self.current_job.current_queue}"
+                              f"时间片用完，剩余时间: {self.current_job.remaining_time}")
+
+                    # 降级到下一队列
+                    next_queue = min(self.current_job.current_queue + 1, self.levels - 1)
+                    if self._echo:
+                        print(f"{self.current_time}\t{self.current_job.name} 降级到队列{next_queue}")
+
+                    # 进入新队列并记录进入时间
+                    self._enqueue(self.current_job, next_queue)
+                    self._log(DEMOTE, self.current_job, next_queue, self.current_job.remaining_time)
+                    self.current_job = None
+            else:
+                # 这不应该发生，因为我们在上面已经处理了所有情况
+                break
+
+        # 输出结果
+        if self.log_level != "silent":
+            self.print_results(per_job=self._echo)
+
+        # 生成可视化
+        if self.visualize:
+            self.visualize_scheduling()
+
+        # 打印详细调度日志
+        if self.log_level == "full":
+            self._print_detailed_log()
+
+    def _can_coalesce(self, queue_idx):
+        """是否可以合并连续的时间片：作业来自最低队列、其他队列都为空，且不逐事件输出或保存快照"""
+        return (queue_idx == self.levels - 1 and not any(self.ready_queues) and not self._echo
+                and not self._snapshots and not (self.enable_priority_boost and self.boost_threshold <= 0))
+
+    def _coalesce_slices(self, queue_idx):
+        """一次执行当前作业在最低队列中的连续完整时间片，返回是否执行了至少一片
+
+        这期间逐片调度的结果是确定的：每片都运行满一个时间片，降级后回到最低队列队尾并立即再次被选中；
+        进入时间每片刷新，等待时间总为 0，不会触发优先级提升。因此只需算出到完成前的最后一片
+        或下一个作业到达为止的片数，执行历史成批写入，与逐片运行完全相同。
+        最后一片（完成或被新作业中断）仍由主循环照常处理。
+        """
+        job = self.current_job
+        slice_len = self.time_slices[queue_idx]
+        start = self.current_time
+        count = (job.remaining_time - 1) // slice_len  # 不含完成的那一片
+        if self.next_job_index < len(self.jobs):
+            count = min(count, (self.jobs[self.next_job_index].arrival_time - start) // slice_len)
+        count = int(count)
+        if count <= 0:
+            return False
+
+        job.execution_history.extend(
+            (start + i * slice_len, start + (i + 1) * slice_len, queue_idx) for i in range(count))
+        self.current_time = start + count * slice_len
+        job.remaining_time -= count * slice_len
+        # 每片照常计开始运行和降级两个事件；事件日志是环形缓冲，只需补上最后能保留下来的几片
+        self.events_handled += 2 * count
+        if self.event_log is not None:
+            first = max(0, count - ((self.event_log.maxlen or 2 * count) + 1) // 2)
+            for i in range(first, count):
+                begin = start + i * slice_len
+                self.event_log.append((begin, DISPATCH, job.name, queue_idx, slice_len))
+                self.event_log.append((begin + slice_len, DEMOTE, job.name, queue_idx,
+                                       job.remaining_time + (count - 1 - i) * slice_len))
+        self._enqueue(job, queue_idx)
+        self.current_job = None
+        return True
+
+    def _check_priority_boost(self):
+        """检查并处理优先级提升（变种算法）"""
+        # 只检查队列0以外的低优先级队列，从高到低逐级处理
+        for queue_idx in range(1, self.levels):
+            queue = self.ready_queues[queue_idx]
+
+            # 队列按进入时间排列，等待时间超过阈值的作业都在队首
+            while queue and self.current_time - queue[0].queue_entry_time[queue_idx] >= self.boost_threshold:
+                job = queue.popleft()
+
+                # 提升到上一级队列，记录进入新队列的时间
+                new_queue = queue_idx - 1
+                self._enqueue(job, new_queue)
+
+                if self._echo:
+                    print(f"{self.current_time}\t{job.name} 在队列{queue_idx}等待时间超过阈值，提升到队列{new_queue}")
+                self._log(BOOST, job, new_queue, queue_idx)
+
+    def _log(self, event, job=None, queue=None, detail=None):
+        """记录一个调度事件：计数、写入事件日志，需要时保存队列快照"""
+        self.events_handled += 1
+        if self.event_log is not None:
+            self.event_log.append((self.current_time, event, job and job.name, queue, detail))
+        if self._snapshots:
+            self._log_state(EVENT_TEXT[event].format(name=job and job.name, queue=queue))
+
+    def _log_state(self, event: str) -> None:
+        """记录调度状态"""
+        current_job_name = self.current_job.name if self.current_job else "None"
+
+        state = {
+            'time': self.current_time,
+            'event': event,
+            'current_job': current_job_name,
+        }
+        for key, queue in zip(self._queue_keys, self.ready_queues):
+            state[key] = [job.name for job in queue]
+        self.scheduling_log.append(state)
+
+    def print_results(self, per_job=True) -> None:
+        """输出调度结果，per_job 为假时只输出平均值和总和"""
+        if per_job:
+            print("\n调度结果:")
+            print("作业\t到达时间\t开始时间\t完成时间\t周转时间")
+            print("----------------------------------------")
+
+        total_turnaround = 0
+        for job in self.jobs:
+            turnaround = job.end_time - job.arrival_time
+            total_turnaround += turnaround
+
+            if per_job:
+                print(f"{job.name}\t{job.arrival_time}\t\t{job.start_time}\t\t{job.end_time}\t\t{turnaround}")
+
+        print(f"\n平均周转时间: {total_turnaround / len(self.jobs):.2f}")
+        print(f"总周转时间: {total_turnaround}")
+
+    def results(self):
+        """每个作业的结果字典（run() 之后按到达时间排序），字段与 scheduler_cli 的输出一致
+
+        start 为作业进入系统的时刻，response 为第一次运行前等待的时间。
+        """
+        results = []
+        for job in self.jobs:
+            turnaround = job.end_time - job.arrival_time
+            first_run = job.execution_history[0][0] if job.execution_history else job.end_time
+            results.append({
+                'name': job.name,
+                'arrival': job.arrival_time,
+                'burst': job.service_time,
+                'start': job.start_time,
+                'finish': job.end_time,
+                'turnaround': turnaround,
+                'waiting': turnaround - job.service_time,
+                'response': first_run - job.arrival_time,
+                'queue': job.current_queue,
+                'slices': len(job.execution_history),
+            })
+        return results
+
+    def visualize_scheduling(self) -> None:
+        """生成调度过程可视化（需要 run() 时保存了队列快照，即 visualize=True 或 full 级别）"""
+        if not self.jobs:
+            return
+
+        import matplotlib.pyplot as plt
+
+        # 设置中文字体支持
+        plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'WenQuanYi Micro Hei', 'sans-serif']
+        plt.rcParams['axes.unicode_minus'] = False
+
+        # 创建图形
+        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 10))
+        fig.suptitle('多级反馈队列调度算法可视化', fontsize=16, fontweight='bold')
+
+        # 1. 甘特图
+        self._create_gantt_chart(ax1)
+
+        # 2. 队列状态随时间变化图
+        self._create_queue_status_chart(ax2)
+
+        # 3. 统计信息图
+        self._create_statistics_chart(ax3)
+
+        plt.tight_layout()
+        plt.show()
+
+    def _create_gantt_chart(self, ax) -> None:
+        """创建甘特图"""
+        import numpy as np
+        from matplotlib.patches import Patch
+
+        from gantt_render import GanttRenderer, row_axis
+
+        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57', '#FF9AA2', '#FFB7B2', '#FFDAC1', '#E2F0CB',
+                  '#B5EAD7']  # 不同作业的颜色
+
+        # 使用作业颜色，但根据队列深度调整亮度：样式 = 颜色序号 * 队列数 + 队列号
+        levels = self.levels
+        styles = [dict(facecolor=self._adjust_color_brightness(color, 0.7 + queue * 0.1), edgecolor='black',
+                       alpha=0.8)
+                  for color in colors for queue in range(levels)]
+
+        # 所有执行区间按列收集，一次交给批量绘制
+        counts = [len(job.execution_history) for job in self.jobs]
+        history = np.array([seg for job in self.jobs for seg in job.execution_history], dtype=np.float64)
+        history = history.reshape(-1, 3)
+        rows = np.repeat(np.arange(len(self.jobs)), counts)
+        queues = history[:, 2].astype(np.int64)
+        style = rows % len(colors) * levels + queues
+
+        def label(k, row, start, end):
+            # 条形上标出队列和时间范围
+            return f'Q{k % levels} {start:g}-{end:g}'
+
+        ax.set_xlim(0, max(history[:, 1].max() if len(history) else 0, 1))
+        row_axis(ax, [job.name for job in self.jobs])
+        self.gantt_renderer = GanttRenderer(ax, rows, history[:, 0], history[:, 1], style, styles, height=0.6,
+                                            label=label)
+
+        ax.set_xlabel('时间')
+        ax.set_ylabel('作业')
+        ax.set_title('作业执行甘特图')
+        ax.grid(True, alpha=0.3)
+
+        # 创建图例（颜色按作业循环使用，只列出前几个作业）
+        legend_elements = [
+            Patch(facecolor=colors[i], label=f'作业 {job.name}')
+            for i, job in enumerate(self.jobs[:len(colors)])
+        ]
+        ax.legend(handles=legend_elements, loc='upper right')
+
+    def _create_queue_status_chart(self, ax) -> None:
+        """创建队列状态图"""
+        times = [log['time'] for log in self.scheduling_log]
+        colors = ['red', 'blue', 'green', 'orange', 'purple', 'brown', 'pink', 'gray']
+        markers = ['o', 's', '^', 'D', 'v', 'P', '*', 'X']
+
+        for i in range(self.levels):
+            lengths = [len(log[f'queue{i}']) for log in self.scheduling_log]
+            ax.plot(times, lengths, label=f'队列{i}', color=colors[i % len(colors)], linewidth=2,
+                    marker=markers[i % len(markers)])
+
+        ax.set_xlabel('时间')
+        ax.set_ylabel('队列长度')
+        ax.set_title('队列状态随时间变化')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+        ax.set_ylim(bottom=0)
+
+    def _create_statistics_chart(self, ax) -> None:
+        """创建统计信息图"""
+        import numpy as np
+
+        # 计算统计信息
+        job_names = [job.name for job in self.jobs]
+        turnaround_times = [job.end_time - job.arrival_time for job in self.jobs]
+        wait_times = [turnaround - job.service_time for job, turnaround in zip(self.jobs, turnaround_times)]
+
+        x = np.arange(len(job_names))
+        width = 0.35
+
+        bars1 = ax.bar(x - width / 2, turnaround_times, width, label='周转时间', color='lightblue', alpha=0.7)
+        bars2 = ax.bar(x + width / 2, wait_times, width, label='等待时间', color='lightcoral', alpha=0.7)
+
+        ax.set_xlabel('作业')
+        ax.set_ylabel('时间')
+        ax.set_title('作业调度统计信息')
+        ax.set_xticks(x)
+        ax.set_xticklabels(job_names)
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+        # 在柱子上添加数值
+        for bar in bars1:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width() / 2., height,
+                    f'{height:.0f}', ha='center', va='bottom')
+
+        for bar in bars2:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width() / 2., height,
+                    f'{height:.0f}', ha='center', va='bottom')
+
+    def _adjust_color_brightness(self, color, factor):
+        """调整颜色亮度"""
+        import matplotlib.colors as mc
+        import colorsys
+        try:
+            c = mc.cnames[color]
+        except:
+            c = color
+        c = colorsys.rgb_to_hls(*mc.to_rgb(c))
+        return colorsys.hls_to_rgb(c[0], max(0, min(1, factor * c[1])), c[2])
+
+    def _print_detailed_log(self) -> None:
+        """打印详细调度日志"""
+        print("\n" + "=" * 60)
+        print("详细调度日志")
+        print("=" * 60)
+
+        import pandas as pd
+
+        df_log = pd.DataFrame(self.scheduling_log)
+        print(df_log.to_string(index=False))
+
+
+def summarize(scheduler):
+    """平均周转/等待/响应时间和它们的分位数"""
+    results = scheduler.results()
+    metrics = LatencyMetrics()
+    for r in results:
+        for metric in METRICS:
+            metrics.sketches[metric].add(r[metric])
+    sketches = metrics.sketches
+    return {
+        'record': 'average',
+        'algorithm': 'MLFQ',
+        'count': len(results),
+        'turnaround': sketches['turnaround'].mean(),
+        'waiting': sketches['waiting'].mean(),
+        'response': sketches['response'].mean(),
+        'events': scheduler.events_handled,
+        **metrics.report(),
+    }
+
+
+def _parse_slices(text):
+    try:
+        slices = [int(s) for s in text.split(',') if s.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError("时间片必须是逗号分隔的正整数")
+    if not slices or min(slices) <= 0:
+        raise argparse.ArgumentTypeError("时间片必须是逗号分隔的正整数")
+    return slices
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m mlfq', description='无界面的多级反馈队列调度仿真')
+    parser.add_argument('trace', help="轨迹文件（CSV/JSONL），'-' 表示标准输入")
+    parser.add_argument('--time-slices', type=_parse_slices, default=None,
+                        help='逗号分隔的各级时间片，个数即队列数，默认 1,2,4')
+    parser.add_argument('--levels', type=int, default=3, help='未给出时间片时的队列数，第 i 级时间片为 2^i，默认 3')
+    parser.add_argument('--boost-threshold', type=int, default=None,
+                        help='启用优先级提升，等待超过该时间的作业提升一级；默认不提升')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='输入格式，默认按扩展名判断')
+    parser.add_argument('--output-format', choices=['json', 'csv', 'jsonl'], default='json', help='输出格式，默认 json')
+    parser.add_argument('-o', '--output', default='-', help='输出文件，默认标准输出')
+    parser.add_argument('--summary-only', action='store_true', help='只输出平均值和分位数')
+    args = parser.parse_args(argv)
+
+    if args.levels < 1:
+        parser.error("队列数必须是正整数")
+    if args.boost_threshold is not None and args.boost_threshold <= 0:
+        parser.error("优先级提升阈值必须是正整数")
+
+    try:
+        scheduler = MLFQScheduler(enable_priority_boost=args.boost_threshold is not None,
+                                  boost_threshold=args.boost_threshold or 0, time_slices=args.time_slices,
+                                  levels=args.levels, log_level="silent")
+        for name, arrival, burst, _ in read_trace(args.trace, args.format):
+            scheduler.add_job(Job(name, arrival, burst))
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    scheduler.run()
+    summary = summarize(scheduler)
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        if args.output_format == 'json':
+            report = {
+                'time_slices': scheduler.time_slices,
+                'boost_threshold': args.boost_threshold,
+                'summary': {k: v for k, v in summary.items() if k not in ('record', 'algorithm')},
+            }
+            if not args.summary_only:
+                report['results'] = scheduler.results()
+            out.write(json.dumps(report, ensure_ascii=False, indent=2) + '\n')
+        else:
+            extra_fields = ['response', 'queue', 'slices', 'events'] + \
+                           [f'{m}_p{p:g}' for m in METRICS for p in PERCENTILES]
+            writer = ResultWriter(out, args.output_format, extra_fields=extra_fields)
+            if not args.summary_only:
+                for result in scheduler.results():
+                    writer.write({'record': 'process', 'algorithm': 'MLFQ', **result})
+            writer.write(summary)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
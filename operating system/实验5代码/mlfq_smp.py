@@ -0,0 +1,367 @@
+"""多核多级反馈队列（MLFQ）调度
+
+在本目录下运行：
+    python -m mlfq_smp trace.csv --cores 8
+    python -m mlfq_smp trace.csv --cores 128 --time-slices 1,2,4,8 --boost-interval 100 -o result.json
+    python -m mlfq_smp trace.csv --cores 16 --no-steal --output-format csv -o result.csv
+
+每个核有自己的一组多级队列，单核时的调度规则与 MLFQScheduler（不启用优先级提升）相同：
+新作业进入第 0 级，时间片用完降一级，作业到达时打断其所在核上正在运行的作业（回到原级队尾）。
+多核时另外：
+- 新作业放到负载（排队数 + 是否在运行）最小的核上，负载相同取编号小的；
+- 核的本地队列为空时，从所有核中最高的非空级别窃取队首作业，计为该核迁入一次；
+- 给出 boost_interval 时每隔这么多时间做一次全局优先级提升，所有核排队中的作业回到第 0 级。
+输出除每个作业的结果外，还有每个核的利用率和迁入次数。
+"""
+import argparse
+import heapq
+import json
+import sys
+from collections import deque
+
+from mlfq import Job, _parse_slices, summarize
+from quantiles import METRICS, PERCENTILES
+from smp import _LoadIndex
+from trace_io import ResultWriter, read_trace
+
+
+class MultiCoreMLFQScheduler:
+    """多核多级反馈队列调度器
+
+    按事件推进：下一个事件是最早的时间片结束或作业到达，每个事件的代价为 O(log 核数 + 级数)。
+    最小负载的核用 smp 的惰性堆维护；每一级另有一个“该级非空的核”的惰性堆，窃取时从第 0 级往下找，
+    取编号最小的核的队首，过期条目在查找时丢弃。
+    全局提升只处理有低级别作业排队的核：以最长的一级为底，把其余各级按级别顺序接到它的前后，
+    代价与被移动的作业数成正比，不必逐个作业出队再入队。
+    作业在内部按下标处理，结果保存在列表中；record_history 为真时才逐片记录
+    (开始, 结束, 级别, 核) 到 Job.execution_history，规模大时关闭以节省内存。
+    """
+
+    def __init__(self, cores=2, time_slices=None, levels=3, boost_interval=None, steal=True,
+                 record_history=False):
+        if cores < 1:
+            raise ValueError("核数必须是正整数")
+        if time_slices is None:
+            time_slices = [2 ** i for i in range(levels)]
+        if not time_slices or min(time_slices) <= 0:
+            raise ValueError("至少需要一个队列，且时间片必须是正整数")
+        if boost_interval is not None and boost_interval <= 0:
+            raise ValueError("优先级提升间隔必须是正数")
+        self.cores = cores
+        self.time_slices = list(time_slices)
+        self.levels = len(self.time_slices)
+        self.boost_interval = boost_interval
+        self.steal = steal
+        self.record_history = record_history
+        self.jobs = []
+        self.current_time = 0
+        self.events_handled = 0
+        self.busy_time = [0] * cores  # 各核运行作业的总时间
+        self.migrations = [0] * cores  # 各核窃取（迁入）的作业数
+        self.boosts = 0  # 实际移动了作业的全局提升次数
+
+    def add_job(self, job: Job) -> None:
+        """添加作业"""
+        self.jobs.append(job)
+
+    # ---- 队列 ----
+
+    def _push(self, i, core, level):
+        """把第 i 个作业放到 core 的第 level 级队尾（不改变负载）"""
+        queue = self._queues[core][level]
+        queue.append(i)
+        if len(queue) == 1:
+            heap = self._nonempty[level]
+            heapq.heappush(heap, core)
+            if len(heap) > 4 * self.cores + 64:
+                # 过期条目太多时重建（先入队，重建时本核才算非空）
+                heap[:] = [c for c in range(self.cores) if self._queues[c][level]]
+                heapq.heapify(heap)
+        if level:
+            if not self._low[core]:
+                self._low_cores.add(core)
+            self._low[core] += 1
+
+    def _pop(self, core, level):
+        i = self._queues[core][level].popleft()
+        if level:
+            self._low[core] -= 1
+            if not self._low[core]:
+                self._low_cores.discard(core)
+        return i
+
+    def _victim(self):
+        """最高的非空级别及该级非空的编号最小的核，所有队列都为空时返回 None"""
+        queues = self._queues
+        for level, heap in enumerate(self._nonempty):
+            while heap and not queues[heap[0]][level]:
+                heapq.heappop(heap)
+            if heap:
+                return heap[0], level
+        return None
+
+    def _boost(self):
+        """全局优先级提升：所有排队中的作业回到第 0 级，各核内保持 第 0 级、第 1 级…… 的顺序"""
+        if not self._low_cores:
+            return
+        self.boosts += 1
+        for core in self._low_cores:
+            queues = self._queues[core]
+            self.events_handled += self._low[core]
+            self._low[core] = 0
+            if not queues[0]:
+                heapq.heappush(self._nonempty[0], core)
+            base = max(range(self.levels), key=lambda level: len(queues[level]))
+            merged = queues[base]
+            for level in range(base - 1, -1, -1):
+                merged.extendleft(reversed(queues[level]))
+            for level in range(base + 1, self.levels):
+                merged.extend(queues[level])
+            queues[:] = [merged] + [deque() for _ in range(self.levels - 1)]
+        self._low_cores.clear()
+
+    # ---- 调度 ----
+
+    def _stop(self, core):
+        """结束 core 上当前的运行片，返回 (作业下标, 级别)"""
+        i = self._running[core]
+        ran = self.current_time - self._run_start[core]
+        self._remaining[i] -= ran
+        self.busy_time[core] += ran
+        self._slices[i] += 1
+        if self.record_history:
+            self._jobs[i].execution_history.append(
+                (self._run_start[core], self.current_time, self._level[i], core))
+        self._running[core] = -1
+        self.events_handled += 1
+        return i, self._level[i]
+
+    def _dispatch(self, core, steal):
+        """在空闲的 core 上运行本地最高级别的作业；本地为空且 steal 为真时窃取，返回是否开始运行"""
+        queues = self._queues[core]
+        source = core
+        for level in range(self.levels):
+            if queues[level]:
+                break
+        else:
+            if not steal:
+                return False
+            found = self._victim()
+            if found is None:
+                return False
+            source, level = found
+            self.migrations[core] += 1
+            self._load[source] -= 1
+            self._least_loaded.update(source)
+            self._load[core] += 1
+            self._least_loaded.update(core)
+
+        i = self._pop(source, level)
+        if self._first_run[i] < 0:
+            self._first_run[i] = self.current_time
+        self._level[i] = level
+        self._core[i] = core
+        self._running[core] = i
+        self._run_start[core] = self.current_time
+        self._version[core] += 1
+        run_time = min(self.time_slices[level], self._remaining[i])
+        heapq.heappush(self._events, (self.current_time + run_time, core, self._version[core]))
+        self.events_handled += 1
+        return True
+
+    def run(self) -> None:
+        """运行调度器"""
+        self.jobs.sort(key=lambda x: x.arrival_time)
+        self._jobs = jobs = self.jobs
+        n = len(jobs)
+        cores = self.cores
+        arrival = [job.arrival_time for job in jobs]
+        self._remaining = [job.service_time for job in jobs]
+        self._first_run = [-1] * n
+        self._finish = [-1] * n
+        self._slices = [0] * n
+        self._level = [0] * n  # 最近一次运行（或当前排队）时的级别
+        self._core = [-1] * n  # 最近一次运行所在的核
+        self._queues = [[deque() for _ in range(self.levels)] for _ in range(cores)]
+        self._nonempty = [[] for _ in range(self.levels)]
+        self._low = [0] * cores  # 各核第 1 级及以下排队的作业数
+        self._low_cores = set()
+        self._load = [0] * cores
+        self._least_loaded = _LoadIndex(self._load)
+        self._running = [-1] * cores
+        self._run_start = [0] * cores
+        self._version = [0] * cores  # 运行片编号，被打断的运行片的结束事件据此作废
+        self._events = events = []  # (结束时刻, 核, 运行片编号)
+        interval = self.boost_interval
+        next_boost = interval
+        pending = [False] * cores
+        self.events_handled = 1  # 开始调度
+        k = 0
+        while True:
+            while events and events[0][2] != self._version[events[0][1]]:
+                heapq.heappop(events)
+            if events:
+                time = events[0][0]
+                if k < n and arrival[k] < time:
+                    time = arrival[k]
+            elif k < n:
+                time = arrival[k]
+            else:
+                break
+            self.current_time = time
+            if interval is not None and next_boost < time:
+                # 上一个事件之后到现在队列没有变化，错过的提升合并成一次
+                self._boost()
+                next_boost = -(-time // interval) * interval
+
+            free = []
+            # 1. 时间片结束：完成或降一级，回到本核队列
+            while events and events[0][0] == time:
+                _, core, version = heapq.heappop(events)
+                if version != self._version[core]:
+                    continue
+                i, level = self._stop(core)
+                if self._remaining[i] <= 0:
+                    self._finish[i] = time
+                    self._load[core] -= 1
+                    self._least_loaded.update(core)
+                else:
+                    self._push(i, core, min(level + 1, self.levels - 1))
+                pending[core] = True
+                free.append(core)
+
+            # 2. 到达：放到负载最小的核，打断该核上正在运行的作业
+            while k < n and arrival[k] == time:
+                core = self._least_loaded.top()
+                if self._running[core] >= 0:
+                    self._version[core] += 1
+                    i, level = self._stop(core)
+                    self._push(i, core, level)
+                self._push(k, core, 0)
+                self._load[core] += 1
+                self._least_loaded.update(core)
+                self.events_handled += 1
+                if not pending[core]:
+                    pending[core] = True
+                    free.append(core)
+                k += 1
+
+            if interval is not None and next_boost == time:
+                self._boost()
+                next_boost += interval
+
+            # 3. 空闲的核先运行本地作业，本地为空的再窃取
+            free.sort()
+            idle = [core for core in free if not self._dispatch(core, False)]
+            if self.steal:
+                for core in idle:
+                    if not self._dispatch(core, True):
+                        break  # 已经没有排队的作业
+            for core in free:
+                pending[core] = False
+
+        for i, job in enumerate(jobs):
+            job.start_time = job.arrival_time
+            job.end_time = self._finish[i]
+            job.remaining_time = self._remaining[i]
+            job.current_queue = self._level[i]
+
+    def utilization(self):
+        """各核从时刻 0 到最后一个作业完成的忙碌比例"""
+        span = self.current_time
+        return [busy / span if span > 0 else 0 for busy in self.busy_time]
+
+    def results(self):
+        """每个作业的结果字典（run() 之后按到达时间排序），字段同 MLFQScheduler.results()，另有所在核 core"""
+        results = []
+        for i, job in enumerate(self.jobs):
+            turnaround = job.end_time - job.arrival_time
+            results.append({
+                'name': job.name,
+                'arrival': job.arrival_time,
+                'burst': job.service_time,
+                'start': job.start_time,
+                'finish': job.end_time,
+                'turnaround': turnaround,
+                'waiting': turnaround - job.service_time,
+                'response': self._first_run[i] - job.arrival_time,
+                'queue': self._level[i],
+                'slices': self._slices[i],
+                'core': self._core[i],
+            })
+        return results
+
+
+def summarize_smp(scheduler):
+    """mlfq.summarize() 的结果，另有核数、平均利用率和总迁移次数"""
+    summary = summarize(scheduler)
+    summary['algorithm'] = 'MLFQ-SMP'
+    utilization = scheduler.utilization()
+    summary['cores'] = scheduler.cores
+    summary['utilization'] = sum(utilization) / len(utilization)
+    summary['migrations'] = sum(scheduler.migrations)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m mlfq_smp', description='多核多级反馈队列调度仿真')
+    parser.add_argument('trace', help="轨迹文件（CSV/JSONL），'-' 表示标准输入")
+    parser.add_argument('--cores', type=int, default=2, help='核数，默认 2')
+    parser.add_argument('--time-slices', type=_parse_slices, default=None,
+                        help='逗号分隔的各级时间片，个数即队列数，默认 1,2,4')
+    parser.add_argument('--levels', type=int, default=3, help='未给出时间片时的队列数，第 i 级时间片为 2^i，默认 3')
+    parser.add_argument('--boost-interval', type=int, default=None,
+                        help='全局优先级提升的间隔，所有排队的作业回到第 0 级；默认不提升')
+    parser.add_argument('--no-steal', action='store_true', help='空闲的核不从其他核窃取作业')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='输入格式，默认按扩展名判断')
+    parser.add_argument('--output-format', choices=['json', 'csv', 'jsonl'], default='json', help='输出格式，默认 json')
+    parser.add_argument('-o', '--output', default='-', help='输出文件，默认标准输出')
+    parser.add_argument('--summary-only', action='store_true', help='只输出平均值、分位数和各核统计')
+    args = parser.parse_args(argv)
+
+    if args.cores < 1 or args.levels < 1:
+        parser.error("核数和队列数必须是正整数")
+    if args.boost_interval is not None and args.boost_interval <= 0:
+        parser.error("优先级提升间隔必须是正整数")
+
+    try:
+        scheduler = MultiCoreMLFQScheduler(cores=args.cores, time_slices=args.time_slices, levels=args.levels,
+                                           boost_interval=args.boost_interval, steal=not args.no_steal)
+        for name, arrival, burst, _ in read_trace(args.trace, args.format):
+            scheduler.add_job(Job(name, arrival, burst))
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    scheduler.run()
+    summary = summarize_smp(scheduler)
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        if args.output_format == 'json':
+            report = {
+                'cores': scheduler.cores,
+                'time_slices': scheduler.time_slices,
+                'boost_interval': args.boost_interval,
+                'summary': {k: v for k, v in summary.items() if k not in ('record', 'algorithm', 'cores')},
+                'utilization': scheduler.utilization(),
+                'migrations': scheduler.migrations,
+            }
+            if not args.summary_only:
+                report['results'] = scheduler.results()
+            out.write(json.dumps(report, ensure_ascii=False, indent=2) + '\n')
+        else:
+            extra_fields = ['response', 'queue', 'slices', 'core', 'events', 'cores', 'utilization', 'migrations'] + \
+                           [f'{m}_p{p:g}' for m in METRICS for p in PERCENTILES]
+            writer = ResultWriter(out, args.output_format, extra_fields=extra_fields)
+            if not args.summary_only:
+                for result in scheduler.results():
+                    writer.write({'record': 'process', 'algorithm': 'MLFQ-SMP', **result})
+            writer.write(summary)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""MLFQ 参数自动调优：搜索各级时间片、队列数和优先级提升阈值
+
+在本目录下运行：
+    python -m mlfq_tune trace.csv --objective p99-turnaround
+    python -m mlfq_tune -n 20000 --seed 1 --load 0.9 --service pareto --method halving --samples 81 -j 8
+    python -m mlfq_tune trace.csv --method grid --levels 2,3,4 --boost-thresholds none,20,100 --output-format json
+
+负载为轨迹文件，或不给文件时由 workload.generate 按种子生成；负载只放进共享内存一次，
+各候选配置分发到进程池中并行评估，每次评估都用 silent 日志级别、不画图地运行 MLFQScheduler。
+候选配置为 队列数 × 第 0 级时间片 × 逐级倍数 × 提升阈值 的组合（第 i 级时间片为 基础时间片 · 倍数^i）：
+- random：从所有组合中不重复地随机抽取 samples 个；
+- grid：评估全部组合；
+- halving：连续减半，随机抽取 samples 个，先在按到达时间最早的一小部分作业上评估，
+  每轮只保留最好的 1/eta，下一轮作业数乘以 eta，最后一轮在全部作业上评估。
+  作业数足够多时最后一轮只剩一个配置，因此 --top 无论多大都只输出一行；
+  想看其余配置的排名时用 random 或 grid。
+输出按目标值从好到差排序的配置及其平均值和分位数，第一行为最佳配置。
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from mlfq import MLFQScheduler, summarize
+from sweep import SharedWorkload
+from trace_io import read_trace
+from workload import ARRIVALS, SERVICES, Workload, generate
+
+# 目标名 -> summarize() 结果中的字段，均为越小越好
+OBJECTIVES = {
+    'mean-turnaround': 'turnaround',
+    'p99-turnaround': 'turnaround_p99',
+    'mean-response': 'response',
+    'p99-response': 'response_p99',
+    'mean-waiting': 'waiting',
+    'p99-waiting': 'waiting_p99',
+}
+METHODS = ("random", "grid", "halving")
+
+# 默认的搜索空间
+LEVELS = (2, 3, 4, 5)
+BASE_SLICES = (1, 2, 4, 8)
+GROWTH = (1, 2, 4)
+BOOST_THRESHOLDS = (None, 10, 50, 200)  # None 表示不启用优先级提升
+
+
+def configurations(levels=LEVELS, base_slices=BASE_SLICES, growth=GROWTH, boost_thresholds=BOOST_THRESHOLDS):
+    """搜索空间中的全部 (各级时间片, 提升阈值) 组合，去掉重复的"""
+    configs = {}
+    for n, base, factor, threshold in itertools.product(levels, base_slices, growth, boost_thresholds):
+        configs[(tuple(base * factor ** i for i in range(n)), threshold)] = None
+    return list(configs)
+
+
+def candidates(method, space, samples=32, seed=None):
+    """按搜索方法选出要评估的配置；grid 返回全部，random/halving 不重复地随机抽取 samples 个"""
+    if method not in METHODS:
+        raise ValueError(f"不支持的搜索方法: {method}")
+    if method == "grid" or samples >= len(space):
+        return list(space)
+    return random.Random(seed).sample(space, samples)
+
+
+# 工作进程内缓存：共享内存名 -> (共享内存, 负载)，每个工作进程只映射一次
+_attached = {}
+
+
+def _attach(spec):
+    shm_name, n, _ = spec
+    if shm_name not in _attached:
+        # 与 sweep 相同，共享内存统一由主进程在 tune() 结束时释放
+        shm = shared_memory.SharedMemory(name=shm_name)
+        view = np.ndarray((3, n), dtype=np.float64, buffer=shm.buf)
+        _attached[shm_name] = (shm, Workload(*view))
+    return _attached[shm_name][1]
+
+
+def evaluate(spec, time_slices, boost_threshold, size):
+    """在工作进程中用前 size 个作业评估一个配置，返回 mlfq.summarize() 的结果"""
+    workload = _attach(spec)
+    if size < len(workload):
+        workload = Workload(workload.arrival[:size], workload.burst[:size], workload.priority[:size])
+    scheduler = MLFQScheduler(enable_priority_boost=boost_threshold is not None,
+                              boost_threshold=boost_threshold or 0, time_slices=time_slices,
+                              log_level="silent", visualize=False)
+    workload.add_to(scheduler)
+    scheduler.run()
+    return summarize(scheduler)
+
+
+def _row(config, size, summary, key):
+    time_slices, threshold = config
+    row = {'levels': len(time_slices), 'time_slices': list(time_slices), 'boost_threshold': threshold,
+           'jobs': size, 'objective': summary[key]}
+    row.update((k, v) for k, v in summary.items() if k not in ('record', 'algorithm', 'count'))
+    return row
+
+
+def _ranked(rows):
+    # 目标值相同时保持评估顺序，结果可复现
+    return sorted(rows, key=lambda r: r['objective'])
+
+
+def tune(arrival, burst, objective='mean-turnaround', method='random', space=None, samples=32, jobs=None,
+         seed=None, eta=3, min_jobs=100):
+    """搜索 MLFQ 参数，返回 (最后一轮的结果行按目标值排序, 评估次数)，第一行为最佳配置
+
+    arrival/burst 为作业的到达时间和服务时间（按 Workload.jobs() 的规则取整）；
+    space 为 configurations() 的结果，默认使用默认搜索空间。
+    halving 返回的是最后一轮的结果，只有第一轮作业数已降到 min_jobs 时才会多于一行。
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"不支持的优化目标: {objective}")
+    if eta < 2 or min_jobs < 1:
+        raise ValueError("淘汰比例至少为 2，最少作业数必须是正整数")
+    key = OBJECTIVES[objective]
+    configs = candidates(method, configurations() if space is None else space, samples, seed)
+    # 按到达时间排序，连续减半时取前若干个作业即为最早到达的一段负载
+    order = np.argsort(np.asarray(arrival, dtype=np.float64), kind='stable')
+    arrival = np.asarray(arrival, dtype=np.float64)[order]
+    burst = np.asarray(burst, dtype=np.float64)[order]
+    n = len(arrival)
+    if not n or not configs:
+        raise ValueError("负载和搜索空间都不能为空")
+
+    # 连续减半的各轮作业数：每轮保留 1/eta，作业数乘以 eta，最后一轮为全部作业
+    sizes = [n]
+    if method == "halving":
+        count = len(configs)
+        while count > 1 and sizes[0] > min_jobs:
+            count = -(-count // eta)
+            sizes.insert(0, max(min_jobs, sizes[0] // eta))
+
+    shared = SharedWorkload(arrival, burst)
+    spec = shared.spec()
+    jobs = jobs or os.cpu_count() or 1
+    evaluations = 0
+    try:
+        if jobs == 1:
+            # 单进程时直接使用主进程中的共享内存
+            _attached[shared.shm.name] = (shared.shm, Workload(arrival, burst, np.zeros(n)))
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=jobs)
+        try:
+            for i, size in enumerate(sizes):
+                args = [(spec, list(c[0]), c[1], size) for c in configs]
+                if pool is None:
+                    summaries = [evaluate(*a) for a in args]
+                else:
+                    summaries = [f.result() for f in [pool.submit(evaluate, *a) for a in args]]
+                evaluations += len(configs)
+                rows = _ranked(_row(c, size, s, key) for c, s in zip(configs, summaries))
+                if i < len(sizes) - 1:
+                    keep = {(tuple(r['time_slices']), r['boost_threshold'])
+                            for r in rows[:max(1, -(-len(rows) // eta))]}
+                    configs = [c for c in configs if c in keep]
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    finally:
+        shared.close()
+        _attached.clear()
+    return rows, evaluations
+
+
+def load_trace(path, fmt=None):
+    arrival, burst = [], []
+    for _, a, b, _ in read_trace(path, fmt):
+        arrival.append(a)
+        burst.append(b)
+    return arrival, burst
+
+
+def _flat(row):
+    """表格/CSV 中时间片写成逗号分隔，不提升写成 none"""
+    return {**row, 'time_slices': ','.join(str(s) for s in row['time_slices']),
+            'boost_threshold': 'none' if row['boost_threshold'] is None else row['boost_threshold']}
+
+
+def format_table(rows):
+    headers = ['rank', 'time_slices', 'boost_threshold', 'jobs', 'objective', 'turnaround', 'turnaround_p99',
+               'response', 'response_p99', 'waiting', 'waiting_p99']
+    cells = [[str(i + 1)] + [str(r[h]) if not isinstance(r[h], float) else f"{r[h]:.2f}" for h in headers[1:]]
+             for i, r in enumerate(_flat(r) for r in rows)]
+    widths = [max(len(h), *(len(row[i]) for row in cells)) for i, h in enumerate(headers)]
+    lines = ['  '.join(h.ljust(w) for h, w in zip(headers, widths))]
+    lines += ['  '.join(c.ljust(w) for c, w in zip(row, widths)) for row in cells]
+    return '\n'.join(lines)
+
+
+def _parse_list(text, convert):
+    return [convert(item.strip()) for item in text.split(',') if item.strip()]
+
+
+def _threshold(text):
+    return None if text.lower() == 'none' else int(text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m mlfq_tune', description='MLFQ 时间片与优先级提升阈值的并行调优')
+    parser.add_argument('trace', nargs='?', help='轨迹文件（CSV/JSONL）；不给出时按下面的参数生成负载')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='输入格式，默认按扩展名判断')
+    parser.add_argument('-n', type=int, default=10000, help='生成的作业数，默认 10000')
+    parser.add_argument('--seed', type=int, default=None, help='负载的随机种子')
+    parser.add_argument('--arrivals', choices=ARRIVALS, default='poisson', help='到达过程，默认 poisson')
+    parser.add_argument('--service', choices=SERVICES, default='exponential', help='服务时间分布，默认 exponential')
+    parser.add_argument('--load', type=float, default=0.8, help='负载因子 ρ，默认 0.8')
+    parser.add_argument('--mean-service', type=float, default=4.0, help='平均服务时间，默认 4')
+    parser.add_argument('--objective', choices=list(OBJECTIVES), default='mean-turnaround',
+                        help='优化目标（越小越好），默认 mean-turnaround')
+    parser.add_argument('--method', choices=METHODS, default='random', help='搜索方法，默认 random')
+    parser.add_argument('--samples', type=int, default=32, help='random/halving 抽取的配置数，默认 32')
+    parser.add_argument('--search-seed', type=int, default=None, help='抽取配置的随机种子')
+    parser.add_argument('--eta', type=int, default=3, help='halving 每轮保留 1/eta，默认 3')
+    parser.add_argument('--min-jobs', type=int, default=100, help='halving 第一轮的最少作业数，默认 100')
+    parser.add_argument('--levels', default=','.join(map(str, LEVELS)), help='逗号分隔的队列数，默认 2,3,4,5')
+    parser.add_argument('--base-slices', default=','.join(map(str, BASE_SLICES)),
+                        help='逗号分隔的第 0 级时间片，默认 1,2,4,8')
+    parser.add_argument('--growth', default=','.join(map(str, GROWTH)), help='逗号分隔的逐级时间片倍数，默认 1,2,4')
+    parser.add_argument('--boost-thresholds', default='none,10,50,200',
+                        help='逗号分隔的优先级提升阈值，none 表示不提升，默认 none,10,50,200')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='工作进程数，默认为 CPU 核数')
+    parser.add_argument('--top', type=int, default=10, help='输出前多少个配置，默认 10；halving 通常只剩一个配置')
+    parser.add_argument('--output-format', choices=['table', 'json', 'csv'], default='table')
+    parser.add_argument('-o', '--output', default='-', help='输出文件，默认标准输出')
+    args = parser.parse_args(argv)
+
+    try:
+        levels = _parse_list(args.levels, int)
+        base_slices = _parse_list(args.base_slices, int)
+        growth = _parse_list(args.growth, int)
+        thresholds = _parse_list(args.boost_thresholds, _threshold)
+    except ValueError:
+        parser.error("搜索空间必须是逗号分隔的正整数")
+    if not (levels and base_slices and growth and thresholds) or \
+            min(levels + base_slices + growth + [t for t in thresholds if t is not None]) <= 0:
+        parser.error("搜索空间必须是逗号分隔的正整数")
+    if args.samples < 1 or args.top < 1 or args.n < 1:
+        parser.error("作业数、配置数和输出个数必须是正整数")
+
+    try:
+        if args.trace:
+            arrival, burst = load_trace(args.trace, args.format)
+        else:
+            workload = generate(args.n, arrivals=args.arrivals, service=args.service, load=args.load,
+                                mean_service=args.mean_service, seed=args.seed, integer=True)
+            arrival, burst = workload.arrival, workload.burst
+        rows, evaluations = tune(arrival, burst, args.objective, args.method,
+                                 configurations(levels, base_slices, growth, thresholds), args.samples,
+                                 args.jobs, args.search_seed, args.eta, args.min_jobs)
+    except (OSError, ValueError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    rows = rows[:args.top]
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        if args.output_format == 'table':
+            out.write(format_table(rows) + '\n')
+        elif args.output_format == 'json':
+            report = {'objective': args.objective, 'method': args.method, 'evaluations': evaluations,
+                      'best': rows[0], 'candidates': rows}
+            out.write(json.dumps(report, ensure_ascii=False, indent=2) + '\n')
+        else:
+            writer = csv.DictWriter(out, fieldnames=list(rows[0]), lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(_flat(r) for r in rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,285 +1,22 @@
 import matplotlib
-import heapq
 import matplotlib.patches as patches
-from matplotlib import animation
 import numpy as np
-from collections import deque
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.font_manager import FontProperties
+from gantt import RUNNING, format_time
+from gantt_render import GanttRenderer, row_axis
+from result_cache import ResultCache
+from simulator import Process
+from timeline_anim import TimelineAnimation, TimelineFrames
 
 # 设置matplotlib使用支持中文的字体
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'DejaVu Sans']  # 用来正常显示中文标签
 plt.rcParams['axes.unicode_minus'] = False  # 用来正常显示负号
 
 
-class Process:
-    def __init__(self, name, arrival, burst, priority=0):
-        self.name = name
-        self.arrival = arrival
-        self.burst = burst
-        self.priority = priority
-        self.start_time = -1
-        self.finish_time = -1
-        self.remaining = burst
-        self.last_run = arrival
-        self.response_ratio = 0.0
-        self.running_intervals = []  # 记录进程运行的时间区间
-        self.waiting_intervals = []  # 记录进程等待的时间区间
-
-    def reset(self):
-        self.start_time = -1
-        self.finish_time = -1
-        self.remaining = self.burst
-        self.last_run = self.arrival
-        self.response_ratio = 0.0
-        self.running_intervals = []
-        self.waiting_intervals = []
-
-
-class Event:
-    def __init__(self, time, event_type, process):
-        self.time = time
-        self.type = event_type
-        self.process = process
-
-    def __lt__(self, other):
-        return self.time < other.time
-
-
-class SchedulerSimulator:
-    PROCESS_ARRIVAL = 0
-    PROCESS_START = 1
-    PROCESS_COMPLETE = 2
-    TIME_SLICE_EXPIRED = 3
-
-    def __init__(self, processes, algorithm, quantum=1):
-        self.processes = processes
-        self.algorithm = algorithm
-        self.quantum = quantum
-        self.current_time = 0
-        self.current_process = None
-        self.ready_queue = deque()
-        self.event_queue = []
-        self.timeline = []
-        self.gantt_data = []
-
-        # 重置所有进程状态
-        for p in self.processes:
-            p.reset()
-
-        # 添加所有进程的到达事件
-        for p in self.processes:
-            heapq.heappush(self.event_queue, Event(p.arrival, self.PROCESS_ARRIVAL, p))
-
-    def run(self):
-        while self.event_queue:
-            event = heapq.heappop(self.event_queue)
-            self.current_time = event.time
-
-            # 记录事件
-            self.timeline.append({
-                'time': self.current_time,
-                'event': event.type,
-                'process': event.process.name if event.process else None,
-                'ready_queue': [p.name for p in self.ready_queue]
-            })
-
-            if event.type == self.PROCESS_ARRIVAL:
-                # 进程到达，加入就绪队列
-                self.ready_queue.append(event.process)
-                event.process.last_run = self.current_time
-
-                # 开始等待状态
-                if not event.process.waiting_intervals or event.process.waiting_intervals[-1][1] is not None:
-                    event.process.waiting_intervals.append([self.current_time, None])
-
-            elif event.type == self.PROCESS_START:
-                # 进程开始运行
-                self.current_process = event.process
-                if self.current_process.start_time == -1:
-                    self.current_process.start_time = self.current_time
-
-                # 结束等待状态
-                if self.current_process.waiting_intervals and self.current_process.waiting_intervals[-1][1] is None:
-                    self.current_process.waiting_intervals[-1][1] = self.current_time
-
-                # 记录开始运行时间
-                if not self.current_process.running_intervals or self.current_process.running_intervals[-1][
-                    1] is not None:
-                    self.current_process.running_intervals.append([self.current_time, None])
-
-                # 对于RR算法，添加时间片到期事件
-                if self.algorithm == "RR":
-                    run_time = min(self.current_process.remaining, self.quantum)
-                    heapq.heappush(self.event_queue,
-                                   Event(self.current_time + run_time,
-                                         self.TIME_SLICE_EXPIRED,
-                                         self.current_process))
-                else:
-                    # 非RR算法，直接添加完成事件
-                    heapq.heappush(self.event_queue,
-                                   Event(self.current_time + self.current_process.remaining,
-                                         self.PROCESS_COMPLETE,
-                                         self.current_process))
-
-            elif event.type == self.PROCESS_COMPLETE:
-                # 进程完成
-                p = event.process
-                p.finish_time = self.current_time
-                p.remaining = 0
-
-                # 记录运行结束时间
-                if p.running_intervals and p.running_intervals[-1][1] is None:
-                    p.running_intervals[-1][1] = self.current_time
-
-                # 从就绪队列中移除（如果存在）
-                if p in self.ready_queue:
-                    self.ready_queue.remove(p)
-
-                if self.current_process == p:
-                    self.current_process = None
-
-            elif event.type == self.TIME_SLICE_EXPIRED:
-                # RR算法时间片到期
-                p = event.process
-
-                # 更新剩余时间
-                time_run = self.current_time - p.last_run
-                p.remaining -= time_run
-                p.last_run = self.current_time
-
-                # 记录运行结束时间
-                if p.running_intervals and p.running_intervals[-1][1] is None:
-                    p.running_intervals[-1][1] = self.current_time
-
-                if p.remaining <= 0:
-                    # 进程完成
-                    p.finish_time = self.current_time
-
-                    # 从就绪队列中移除（如果存在）
-                    if p in self.ready_queue:
-                        self.ready_queue.remove(p)
-
-                    if self.current_process == p:
-                        self.current_process = None
-                else:
-                    # 时间片用完但未完成，重新加入就绪队列
-                    self.ready_queue.append(p)
-
-                    # 开始等待状态
-                    if not p.waiting_intervals or p.waiting_intervals[-1][1] is not None:
-                        p.waiting_intervals.append([self.current_time, None])
-
-                    if self.current_process == p:
-                        self.current_process = None
-
-            # 根据算法选择下一个运行的进程
-            if self.current_process is None and self.ready_queue:
-                next_process = None
-
-                if self.algorithm == "FCFS":
-                    # 先来先服务 - 选择最先到达的进程
-                    next_process = self.ready_queue[0]
-
-                elif self.algorithm == "SJF":
-                    # 最短作业优先 - 选择执行时间最短的进程
-                    next_process = min(self.ready_queue, key=lambda p: p.burst)
-
-                elif self.algorithm == "HRRF":
-                    # 最高响应比优先 - 选择响应比最高的进程
-                    for p in self.ready_queue:
-                        waiting_time = self.current_time - p.arrival - (p.burst - p.remaining)
-                        p.response_ratio = 1 + waiting_time / p.burst
-                    next_process = max(self.ready_queue, key=lambda p: p.response_ratio)
-
-                elif self.algorithm == "RR":
-                    # 轮转法 - 选择就绪队列中的第一个进程
-                    next_process = self.ready_queue[0]
-
-                elif self.algorithm == "SRTF":
-                    # 最短剩余时间优先 - 选择剩余时间最短的进程
-                    next_process = min(self.ready_queue, key=lambda p: p.remaining)
-
-                if next_process:
-                    # 从就绪队列中移除选中的进程
-                    if next_process in self.ready_queue:
-                        self.ready_queue.remove(next_process)
-
-                    # 创建开始事件
-                    heapq.heappush(self.event_queue,
-                                   Event(self.current_time,
-                                         self.PROCESS_START,
-                                         next_process))
-
-                    # 更新最后运行时间
-                    next_process.last_run = self.current_time
-
-        # 收集甘特图数据
-        self.gantt_data = []
-        for p in self.processes:
-            # 运行区间
-            for start, end in p.running_intervals:
-                if end is None:  # 处理未结束的情况
-                    end = self.current_time
-                self.gantt_data.append({
-                    'process': p.name,
-                    'start': start,
-                    'end': end,
-                    'duration': end - start,
-                    'type': 'running'  # 标记为运行状态
-                })
-
-            # 等待区间
-            for start, end in p.waiting_intervals:
-                if end is None:  # 处理未结束的情况
-                    end = self.current_time
-                self.gantt_data.append({
-                    'process': p.name,
-                    'start': start,
-                    'end': end,
-                    'duration': end - start,
-                    'type': 'waiting'  # 标记为等待状态
-                })
-
-        # 计算结果
-        results = []
-        total_turnaround = 0
-        total_waiting = 0
-        valid_count = 0
-
-        for p in self.processes:
-            if p.finish_time != -1:
-                turnaround = p.finish_time - p.arrival
-                waiting = turnaround - p.burst
-                total_turnaround += turnaround
-                total_waiting += waiting
-                valid_count += 1
-            #逐个添加结果
-                results.append({
-                    'name': p.name,
-                    'arrival': p.arrival,
-                    'burst': p.burst,
-                    'start': p.start_time,
-                    'finish': p.finish_time,
-                    'turnaround': turnaround,
-                    'waiting': waiting
-                })
-
-        avg_turnaround = total_turnaround / valid_count if valid_count > 0 else 0
-        avg_waiting = total_waiting / valid_count if valid_count > 0 else 0
-        #返回所有结果
-        return {
-            'results': results,
-            'avg_turnaround': avg_turnaround,
-            'avg_waiting': avg_waiting,
-            'gantt_data': self.gantt_data,
-            'timeline': self.timeline
-        }
-
-
 class SchedulingApp:
     def __init__(self, root):
         self.root = root
@@ -293,6 +30,9 @@ class SchedulingApp:
         self.processes = []
         self.current_algorithm = "FCFS"#界面开始默认算法
         self.quantum = 2
+        self.aging = 0
+        # 相同的进程列表、算法和参数再次运行时直接取出上次的结果
+        self.result_cache = ResultCache()
 
         # 确保中文字体设置
         self.setup_chinese_font()
@@ -437,7 +177,10 @@ class SchedulingApp:
             ("最短作业优先 (SJF)", "SJF"),
             ("最高响应比优先 (HRRF)", "HRRF"),
             ("轮转法 (RR)", "RR"),
-            ("最短剩余时间优先 (SRTF)", "SRTF")
+            ("最短剩余时间优先 (SRTF)", "SRTF"),
+            ("非抢占优先级 (PRIORITY)", "PRIORITY"),
+            ("抢占式优先级 (PPRIORITY)", "PPRIORITY"),
+            ("完全公平调度 (CFS)", "CFS")
         ]
 
         # 创建算法选择按钮
@@ -453,6 +196,13 @@ class SchedulingApp:
         self.quantum_entry.pack(side=tk.LEFT, padx=5)
         self.quantum_entry.insert(0, "2")
 
+        # 老化速率设置（仅优先级调度，数值越小优先级越高）
+        self.aging_frame = ttk.Frame(algo_frame)
+        ttk.Label(self.aging_frame, text="老化速率:").pack(side=tk.LEFT)
+        self.aging_entry = ttk.Entry(self.aging_frame, width=5)
+        self.aging_entry.pack(side=tk.LEFT, padx=5)
+        self.aging_entry.insert(0, "0")
+
         # 运行按钮框架
         run_frame = ttk.Frame(parent)
         run_frame.pack(fill=tk.X, pady=10)
@@ -520,6 +270,14 @@ class SchedulingApp:
         timeline_frame = ttk.Frame(notebook)
         notebook.add(timeline_frame, text="时间线")
 
+        # 动画播放设置：每帧时间为 0 时逐事件播放，事件过多时自动跳帧
+        timeline_options = ttk.Frame(timeline_frame)
+        timeline_options.pack(fill=tk.X, padx=10, pady=(10, 0))
+        ttk.Label(timeline_options, text="每帧时间(0为逐事件):").pack(side=tk.LEFT)
+        self.time_step_entry = ttk.Entry(timeline_options, width=5)
+        self.time_step_entry.pack(side=tk.LEFT, padx=5)
+        self.time_step_entry.insert(0, "0")
+
         # 时间线显示区域
         self.timeline_canvas_frame = ttk.Frame(timeline_frame)
         self.timeline_canvas_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -536,9 +294,13 @@ class SchedulingApp:
     def select_algorithm(self):
         self.current_algorithm = self.algo_var.get()
         if self.current_algorithm == "RR":
-            self.quantum_frame.grid(row=2, column=0, columnspan=2, sticky=tk.W, padx=10, pady=5)
+            self.quantum_frame.grid(row=4, column=0, columnspan=2, sticky=tk.W, padx=10, pady=5)
         else:
             self.quantum_frame.grid_forget()
+        if self.current_algorithm in ("PRIORITY", "PPRIORITY"):
+            self.aging_frame.grid(row=4, column=0, columnspan=2, sticky=tk.W, padx=10, pady=5)
+        else:
+            self.aging_frame.grid_forget()
 
     def add_process(self):
         dialog = ProcessDialog(self.root, "添加进程")
@@ -603,9 +365,18 @@ class SchedulingApp:
                 messagebox.showerror("错误", "时间片大小必须是正整数")
                 return
 
-        # 运行仿真
-        simulator = SchedulerSimulator(self.processes, self.current_algorithm, self.quantum)
-        results = simulator.run()
+        # 获取老化速率
+        if self.current_algorithm in ("PRIORITY", "PPRIORITY"):
+            try:
+                self.aging = float(self.aging_entry.get())
+                if self.aging < 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("错误", "老化速率必须是非负数")
+                return
+
+        # 运行仿真（结果按进程列表、算法、时间片和老化速率缓存）
+        results = self.result_cache.run(self.processes, self.current_algorithm, self.quantum, aging=self.aging)
 
         # 显示结果
         self.show_results(results)
@@ -644,6 +415,19 @@ class SchedulingApp:
             f"{results['avg_waiting']:.2f}"
         ), tags=('average',))
 
+        # CFS 另外显示公平性：实际 CPU 份额与按权重应得份额之比
+        if 'fairness' in results:
+            fairness = results['fairness']
+            self.result_tree.insert("", "end", values=(
+                "公平性",
+                f"Jain {fairness['jain_index']:.3f}",
+                "",
+                "",
+                "",
+                f"最小 {fairness['min_ratio']:.2f}",
+                f"最大 {fairness['max_ratio']:.2f}"
+            ), tags=('average',))
+
         # 配置标签样式
         self.result_tree.tag_configure('average', background='#e0e0e0', font=('Arial', 9, 'bold'))
 
@@ -669,58 +453,41 @@ class SchedulingApp:
         # 创建甘特图
         fig, ax = plt.subplots(figsize=(10, 6))
 
-        # 获取所有进程名
-        process_names = sorted(set([d['process'] for d in gantt_data]))
-        y_ticks = np.arange(len(process_names))
-        y_tick_labels = process_names
+        # 获取所有进程名（甘特图数据按列存储，直接读取各列，不逐条生成字典）
+        process_names = gantt_data.process_names()
+        row_of = {name: i for i, name in enumerate(process_names)}
+        pid, start, end, kind = gantt_data.columns()
 
         # 设置y轴
-        ax.set_yticks(y_ticks)
-        ax.set_yticklabels(y_tick_labels)
+        row_axis(ax, process_names)
         ax.set_ylabel('进程')
         ax.set_xlabel('时间')
         ax.set_title(f'进程调度甘特图 - {self.current_algorithm}算法')
 
-        # 为每个进程分配固定颜色
-        colors = plt.cm.Set3(np.linspace(0, 1, len(process_names)))
-        color_map = {name: colors[i] for i, name in enumerate(process_names)}
-
-        # 绘制每个进程的运行区间
-        for d in gantt_data:
-            y_pos = process_names.index(d['process'])
-
-            if d['type'] == 'running':
-                # 运行状态 - 使用彩色
-                face_color = color_map[d['process']]
-                edge_color = 'black'
-                alpha = 0.7
-            else:
-                # 等待状态 - 使用灰色
-                face_color = 'lightgray'
-                edge_color = 'gray'
-                alpha = 0.5
-
-            rect = patches.Rectangle(
-                (d['start'], y_pos - 0.4),
-                d['duration'],
-                0.8,
-                edgecolor=edge_color,
-                linewidth=1,
-                facecolor=face_color,
-                alpha=alpha
-            )
-            ax.add_patch(rect)
+        # 为每个进程分配固定颜色：Set3 只有 12 种颜色，按颜色而不是按进程分组绘制，
+        # 运行状态为样式 0..11，等待状态用灰色（样式 12）
+        cmap = plt.cm.Set3
+        colors = cmap(np.linspace(0, 1, len(process_names)))
+        color_of_row = np.minimum((np.linspace(0, 1, len(process_names)) * cmap.N).astype(np.int64), cmap.N - 1)
+        styles = [dict(facecolor=cmap(i), edgecolor='black', alpha=0.7) for i in range(cmap.N)]
+        styles.append(dict(facecolor='lightgray', edgecolor='gray', alpha=0.5))
+        waiting_style = cmap.N
 
+        # 进程号 -> 行号，同名进程画在同一行
+        rows = np.array([row_of.get(name, 0) for name in gantt_data.names], dtype=np.int64)[pid]
+        style = np.where(kind == RUNNING, color_of_row[rows], waiting_style)
+
+        def label(k, row, s, e):
             # 添加时间标签（只在运行状态且时间足够长时显示）
-            if d['type'] == 'running' and d['duration'] >= 1:
-                ax.text(d['start'] + d['duration'] / 2, y_pos,
-                        f"{d['start']}-{d['end']}",
-                        ha='center', va='center', color='black', fontsize=8,
-                        bbox=dict(boxstyle="round,pad=0.1", facecolor="white", alpha=0.7))
+            if k != waiting_style and e - s >= 1:
+                return f"{format_time(s)}-{format_time(e)}"
+            return None
 
         # 设置x轴范围
-        max_time = max([d['end'] for d in gantt_data]) if gantt_data else 10
+        max_time = gantt_data.max_end() if gantt_data else 10
         ax.set_xlim(0, max_time + 1)
+        # 每种颜色一个多边形集合，缩放/平移时按像素重新抽稀
+        self.gantt_renderer = GanttRenderer(ax, rows, start, end, style, styles, label=label)
 
         # 添加图例
         running_patch = patches.Patch(color=colors[0], alpha=0.7, label='运行状态')
@@ -757,80 +524,26 @@ class SchedulingApp:
             messagebox.showinfo("信息", "没有可显示的时间线数据")
             return
 
+        # 获取每帧时间：0 表示每个事件一帧，正数表示每帧前进的时间单位
+        try:
+            time_step = float(self.time_step_entry.get() or 0)
+            if time_step < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("错误", "每帧时间必须是非负数")
+            return
+
         # 清除之前的时间线
         for widget in self.timeline_canvas_frame.winfo_children():
             widget.destroy()
 
-        # 创建动画
+        # 预先算好每一帧的内容，播放时只更新有变化的元素（blit）
+        frames = TimelineFrames(timeline, time_step or None)
         fig, ax = plt.subplots(figsize=(12, 8))
-        ax.set_xlim(0, timeline[-1]['time'] + 5)
-        ax.set_ylim(-0.5, 2.5)
-        ax.set_xlabel('时间')
-        ax.set_title('进程调度时间线动画')
-
-        # 创建状态文本
-        time_text = ax.text(0.02, 0.95, '', transform=ax.transAxes, fontsize=12)
-        event_text = ax.text(0.02, 0.90, '', transform=ax.transAxes, fontsize=12)
-        process_text = ax.text(0.02, 0.85, '', transform=ax.transAxes, fontsize=12)
-        queue_text = ax.text(0.02, 0.80, '', transform=ax.transAxes, fontsize=12)
-
-        # 创建运行进程的矩形
-        current_rect = None
-
-        # 创建就绪队列文本
-        queue_positions = np.linspace(1.5, 0.5, 5)  # 最多显示5个就绪进程
-
-        def init():
-            time_text.set_text('')
-            event_text.set_text('')
-            process_text.set_text('')
-            queue_text.set_text('')
-            return time_text, event_text, process_text, queue_text
-
-        def animate(i):
-            ax.clear()
-            ax.set_xlim(0, timeline[-1]['time'] + 5)
-            ax.set_ylim(-0.5, 2.5)
-            ax.set_xlabel('时间')
-            ax.set_title('进程调度时间线动画')
-
-            # 绘制当前时间点
-            ax.axvline(x=timeline[i]['time'], color='r', linestyle='--', alpha=0.5)
-
-            # 更新文本
-            time_text = ax.text(0.02, 0.95, f'时间: {timeline[i]["time"]}', transform=ax.transAxes, fontsize=12)
-
-            event_type = timeline[i]['event']
-            event_name = {
-                0: "进程到达",
-                1: "进程开始",
-                2: "进程完成",
-                3: "时间片到期"
-            }.get(event_type, "未知事件")
-            event_text = ax.text(0.02, 0.90, f'事件: {event_name}', transform=ax.transAxes, fontsize=12)
-
-            process_name = timeline[i]['process'] or "无"
-            process_text = ax.text(0.02, 0.85, f'当前进程: {process_name}', transform=ax.transAxes, fontsize=12)
-
-            queue_list = ", ".join(timeline[i]['ready_queue']) or "空"
-            queue_text = ax.text(0.02, 0.80, f'就绪队列: {queue_list}', transform=ax.transAxes, fontsize=12)
-
-            # 绘制就绪队列
-            for j, proc in enumerate(timeline[i]['ready_queue'][:5]):
-                ax.text(timeline[i]['time'] + 1, queue_positions[j], proc,
-                        bbox=dict(boxstyle="round", fc="lightblue", ec="blue", alpha=0.7),
-                        fontsize=10, ha='center')
-
-            # 绘制当前运行的进程
-            if timeline[i]['process']:
-                ax.text(timeline[i]['time'], 2, timeline[i]['process'],
-                        bbox=dict(boxstyle="round", fc="lightgreen", ec="green", alpha=0.7),
-                        fontsize=12, ha='center')
-
-            return time_text, event_text, process_text, queue_text
-
-        anim = animation.FuncAnimation(fig, animate, frames=len(timeline),
-                                       init_func=init, blit=False, interval=500, repeat=False)
+        # 保存动画对象，否则会被回收而停止播放
+        self.timeline_animation = TimelineAnimation(fig, ax, frames)
+
+        plt.tight_layout()
 
         # 嵌入到界面中
         canvas = FigureCanvasTkAgg(fig, self.timeline_canvas_frame)
@@ -841,8 +554,6 @@ class SchedulingApp:
         toolbar = NavigationToolbar2Tk(canvas, self.timeline_canvas_frame)
         toolbar.update()
 
-        plt.tight_layout()
-
 
 class ProcessDialog(simpledialog.Dialog):
     def __init__(self, parent, title, initial_values=None):
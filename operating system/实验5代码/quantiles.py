@@ -0,0 +1,242 @@
+import math
+
+PERCENTILES = (50, 90, 99, 99.9)
+METRICS = ('turnaround', 'waiting', 'response')
+
+
+class QuantileSketch:
+    """对数分桶的可合并分位数草图（DDSketch）
+
+    值 x > 0 落在桶 k = ceil(log_γ x)，γ = (1 + α) / (1 - α)，用桶的代表值 2γ^k / (γ + 1) 估计分位数，
+    相对误差不超过 α。负数按绝对值放在另一组桶中，接近 0 的值单独计数。
+    桶数超过 max_bins 时把最靠近 0 的桶合并，内存有上界，尾部分位数的精度不受影响。
+    两个草图的桶逐个相加即为合并，结果与把所有值放进同一个草图相同。
+    值不超过 exact_limit 个时直接保存原值，分位数是精确的（小规模仿真的结果不带分桶误差）。
+    分位数取最近秩（nearest-rank）：第 q 分位数是从小到大第 ceil(q·n) 个值，q = 1 时即最大值，
+    分桶时取该值所在桶的代表值。
+    """
+
+    MIN_VALUE = 1e-9  # 绝对值小于它的值按 0 计
+
+    def __init__(self, relative_accuracy=0.01, max_bins=2048, exact_limit=1024):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("相对误差必须在 0 和 1 之间")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.exact_limit = exact_limit
+        self._exact = []  # 超过 exact_limit 后为 None，之后只用分桶
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}  # 桶号 -> 个数
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _key(self, x):
+        return math.ceil(math.log(x) / self._log_gamma)
+
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, x):
+        self.count += 1
+        self.sum += x
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        if self._exact is not None:
+            self._exact.append(x)
+            if len(self._exact) > self.exact_limit:
+                self._flush()
+            return
+        self._bin(x)
+
+    def _bin(self, x):
+        if x > self.MIN_VALUE:
+            bins = self.positive
+            key = self._key(x)
+        elif x < -self.MIN_VALUE:
+            bins = self.negative
+            key = self._key(-x)
+        else:
+            self.zero_count += 1
+            return
+        bins[key] = bins.get(key, 0) + 1
+        if len(bins) > self.max_bins:
+            self._collapse(bins)
+
+    def add_many(self, values):
+        """一次加入一个数组，分桶在 NumPy 中完成"""
+        import numpy as np
+
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        if self._exact is not None:
+            if len(self._exact) + len(values) <= self.exact_limit:
+                self._exact.extend(values.tolist())
+                return
+            self._flush()
+        self._bin_many(values)
+
+    def _bin_many(self, values):
+        import numpy as np
+
+        self.zero_count += int(np.count_nonzero(np.abs(values) <= self.MIN_VALUE))
+        for bins, part in ((self.positive, values[values > self.MIN_VALUE]),
+                           (self.negative, -values[values < -self.MIN_VALUE])):
+            if len(part):
+                keys, counts = np.unique(np.ceil(np.log(part) / self._log_gamma).astype(np.int64),
+                                         return_counts=True)
+                for key, n in zip(keys.tolist(), counts.tolist()):
+                    bins[key] = bins.get(key, 0) + n
+                if len(bins) > self.max_bins:
+                    self._collapse(bins)
+
+    def _flush(self):
+        """原值超过 exact_limit 个，全部放入桶中"""
+        exact = self._exact
+        self._exact = None
+        for x in exact:
+            self._bin(x)
+
+    def _collapse(self, bins):
+        """把最靠近 0 的若干个桶合并成一个，使桶数不超过 max_bins"""
+        keys = sorted(bins)
+        extra = keys[:len(keys) - self.max_bins + 1]
+        target = extra[-1]
+        bins[target] = sum(bins.pop(k) for k in extra[:-1]) + bins[target]
+
+    def merge(self, other):
+        """把另一个草图（相同的相对误差）的计数加到本草图上"""
+        if other.gamma != self.gamma:
+            raise ValueError("只能合并相对误差相同的草图")
+        if self._exact is not None:
+            if other._exact is not None and len(self._exact) + len(other._exact) <= self.exact_limit:
+                self._exact.extend(other._exact)
+                self._merge_summary(other)
+                return self
+            self._flush()
+        if other._exact is not None:
+            for x in other._exact:
+                self._bin(x)
+        for bins, other_bins in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, n in other_bins.items():
+                bins[key] = bins.get(key, 0) + n
+            if len(bins) > self.max_bins:
+                self._collapse(bins)
+        self.zero_count += other.zero_count
+        self._merge_summary(other)
+        return self
+
+    def _merge_summary(self, other):
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q):
+        """第 q 分位数（0 <= q <= 1，最近秩），没有数据时返回 None"""
+        if not self.count:
+            return None
+        # 从 0 开始的秩 ceil(q·n) - 1；先舍入，避免 99.9 / 100 * 1000 = 999.0000000000001 这类误差多取一位
+        rank = max(math.ceil(round(q * self.count, 9)) - 1, 0)
+        if self._exact is not None:
+            return float(sorted(self._exact)[rank])
+        return float(min(max(self._bucket_value(rank), self.min), self.max))
+
+    def _bucket_value(self, rank):
+        """第 rank 个值（从 0 开始）所在桶的代表值，可能略超出 [min, max]，由 quantile() 截断"""
+        seen = 0
+        # 从最小的值开始累计：负数按绝对值从大到小，然后是 0，最后是正数
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self.max
+
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+    def to_dict(self):
+        """可以写成 JSON 的状态（桶号转成字符串），from_dict() 还原"""
+        return {
+            'relative_accuracy': self.relative_accuracy, 'max_bins': self.max_bins, 'exact_limit': self.exact_limit,
+            'exact': self._exact, 'positive': {str(k): n for k, n in self.positive.items()},
+            'negative': {str(k): n for k, n in self.negative.items()}, 'zero_count': self.zero_count,
+            'count': self.count, 'sum': self.sum, 'min': self.min, 'max': self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['relative_accuracy'], data['max_bins'], data['exact_limit'])
+        sketch._exact = data['exact']
+        sketch.positive = {int(k): n for k, n in data['positive'].items()}
+        sketch.negative = {int(k): n for k, n in data['negative'].items()}
+        for name in ('zero_count', 'count', 'sum', 'min', 'max'):
+            setattr(sketch, name, data[name])
+        return sketch
+
+
+class LatencyMetrics:
+    """周转时间、等待时间、响应时间各一个分位数草图，进程完成时逐个记录"""
+
+    def __init__(self, relative_accuracy=0.01):
+        self.sketches = {metric: QuantileSketch(relative_accuracy) for metric in METRICS}
+
+    @property
+    def count(self):
+        return self.sketches['turnaround'].count
+
+    def record(self, p):
+        turnaround = p.finish_time - p.arrival
+        self.sketches['turnaround'].add(turnaround)
+        self.sketches['waiting'].add(turnaround - p.burst)
+        self.sketches['response'].add(p.start_time - p.arrival)
+
+    def record_arrays(self, arrival, burst, start, finish):
+        """向量化求解的结果整批记录"""
+        import numpy as np
+
+        turnaround = np.asarray(finish, dtype=np.float64) - arrival
+        self.sketches['turnaround'].add_many(turnaround)
+        self.sketches['waiting'].add_many(turnaround - burst)
+        self.sketches['response'].add_many(np.asarray(start, dtype=np.float64) - arrival)
+
+    def merge(self, other):
+        for metric in METRICS:
+            self.sketches[metric].merge(other.sketches[metric])
+        return self
+
+    def to_dict(self):
+        return {metric: self.sketches[metric].to_dict() for metric in METRICS}
+
+    @classmethod
+    def from_dict(cls, data):
+        metrics = cls()
+        metrics.sketches = {metric: QuantileSketch.from_dict(data[metric]) for metric in METRICS}
+        return metrics
+
+    def report(self):
+        """{'turnaround_p50': ..., 'waiting_p99.9': ..., ...}，没有完成的进程时为 None"""
+        report = {}
+        for metric in METRICS:
+            sketch = self.sketches[metric]
+            for p in PERCENTILES:
+                report[f'{metric}_p{p:g}'] = sketch.quantile(p / 100)
+        return report
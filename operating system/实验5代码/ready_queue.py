@@ -0,0 +1,339 @@
+import heapq
+import math
+from collections import deque
+
+
+class FIFOReadyQueue:
+    """先进先出就绪队列（FCFS / RR）"""
+
+    def __init__(self):
+        self._queue = deque()
+        self._members = set()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def __contains__(self, process):
+        return process in self._members
+
+    def __iter__(self):
+        return iter(self._queue)
+
+    def push(self, process, now):
+        self._queue.append(process)
+        self._members.add(process)
+
+    def pop_next(self, now):
+        process = self._queue.popleft()
+        self._members.discard(process)
+        return process
+
+    def remove(self, process):
+        self._queue.remove(process)
+        self._members.discard(process)
+
+
+class HeapReadyQueue:
+    """按键值最小出队的二叉堆就绪队列，键值相同时按入队顺序出队"""
+
+    def __init__(self, key):
+        self.key = key
+        self._heap = []
+        self._members = {}  # 进程 -> 入队序号，字典同时保持入队顺序
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._members)
+
+    def __contains__(self, process):
+        return process in self._members
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def push(self, process, now):
+        self._seq += 1
+        self._members[process] = self._seq
+        heapq.heappush(self._heap, (self.key(process), self._seq, process))
+
+    def pop_next(self, now):
+        while True:
+            _, seq, process = heapq.heappop(self._heap)
+            # 跳过已被 remove 惰性删除的条目
+            if self._members.get(process) == seq:
+                del self._members[process]
+                return process
+
+    def remove(self, process):
+        del self._members[process]
+        # 堆顶积累的失效条目过多时整体重建
+        if len(self._heap) > 2 * len(self._members) + 64:
+            self._heap = [e for e in self._heap if self._members.get(e[2]) == e[1]]
+            heapq.heapify(self._heap)
+
+
+class PriorityReadyQueue(HeapReadyQueue):
+    """优先级就绪队列（priority 数值越小优先级越高），支持老化
+
+    开启老化后，等待中的进程每等待一个时间单位优先级数值减少 aging，
+    即有效优先级为 priority - aging * (now - 入队时刻)。所有等待进程以相同速率提升，
+    它们之间的先后只取决于 priority + aging * 入队时刻，这个键入队后不再变化，
+    可以直接放进堆里；随时间增长的全局偏移 aging * now 对所有等待进程相同，比较时可以略去，
+    因此不需要每个时刻重新扫描整个队列，入队出队仍为 O(log n)。
+    """
+
+    def __init__(self, aging=0):
+        super().__init__(key=lambda p: p.priority)
+        self.aging = aging
+
+    def push(self, process, now):
+        self._seq += 1
+        self._members[process] = self._seq
+        heapq.heappush(self._heap, (process.priority + self.aging * now, self._seq, process))
+
+
+# nice 值 -20..19 对应的权重（与 Linux 的 sched_prio_to_weight 相同），nice 每差 1 约差 1.25 倍
+NICE_0_WEIGHT = 1024
+NICE_WEIGHTS = [
+    88761, 71755, 56483, 46273, 36291,
+    29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906,
+    3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423,
+    335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45,
+    36, 29, 23, 18, 15,
+]
+
+
+def nice_weight(priority):
+    """由 Process.priority 得到 CFS 权重：priority 直接作为 nice 值，超出 -20..19 的取边界"""
+    return NICE_WEIGHTS[max(-20, min(19, int(priority))) + 20]
+
+
+class CFSRunQueue(HeapReadyQueue):
+    """完全公平调度（CFS）的运行队列，按虚拟运行时间 vruntime 出队
+
+    进程排队期间 vruntime 不变，只有运行的进程会增加，因此用以 (vruntime, 入队序号) 为键的
+    二叉堆（完全平衡的二叉树）即可，出队、入队均为 O(log n)。
+    时间片为调度周期按权重分得的份额：可运行进程不多于 latency / min_granularity 个时周期为 latency，
+    否则为 进程数 * min_granularity，每个时间片不少于 min_granularity。
+    """
+
+    def __init__(self, latency=6, min_granularity=0.75):
+        super().__init__(key=lambda p: p.vruntime)
+        if latency <= 0 or min_granularity <= 0:
+            raise ValueError("调度周期和最小粒度必须为正数")
+        self.latency = latency
+        self.min_granularity = min_granularity
+        self.min_vruntime = 0
+        self.weight_sum = 0  # 队列中进程的权重之和
+
+    def place(self, process):
+        """新到达的进程从当前最小 vruntime 开始，不能凭借到达前的“欠账”长时间独占 CPU"""
+        process.vruntime = max(process.vruntime, self.min_vruntime)
+
+    def push(self, process, now):
+        super().push(process, now)
+        self.weight_sum += nice_weight(process.priority)
+
+    def pop_next(self, now):
+        process = super().pop_next(now)
+        self.weight_sum -= nice_weight(process.priority)
+        # 出队的是 vruntime 最小的进程（运行中的进程此前已重新入队），min_vruntime 单调不减
+        self.min_vruntime = max(self.min_vruntime, process.vruntime)
+        return process
+
+    def remove(self, process):
+        super().remove(process)
+        self.weight_sum -= nice_weight(process.priority)
+
+    def slice_for(self, process):
+        """即将运行的 process（已出队）本次可以运行的时间"""
+        nr = len(self) + 1
+        weight = nice_weight(process.priority)
+        if nr * self.min_granularity <= self.latency:
+            period = self.latency
+        else:
+            period = nr * self.min_granularity
+        return max(period * weight / (self.weight_sum + weight), self.min_granularity)
+
+    def charge(self, process, ran):
+        """按权重折算运行时间，累加到进程的 vruntime"""
+        process.vruntime += ran * NICE_0_WEIGHT / nice_weight(process.priority)
+
+
+class ResponseRatioQueue:
+    """最高响应比优先就绪队列
+
+    响应比 1 + (t - arrival - 已运行时间) / burst 随时间线性增长，斜率为 1/burst，
+    各进程之间的大小关系会随时间翻转，因此不能放进静态键值的堆里。
+    这里用动力学锦标赛树：每个内部节点保存当前胜者以及胜者被反超的时刻，
+    只有当时间推进越过这些时刻时才惰性地重新比较，出队和入队均摊 O(log^2 n)。
+    """
+
+    def __init__(self):
+        self._capacity = 16
+        self._size = 0  # 已使用的叶子槽位数（槽位只追加，序号即入队顺序）
+        self._procs = [None] * self._capacity
+        self._arrival = [0] * self._capacity
+        self._done = [0] * self._capacity
+        self._burst = [1] * self._capacity
+        self._winner = [-1] * (2 * self._capacity)
+        self._fail = [math.inf] * (2 * self._capacity)
+        self._members = {}  # 进程 -> 槽位，字典同时保持入队顺序
+        self._now = -math.inf
+
+    def __len__(self):
+        return len(self._members)
+
+    def __contains__(self, process):
+        return process in self._members
+
+    def __iter__(self):
+        return iter(self._members)
+
+    def _ratio(self, slot, now):
+        # 与原先逐个计算响应比的表达式保持一致，保证比较结果完全相同
+        waiting_time = now - self._arrival[slot] - self._done[slot]
+        return 1 + waiting_time / self._burst[slot]
+
+    def _recompute(self, node, now):
+        left, right = self._winner[2 * node], self._winner[2 * node + 1]
+        fail = min(self._fail[2 * node], self._fail[2 * node + 1])
+        if left < 0 or right < 0:
+            self._winner[node] = left if right < 0 else right
+            self._fail[node] = fail
+            return
+
+        # 响应比相同时保留槽位较小（先入队）的进程
+        if self._ratio(right, now) > self._ratio(left, now):
+            win, lose = right, left
+        else:
+            win, lose = left, right
+        self._winner[node] = win
+
+        # 失败者斜率更大时，计算它反超胜者的时刻
+        if self._burst[lose] < self._burst[win]:
+            c_win = self._arrival[win] + self._done[win]
+            c_lose = self._arrival[lose] + self._done[lose]
+            cross = ((c_lose * self._burst[win] - c_win * self._burst[lose])
+                     / (self._burst[win] - self._burst[lose]))
+            if cross <= now:
+                cross = math.nextafter(now, math.inf)
+            fail = min(fail, cross)
+        self._fail[node] = fail
+
+    def _advance(self, node, now):
+        if self._fail[node] > now:
+            return
+        if node < self._capacity:
+            self._advance(2 * node, now)
+            self._advance(2 * node + 1, now)
+            self._recompute(node, now)
+
+    def _update_path(self, slot, now):
+        node = (self._capacity + slot) // 2
+        while node >= 1:
+            self._recompute(node, now)
+            node //= 2
+
+    def _rebuild(self, capacity, now):
+        # 压缩已删除的槽位，保持入队顺序，必要时扩容
+        live = list(self._members)
+        entries = [(self._arrival[s], self._done[s], self._burst[s]) for s in self._members.values()]
+        self._capacity = capacity
+        self._procs = [None] * capacity
+        self._arrival = [0] * capacity
+        self._done = [0] * capacity
+        self._burst = [1] * capacity
+        self._winner = [-1] * (2 * capacity)
+        self._fail = [math.inf] * (2 * capacity)
+        self._members = {}
+        for slot, (process, (arrival, done, burst)) in enumerate(zip(live, entries)):
+            self._procs[slot] = process
+            self._arrival[slot] = arrival
+            self._done[slot] = done
+            self._burst[slot] = burst
+            self._winner[capacity + slot] = slot
+            self._members[process] = slot
+        self._size = len(live)
+        for node in range(capacity - 1, 0, -1):
+            self._recompute(node, now)
+
+    def push(self, process, now):
+        self._now = now
+        if self._size == self._capacity:
+            capacity = self._capacity
+            while len(self._members) + 1 > capacity // 2:
+                capacity *= 2
+            self._rebuild(capacity, now)
+        else:
+            self._advance(1, now)
+
+        slot = self._size
+        self._size += 1
+        self._procs[slot] = process
+        self._arrival[slot] = process.arrival
+        self._done[slot] = process.burst - process.remaining
+        self._burst[slot] = process.burst
+        self._winner[self._capacity + slot] = slot
+        self._members[process] = slot
+        self._update_path(slot, now)
+
+    def pop_next(self, now):
+        self._now = now
+        self._advance(1, now)
+        slot = self._winner[1]
+        process = self._procs[slot]
+        process.response_ratio = self._ratio(slot, now)
+        self._discard(slot, now)
+        return process
+
+    def remove(self, process):
+        self._advance(1, self._now)
+        self._discard(self._members[process], self._now)
+
+    def _discard(self, slot, now):
+        del self._members[self._procs[slot]]
+        self._procs[slot] = None
+        self._winner[self._capacity + slot] = -1
+        self._update_path(slot, now)
+
+
+def rate_monotonic_key(p):
+    """单调速率优先级：周期越短优先级越高，非周期任务按相对截止期，都没有的排在最后"""
+    if p.period is not None:
+        return p.period
+    return p.deadline if p.deadline is not None else math.inf
+
+
+# 各调度算法对应的就绪队列
+READY_QUEUES = {
+    "FCFS": FIFOReadyQueue,
+    "RR": FIFOReadyQueue,
+    "SJF": lambda: HeapReadyQueue(key=lambda p: p.burst),  # 按执行时间
+    "SRTF": lambda: HeapReadyQueue(key=lambda p: p.remaining),  # 按剩余时间
+    "HRRF": ResponseRatioQueue,
+    "PRIORITY": PriorityReadyQueue,  # 按优先级（可老化）
+    "PPRIORITY": PriorityReadyQueue,
+    "CFS": CFSRunQueue,  # 按虚拟运行时间
+    "EDF": lambda: HeapReadyQueue(key=lambda p: p.abs_deadline),  # 按绝对截止期
+    "RM": lambda: HeapReadyQueue(key=rate_monotonic_key),  # 按周期
+}
+
+# 使用优先级队列、接受老化参数的算法
+PRIORITY_ALGORITHMS = ("PRIORITY", "PPRIORITY")
+
+
+def make_ready_queue(algorithm, aging=0, latency=6, min_granularity=0.75):
+    """根据调度算法创建就绪队列，aging 只对优先级调度有效，latency/min_granularity 只对 CFS 有效"""
+    try:
+        factory = READY_QUEUES[algorithm]
+    except KeyError:
+        raise ValueError(f"未知的调度算法: {algorithm}")
+    if algorithm in PRIORITY_ALGORITHMS:
+        return factory(aging)
+    if algorithm == "CFS":
+        return factory(latency, min_granularity)
+    return factory()
@@ -0,0 +1,189 @@
+"""实时调度：截止期统计、可调度性分析和命令行入口
+
+在本目录下运行：
+    python -m realtime tasks.csv -a EDF,RM
+    python -m realtime tasks.csv -a EDF --horizon 10000000 --output-format jsonl
+
+任务文件为 CSV（name,arrival,burst,priority,deadline,period）或 JSONL，period 为空表示非周期任务，
+deadline 为空时取 period（隐式截止期）。周期任务从 arrival 开始每隔 period 释放一次作业，
+直到 horizon（默认为最晚的周期任务起点加上超周期，即周期的最小公倍数）。
+"""
+import argparse
+import json
+import math
+import sys
+from fractions import Fraction
+from functools import reduce
+
+from quantiles import PERCENTILES, QuantileSketch
+from trace_io import read_trace
+
+REALTIME_ALGORITHMS = ("EDF", "RM")
+
+
+def relative_deadline(p):
+    """相对截止期：显式给出的 deadline，否则为周期，都没有时为无穷大"""
+    if p.deadline is not None:
+        return p.deadline
+    if p.period is not None:
+        return p.period
+    return math.inf
+
+
+def hyperperiod(periods):
+    """周期的最小公倍数；周期可以是整数或有限小数，没有周期时返回 None"""
+    periods = [Fraction(str(t)) for t in periods]
+    if not periods:
+        return None
+    numerator = reduce(math.lcm, (t.numerator for t in periods))
+    denominator = reduce(math.gcd, (t.denominator for t in periods))
+    h = Fraction(numerator, denominator)
+    return int(h) if h.denominator == 1 else float(h)
+
+
+def schedulability(tasks):
+    """单处理器上周期任务集的可调度性分析
+
+    - EDF：截止期等于周期时 U <= 1 为充要条件；截止期小于周期时用密度 Σ C/min(D,T) <= 1（充分条件）。
+    - RM：Liu-Layland 利用率上界 n(2^(1/n) - 1)（充分条件），以及响应时间分析
+      R = C_i + Σ_{j 优先级高于 i} ceil(R / T_j) C_j 的不动点迭代，R <= D_i 即可调度（精确条件）。
+    """
+    periodic = [p for p in tasks if p.period is not None]
+    n = len(periodic)
+    utilization = sum(p.burst / p.period for p in periodic)
+    density = sum(p.burst / min(relative_deadline(p), p.period) for p in periodic)
+    implicit = all(relative_deadline(p) >= p.period for p in periodic)
+    bound = n * (2 ** (1 / n) - 1) if n else 1.0
+
+    # 响应时间分析，优先级按周期（相同则按截止期）排序
+    ordered = sorted(periodic, key=lambda p: (p.period, relative_deadline(p)))
+    response = {}
+    rm_ok = True
+    for i, task in enumerate(ordered):
+        higher = ordered[:i]
+        r = task.burst + sum(p.burst for p in higher)
+        limit = relative_deadline(task)
+        while r <= limit:
+            nxt = task.burst + sum(math.ceil(r / p.period) * p.burst for p in higher)
+            if nxt == r:
+                break
+            r = nxt
+        response[task.name] = r if r <= limit else None
+        rm_ok = rm_ok and r <= limit
+
+    return {
+        'tasks': n,
+        'utilization': utilization,
+        'hyperperiod': hyperperiod(p.period for p in periodic),
+        'edf': {
+            'test': 'utilization' if implicit else 'density',
+            'value': utilization if implicit else density,
+            'schedulable': (utilization if implicit else density) <= 1,
+        },
+        'rm': {
+            'liu_layland_bound': bound,
+            'liu_layland_pass': utilization <= bound,
+            'response_times': response,  # 超过截止期的为 None
+            'schedulable': rm_ok,
+        },
+    }
+
+
+class DeadlineLedger:
+    """按作业统计截止期：完成数、错过数、迟到量（完成时刻 - 绝对截止期，提前完成为负）
+
+    迟到量记入分位数草图，长时间仿真的内存不随作业数增长。
+    """
+
+    def __init__(self):
+        self.jobs = 0
+        self.misses = 0
+        self.lateness = QuantileSketch()
+        self.per_task = {}  # 任务名 -> [作业数, 错过数, 最大迟到量]
+
+    def record(self, p):
+        if p.abs_deadline == math.inf:
+            return
+        late = p.finish_time - p.abs_deadline
+        self.jobs += 1
+        self.lateness.add(late)
+        stats = self.per_task.get(p.name)
+        if stats is None:
+            stats = self.per_task[p.name] = [0, 0, late]
+        stats[0] += 1
+        if late > 0:
+            self.misses += 1
+            stats[1] += 1
+        stats[2] = max(stats[2], late)
+
+    def report(self):
+        report = {
+            'jobs': self.jobs,
+            'misses': self.misses,
+            'miss_ratio': self.misses / self.jobs if self.jobs else 0.0,
+            'max_lateness': self.lateness.max if self.jobs else 0.0,
+        }
+        for p in PERCENTILES:
+            report[f'lateness_p{p:g}'] = self.lateness.quantile(p / 100) if self.jobs else 0.0
+        report['tasks'] = {name: {'jobs': jobs, 'misses': misses, 'max_lateness': worst}
+                           for name, (jobs, misses, worst) in self.per_task.items()}
+        return report
+
+
+def main(argv=None):
+    from simulator import Process, SchedulerSimulator
+
+    parser = argparse.ArgumentParser(prog='python -m realtime', description='EDF/RM 实时调度仿真与可调度性分析')
+    parser.add_argument('tasks', help="任务文件（CSV/JSONL），'-' 表示标准输入")
+    parser.add_argument('-a', '--algorithms', default='EDF,RM', help='逗号分隔的算法列表，默认 EDF,RM')
+    parser.add_argument('--horizon', type=float, default=None, help='仿真到的时刻，默认为最晚的周期任务起点加超周期')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='输入格式，默认按扩展名判断')
+    parser.add_argument('--output-format', choices=['text', 'jsonl'], default='text')
+    args = parser.parse_args(argv)
+
+    algorithms = [a.strip().upper() for a in args.algorithms.split(',') if a.strip()]
+    for algo in algorithms:
+        if algo not in REALTIME_ALGORITHMS:
+            parser.error(f"未知的实时调度算法: {algo}")
+    try:
+        rows = list(read_trace(args.tasks, args.format, realtime=True))
+    except (OSError, ValueError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    horizon = args.horizon
+    if horizon is not None and horizon.is_integer():
+        horizon = int(horizon)
+
+    tasks = [Process(*row) for row in rows]
+    analysis = schedulability(tasks)
+    outputs = []
+    for algo in algorithms:
+        sim = SchedulerSimulator(tasks, algo, timeline="off", record_gantt=False, horizon=horizon)
+        result = sim.run()
+        outputs.append({'algorithm': algo, 'horizon': sim.horizon, 'avg_turnaround': result['avg_turnaround'],
+                        **result['deadlines']})
+
+    if args.output_format == 'jsonl':
+        print(json.dumps({'record': 'schedulability', **analysis}, ensure_ascii=False))
+        for out in outputs:
+            print(json.dumps({'record': 'deadlines', **out}, ensure_ascii=False))
+        return 0
+
+    edf, rm = analysis['edf'], analysis['rm']
+    print(f"周期任务 {analysis['tasks']} 个，利用率 U = {analysis['utilization']:.4f}，"
+          f"超周期 {analysis['hyperperiod']}")
+    print(f"EDF: {edf['test']} = {edf['value']:.4f} -> {'可调度' if edf['schedulable'] else '不可调度'}")
+    print(f"RM : Liu-Layland 上界 {rm['liu_layland_bound']:.4f} -> {'通过' if rm['liu_layland_pass'] else '未通过'}，"
+          f"响应时间分析 -> {'可调度' if rm['schedulable'] else '不可调度'}")
+    for name, r in rm['response_times'].items():
+        print(f"    {name}: 最坏响应时间 {'超过截止期' if r is None else r}")
+    for out in outputs:
+        print(f"{out['algorithm']}: 仿真到 {out['horizon']}，作业 {out['jobs']} 个，错过截止期 {out['misses']} 个 "
+              f"({out['miss_ratio']:.2%})，迟到量 p50/p90/p99/p99.9 = "
+              + "/".join(f"{out[f'lateness_p{p:g}']:g}" for p in PERCENTILES)
+              + f"，最大 {out['max_lateness']:g}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import pickle
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+
+# 仿真语义改变（结果不再相同）时加 1，旧的磁盘缓存随之失效
+CACHE_VERSION = 2
+
+
+def process_digest(processes):
+    """进程列表的内容摘要：按顺序对 (名称, 到达, 服务, 优先级, 截止期, 周期) 取 SHA-256"""
+    rows = [(p.name, p.arrival, p.burst, p.priority, p.deadline, p.period) for p in processes]
+    return hashlib.sha256(pickle.dumps(rows, protocol=4)).hexdigest()
+
+
+def columns_digest(*columns):
+    """按列存储的负载（如 sweep 的 arrival/burst/priority）的内容摘要"""
+    import numpy as np
+
+    h = hashlib.sha256()
+    for column in columns:
+        column = np.ascontiguousarray(column, dtype=np.float64)
+        h.update(len(column).to_bytes(8, 'little'))
+        h.update(column.tobytes())
+    return h.hexdigest()
+
+
+def fingerprint(digest, algorithm, quantum=1, **options):
+    """缓存键：负载摘要 + 算法 + 时间片 + 其他影响结果的参数
+
+    时间片只影响 RR，老化参数 aging 只影响 PRIORITY/PPRIORITY，其余算法不计入，
+    这些参数不同的运行共用一个条目。
+    """
+    if algorithm not in ("PRIORITY", "PPRIORITY"):
+        options.pop('aging', None)
+    key = (CACHE_VERSION, digest, algorithm, quantum if algorithm == "RR" else None, sorted(options.items()))
+    return hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """按内容寻址的仿真结果缓存
+
+    内存中是容量为 max_entries 的 LRU；给出 path 时另有一层 SQLite 磁盘缓存，多次会话共用，
+    值为 zlib 压缩的 JSON，超过 max_disk_entries 条时删除最久未用的条目。
+    磁盘上不用 pickle：缓存文件可能被他人改写，读出时只做 JSON 解析，不会执行其中的代码。
+    encode/decode 在值与可以写成 JSON 的对象之间转换（如 LatencyMetrics.to_dict/from_dict），
+    默认不转换，此时值本身必须能写成 JSON。
+    查找先内存后磁盘，磁盘命中的结果放回内存。
+    缓存返回的是同一个结果对象，调用方不应修改它。
+    """
+
+    def __init__(self, max_entries=32, path=None, max_disk_entries=1024, encode=None, decode=None):
+        if max_entries < 1:
+            raise ValueError("缓存容量必须是正整数")
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._encode = encode
+        self._decode = decode
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            self._db.execute("CREATE TABLE IF NOT EXISTS results "
+                             "(key TEXT PRIMARY KEY, value BLOB NOT NULL, used REAL NOT NULL)")
+            self._db.commit()
+
+    def __len__(self):
+        return len(self._memory)
+
+    def get(self, key):
+        """返回缓存的结果，没有时返回 None"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+        if self._db is not None:
+            row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                value = json.loads(zlib.decompress(row[0]).decode('utf-8'))
+                if self._decode is not None:
+                    value = self._decode(value)
+                self.hits += 1
+                self.disk_hits += 1
+                self._db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+                self._remember(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self._db is not None:
+            data = self._encode(value) if self._encode is not None else value
+            blob = zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+            self._db.execute("INSERT OR REPLACE INTO results (key, value, used) VALUES (?, ?, ?)",
+                             (key, blob, time.time()))
+            self._db.execute("DELETE FROM results WHERE key IN "
+                             "(SELECT key FROM results ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                             (self.max_disk_entries,))
+            self._db.commit()
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def run(self, processes, algorithm, quantum=1, **options):
+        """SchedulerSimulator(processes, algorithm, quantum, **options).run()，相同输入直接返回缓存结果"""
+        from simulator import SchedulerSimulator
+
+        key = fingerprint(process_digest(processes), algorithm, quantum, **options)
+        result = self.get(key)
+        if result is None:
+            result = SchedulerSimulator(processes, algorithm, quantum, **options).run()
+            self.put(key, result)
+        return result
+
+    def stats(self):
+        return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses, 'entries': len(self)}
+
+    def clear(self):
+        self._memory.clear()
+        if self._db is not None:
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,140 @@
+"""无界面的批量调度仿真
+
+在本目录下运行：
+    python -m scheduler_cli trace.csv -a FCFS,SJF,RR -q 2
+    python -m scheduler_cli trace.csv -a PRIORITY,PPRIORITY --aging 0.1
+    python -m scheduler_cli trace.csv -a all --cpus 64 --smp-mode steal
+    python -m scheduler_cli trace.csv -a CFS --latency 6 --min-granularity 0.75
+    cat trace.jsonl | python -m scheduler_cli - --format jsonl --output-format jsonl
+
+轨迹按到达时间排序后逐行读入，多个算法同步推进，每个进程完成时立即写出结果，
+最后为每个算法写出一行平均值和周转/等待/响应时间的 p50/p90/p99/p99.9。
+分位数由仿真器在进程完成时记入草图，内存只与同时在系统中的进程数有关。
+"""
+import argparse
+import sys
+
+from quantiles import METRICS, PERCENTILES
+from simulator import Process, SchedulerSimulator
+from smp import SMP_MODES, SMPSimulator
+from trace_io import ResultWriter, read_trace
+
+ALGORITHMS = ["FCFS", "SJF", "HRRF", "RR", "SRTF", "PRIORITY", "PPRIORITY", "CFS"]
+
+
+def parse_algorithms(text):
+    if text.lower() == 'all':
+        return list(ALGORITHMS)
+    algorithms = [a.strip().upper() for a in text.split(',') if a.strip()]
+    for algo in algorithms:
+        if algo not in ALGORITHMS:
+            raise argparse.ArgumentTypeError(f"未知的调度算法: {algo}")
+    return algorithms
+
+
+def run_batch(rows, algorithms, quantum, writer, summary_only=False, aging=0, cpus=1, smp_mode="global",
+              latency=6, min_granularity=0.75):
+    """按轨迹顺序把每个进程同时送入所有算法的仿真器，返回各算法的平均值和分位数
+
+    cpus 大于 1 时使用多核仿真，平均值中另外给出 CPU 平均利用率和迁移次数；
+    单核 CFS 另外给出 Jain 公平性指数。
+    """
+    def make(algo):
+        if cpus > 1:
+            return SMPSimulator([], algo, quantum, cpus=cpus, mode=smp_mode, record_gantt=False, aging=aging,
+                                latency=latency, min_granularity=min_granularity)
+        sim = SchedulerSimulator([], algo, quantum, timeline="off", record_gantt=False, aging=aging,
+                                 latency=latency, min_granularity=min_granularity)
+        if sim.fairness is not None:
+            sim.fairness.keep_tasks = False  # 流式运行只保留汇总
+        return sim
+
+    simulators = {algo: make(algo) for algo in algorithms}
+
+    def emit(algo, finished):
+        if summary_only:
+            return
+        sim = simulators[algo]
+        for p in finished:
+            result = sim.result_of(p)
+            result['record'] = 'process'
+            result['algorithm'] = algo
+            writer.write(result)
+
+    for name, arrival, burst, priority in rows:
+        for algo, sim in simulators.items():
+            # 每个仿真器需要独立的进程状态
+            emit(algo, sim.feed(Process(name, arrival, burst, priority)))
+    for algo, sim in simulators.items():
+        emit(algo, sim.close())
+
+    summary = {}
+    for algo, sim in simulators.items():
+        sketches = sim.metrics.sketches
+        summary[algo] = {
+            'record': 'average',
+            'algorithm': algo,
+            'count': sim.metrics.count,
+            'turnaround': sketches['turnaround'].mean(),
+            'waiting': sketches['waiting'].mean(),
+            **sim.metrics.report(),
+        }
+        if cpus > 1:
+            utilization = sim.utilization()
+            summary[algo]['utilization'] = sum(utilization) / len(utilization)
+            summary[algo]['migrations'] = sim.migrations
+        if sim.fairness is not None:
+            summary[algo]['jain_index'] = sim.fairness.jain_index()
+        writer.write(summary[algo])
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m scheduler_cli', description='无界面的批量进程调度仿真')
+    parser.add_argument('trace', help="轨迹文件（CSV/JSONL），'-' 表示标准输入")
+    parser.add_argument('-a', '--algorithms', type=parse_algorithms, default=['FCFS'],
+                        help="逗号分隔的算法列表或 all，默认 FCFS")
+    parser.add_argument('-q', '--quantum', type=int, default=2, help='RR 时间片大小，默认 2')
+    parser.add_argument('--aging', type=float, default=0,
+                        help='优先级调度的老化速率（每个时间单位优先级数值的减少量），默认 0')
+    parser.add_argument('--latency', type=float, default=6, help='CFS 调度周期（目标延迟），默认 6')
+    parser.add_argument('--min-granularity', type=float, default=0.75, help='CFS 最小时间片，默认 0.75')
+    parser.add_argument('--cpus', type=int, default=1, help='CPU 数，大于 1 时为多核仿真，默认 1')
+    parser.add_argument('--smp-mode', choices=SMP_MODES, default='global',
+                        help='多核调度方式：global 公共队列，partitioned 各 CPU 独立队列，steal 独立队列加工作窃取')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='输入格式，默认按扩展名判断')
+    parser.add_argument('--output-format', choices=['csv', 'jsonl'], default='csv', help='输出格式，默认 csv')
+    parser.add_argument('-o', '--output', default='-', help="输出文件，默认标准输出")
+    parser.add_argument('--summary-only', action='store_true', help='只输出各算法的平均值')
+    args = parser.parse_args(argv)
+
+    if args.quantum <= 0:
+        parser.error("时间片大小必须是正整数")
+    if args.aging < 0:
+        parser.error("老化速率不能为负数")
+    if args.cpus < 1:
+        parser.error("CPU 数必须是正整数")
+    if args.latency <= 0 or args.min_granularity <= 0:
+        parser.error("调度周期和最小时间片必须为正数")
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        extra_fields = [f'{m}_p{p:g}' for m in METRICS for p in PERCENTILES]
+        if args.cpus > 1:
+            extra_fields += ['cpu', 'utilization', 'migrations']
+        if "CFS" in args.algorithms and args.cpus == 1:
+            extra_fields.append('jain_index')
+        writer = ResultWriter(out, args.output_format, extra_fields=extra_fields)
+        run_batch(read_trace(args.trace, args.format), args.algorithms, args.quantum, writer, args.summary_only,
+                  args.aging, args.cpus, args.smp_mode, args.latency, args.min_granularity)
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,531 @@
+import heapq
+import itertools
+import math
+
+from fairness import FairnessLedger
+from gantt import RUNNING, WAITING, GanttTable
+from quantiles import LatencyMetrics
+from ready_queue import make_ready_queue, rate_monotonic_key
+from realtime import REALTIME_ALGORITHMS, DeadlineLedger, hyperperiod
+from timeline import make_timeline
+
+
+class Process:
+    # 用 __slots__ 省去每个实例的 __dict__，大规模仿真时节省内存（对比见 bench_memory.py）
+    __slots__ = ('name', 'arrival', 'burst', 'priority', 'start_time', 'finish_time', 'remaining',
+                 'last_run', 'response_ratio', 'pid', 'run_since', 'wait_since', 'cpu', 'vruntime',
+                 'deadline', 'period', 'abs_deadline')
+
+    def __init__(self, name, arrival, burst, priority=0, deadline=None, period=None):
+        self.name = name
+        self.arrival = arrival
+        self.burst = burst
+        self.priority = priority
+        self.deadline = deadline  # 相对截止期，None 表示没有（周期任务默认为周期）
+        self.period = period  # 周期任务每隔 period 释放一个作业，None 表示非周期
+        self.start_time = -1
+        self.finish_time = -1
+        self.remaining = burst
+        self.last_run = arrival
+        self.response_ratio = 0.0
+        self.pid = -1  # 送入仿真器时分配的进程号
+        self.run_since = None  # 当前运行区间的开始时间
+        self.wait_since = None  # 当前等待区间的开始时间
+        self.cpu = -1  # 最近一次运行所在的 CPU（多核仿真）
+        self.vruntime = 0  # CFS 虚拟运行时间
+        self.abs_deadline = self._absolute_deadline()
+
+    def _absolute_deadline(self):
+        if self.deadline is not None:
+            return self.arrival + self.deadline
+        if self.period is not None:
+            return self.arrival + self.period
+        return math.inf
+
+    def reset(self):
+        self.start_time = -1
+        self.finish_time = -1
+        self.remaining = self.burst
+        self.last_run = self.arrival
+        self.response_ratio = 0.0
+        self.run_since = None
+        self.wait_since = None
+        self.cpu = -1
+        self.vruntime = 0
+        self.abs_deadline = self._absolute_deadline()
+
+
+class SchedulerSimulator:
+    PROCESS_ARRIVAL = 0
+    PROCESS_START = 1
+    PROCESS_COMPLETE = 2
+    TIME_SLICE_EXPIRED = 3
+    JOB_RELEASE = 4  # 周期任务释放下一个作业（内部事件，处理时按该作业到达记录）
+
+    # 不记录时间线时可以走 fast_path 向量化求解的算法
+    VECTORIZED_ALGORITHMS = ("FCFS", "SJF")
+    # 新进程到达时可以抢占当前进程的算法
+    PREEMPTIVE_ALGORITHMS = ("PPRIORITY", "EDF", "RM")
+
+    def __init__(self, processes, algorithm, quantum=1, timeline="full", timeline_every=1, record_gantt=True,
+                 aging=0, latency=6, min_granularity=0.75, horizon=None):
+        self.processes = processes
+        self.algorithm = algorithm
+        self.quantum = quantum
+        # 优先级调度的老化速率：等待中的进程每个时间单位优先级数值减少 aging
+        self.aging = aging
+        self.current_time = 0
+        self.current_process = None
+        # CFS 的调度周期（目标延迟）和最小粒度
+        self.latency = latency
+        self.min_granularity = min_granularity
+        self.ready_queue = make_ready_queue(algorithm, aging, latency, min_granularity)
+        # CFS 下统计每个进程实际得到与按权重应得的 CPU 份额
+        self.fairness = FairnessLedger() if algorithm == "CFS" else None
+        # 周转/等待/响应时间的分位数草图，进程完成时在线记录，内存有上界，可跨仿真合并
+        self.metrics = LatencyMetrics()
+        # 周期任务释放作业直到 horizon（不含），run() 时默认为超周期；有截止期的作业统计是否按时完成
+        self.horizon = horizon
+        self.deadlines = DeadlineLedger()
+        self._tasks = {}  # 周期任务的进程号 -> 任务
+        # 事件堆中只保存内部事件（开始/完成/时间片到期），到达事件由调用方按时间顺序送入，
+        # 条目为 (时间, 序号, 事件类型, 进程号) 元组，序号唯一，同一时刻严格按入堆顺序处理，
+        # 比较时不会落到进程对象上
+        self.event_queue = []
+        self._event_seq = itertools.count()
+        self._active = {}  # 进程号 -> 尚未完成的进程
+        self._cancelled = set()  # 被抢占而作废的事件序号，出堆时跳过
+        self._running_entry = None  # 当前进程待处理的开始/完成事件，抢占时作废
+        self._dispatch_pending = False  # 已安排调度事件、尚未选出下一个运行的进程
+        self._last_arrival = None
+        self._next_pid = 0
+        self._finished = []
+        self.events_handled = 0  # 已处理的事件数（含到达，不含作废的事件），用于性能统计
+        # RR 无竞争时合并连续时间片：(进程, 事件堆条目, 开始时刻, 开始时的剩余时间)
+        self._coalesced = None
+        # 时间线记录模式：off 不记录，sampled 每 timeline_every 个事件保存一次快照，
+        # full 以增量方式记录每个事件
+        self.timeline = make_timeline(timeline, timeline_every)
+        # 运行/等待区间按列记录，流式运行时可以关闭
+        self.gantt_data = GanttTable() if record_gantt else None
+
+        # 重置所有进程状态
+        for p in self.processes:
+            p.reset()
+
+    def feed(self, process):
+        """送入下一个到达的进程，返回在此之前已完成的进程列表
+
+        进程必须按到达时间非递减的顺序送入。同一时刻到达事件先于内部事件处理，
+        这样刚好在某进程完成时到达的进程也能参与这一次调度。
+        """
+        if self._last_arrival is not None and process.arrival < self._last_arrival:
+            raise ValueError(f"进程 {process.name} 的到达时间 {process.arrival} "
+                             f"早于上一个进程的到达时间 {self._last_arrival}，请按到达时间排序")
+        if process.period is not None and self.horizon is None:
+            raise ValueError(f"周期任务 {process.name} 需要指定仿真结束时刻 horizon")
+        self._last_arrival = process.arrival
+        self._register(process)
+
+        # 先处理到达时刻之前的所有内部事件
+        while self.event_queue and self.event_queue[0][0] < process.arrival:
+            self._pop_event()
+        # 仍在合并运行的进程从新进程到达起恢复逐片调度
+        if self._coalesced is not None:
+            self._split_coalesced(process.arrival)
+        self.events_handled += 1
+        self._handle(process.arrival, -1, self.PROCESS_ARRIVAL, process.pid)
+        # 周期任务：本身作为第一个作业，之后的作业由事件堆中的释放事件产生
+        if process.period is not None:
+            self._tasks[process.pid] = [process, 1]
+            self._schedule_release(process.pid)
+        return self._take_finished()
+
+    def _register(self, process):
+        """为进入系统的进程（或周期任务的作业）分配进程号"""
+        process.pid = self._next_pid
+        self._next_pid += 1
+        self._active[process.pid] = process
+        if self.timeline is not None:
+            self.timeline.register(process)
+        if self.gantt_data is not None:
+            self.gantt_data.names.append(process.name)
+
+    def _schedule_release(self, task_pid):
+        """第 k 个作业在 arrival + k * period 释放（用乘法避免累加误差），不晚于 horizon"""
+        task, k = self._tasks[task_pid]
+        release = task.arrival + k * task.period
+        if release < self.horizon:
+            self._push(release, self.JOB_RELEASE, task)
+
+    def _release_job(self, task_pid):
+        """释放周期任务的下一个作业，返回作业（与任务同名，甘特图中画在同一行）"""
+        entry = self._tasks[task_pid]
+        task = entry[0]
+        job = Process(task.name, self.current_time, task.burst, task.priority, task.deadline, task.period)
+        self._register(job)
+        entry[1] += 1
+        self._schedule_release(task_pid)
+        return job
+
+    def _completes_now(self, entry):
+        """运行中进程的完成事件是否就在当前时刻（与新作业同时发生，尚未处理）"""
+        return entry[2] == self.PROCESS_COMPLETE and entry[0] <= self.current_time
+
+    def _preempt_key(self, p):
+        """抢占式算法比较用的键，越小越优先"""
+        if self.algorithm == "EDF":
+            return p.abs_deadline
+        if self.algorithm == "RM":
+            return rate_monotonic_key(p)
+        return p.priority
+
+    def close(self):
+        """不再有新进程到达，运行到所有事件处理完毕，返回其间完成的进程列表"""
+        while self.event_queue:
+            self._pop_event()
+        return self._take_finished()
+
+    def stream(self, arrivals):
+        """流式运行：逐个读入按到达时间排序的进程，每完成一个进程就产出它的结果
+
+        内存只与同时在系统中的进程数有关，不保留已完成的进程。
+        """
+        for process in arrivals:
+            for p in self.feed(process):
+                yield self.result_of(p)
+        for p in self.close():
+            yield self.result_of(p)
+
+    def _finish(self, p):
+        """进程完成：移出系统，记入分位数草图和截止期统计，等待 feed/close 返回"""
+        self._finished.append(p)
+        del self._active[p.pid]
+        self.metrics.record(p)
+        self.deadlines.record(p)
+
+    def _take_finished(self):
+        finished = self._finished
+        self._finished = []
+        return finished
+
+    def _push(self, time, event_type, process):
+        entry = (time, next(self._event_seq), event_type, process.pid)
+        heapq.heappush(self.event_queue, entry)
+        return entry
+
+    def _pop_event(self):
+        entry = heapq.heappop(self.event_queue)
+        if self._cancelled and entry[1] in self._cancelled:
+            self._cancelled.remove(entry[1])
+            return
+        self.events_handled += 1
+        self._handle(*entry)
+
+    def _preempt(self):
+        """抢占当前进程：作废它待处理的事件，扣除已运行的时间后放回就绪队列"""
+        p = self.current_process
+        self._cancelled.add(self._running_entry[1])
+        self._running_entry = None
+        if p.run_since is not None:
+            # 已经开始运行（开始事件已处理）
+            p.remaining -= self.current_time - p.last_run
+            self._close_run(p)
+        p.last_run = self.current_time
+        self._enqueue(p)
+        self._open_wait(p)
+        self.current_process = None
+
+    def _enqueue(self, p):
+        self.ready_queue.push(p, self.current_time)
+        if self.timeline is not None:
+            self.timeline.enqueue(p.pid)
+
+    def _remove(self, p):
+        self.ready_queue.remove(p)
+        if self.timeline is not None:
+            self.timeline.dequeue(p.pid)
+
+    def _open_wait(self, p):
+        if p.wait_since is None:
+            p.wait_since = self.current_time
+
+    def _close_wait(self, p):
+        if p.wait_since is not None:
+            if self.gantt_data is not None:
+                self.gantt_data.append(p.pid, p.wait_since, self.current_time, WAITING)
+            p.wait_since = None
+
+    def _open_run(self, p):
+        if p.run_since is None:
+            p.run_since = self.current_time
+
+    def _close_run(self, p):
+        if p.run_since is not None:
+            if self.gantt_data is not None:
+                self.gantt_data.append(p.pid, p.run_since, self.current_time, RUNNING)
+            p.run_since = None
+
+    def _can_coalesce(self, p):
+        """RR 下就绪队列为空时可以把剩余的时间片合并成一个事件
+
+        只在不记录时间线、时间均为整数时合并，保证区间和结果与逐片仿真逐位一致。
+        """
+        return (self.timeline is None and not self.ready_queue and not self._tasks and p.remaining > self.quantum
+                and type(self.quantum) is int and type(p.remaining) is int
+                and type(self.current_time) is int)
+
+    def _expand_coalesced(self, until):
+        """补上合并运行中早于 until 的时间片边界，返回最后一个边界的时刻
+
+        每个边界处逐片仿真会：扣除一个时间片、关闭运行区间、重新入队并立即被调度，
+        这里一次性完成这些状态更新，甘特图区间成批写入。
+        """
+        p, _, start, remaining = self._coalesced
+        self._coalesced = None
+        q = self.quantum
+        # 边界 start + k*q (k >= 1) 中严格早于 until 的个数，最后一个边界（进程完成）除外
+        count = int(min(-((start - until) // q) - 1, (remaining - 1) // q))
+        if count <= 0:
+            return start
+        boundary = start + count * q
+        if self.gantt_data is not None:
+            self.gantt_data.append_slices(p.pid, start, q, count)
+        p.remaining = remaining - count * q
+        p.last_run = boundary
+        p.run_since = boundary
+        return boundary
+
+    def _split_coalesced(self, until):
+        """有新进程到达，把合并事件换回包含 until 时刻的那个时间片的到期事件"""
+        p, entry = self._coalesced[:2]
+        boundary = self._expand_coalesced(until)
+        # 合并运行期间事件堆中只有这一个事件
+        self.event_queue.remove(entry)
+        heapq.heapify(self.event_queue)
+        self._push(boundary + min(p.remaining, self.quantum), self.TIME_SLICE_EXPIRED, p)
+
+    def _handle(self, time, seq, event_type, pid):
+        """处理一个事件，参数即事件堆条目 (时间, 序号, 事件类型, 进程号)"""
+        self.current_time = time
+        if event_type == self.PROCESS_START and pid < 0:
+            # 调度事件：同一时刻到达的进程此时都已入队，再从中选出下一个运行的进程
+            self._dispatch_pending = False
+            next_process = self.ready_queue.pop_next(self.current_time) if self.ready_queue else None
+            if next_process is None:
+                return
+            if self.timeline is not None:
+                self.timeline.dequeue(next_process.pid)
+            next_process.last_run = self.current_time
+            pid = next_process.pid
+        if event_type == self.JOB_RELEASE:
+            pid = self._release_job(pid).pid
+            event_type = self.PROCESS_ARRIVAL
+        p = self._active[pid]
+        if self.fairness is not None:
+            self.fairness.advance(time)
+
+        # 记录事件
+        if self.timeline is not None:
+            self.timeline.record(self.current_time, event_type, pid, self.ready_queue)
+
+        if event_type == self.PROCESS_ARRIVAL:
+            # 进程到达，加入就绪队列
+            if self.algorithm == "CFS":
+                self.ready_queue.place(p)
+            if self.fairness is not None:
+                self.fairness.join(p)
+            self._enqueue(p)
+            p.last_run = self.current_time
+
+            # 开始等待状态
+            self._open_wait(p)
+
+            # 抢占式优先级/EDF/RM：新到达的进程更优先时抢占当前进程（恰好在此刻完成的不抢占）
+            if (self.algorithm in self.PREEMPTIVE_ALGORITHMS and self.current_process is not None
+                    and not self._completes_now(self._running_entry)
+                    and self._preempt_key(p) < self._preempt_key(self.current_process)):
+                self._preempt()
+
+        elif event_type == self.PROCESS_START:
+            # 进程开始运行
+            self.current_process = p
+            if self.current_process.start_time == -1:
+                self.current_process.start_time = self.current_time
+
+            # 结束等待状态
+            self._close_wait(self.current_process)
+
+            # 记录开始运行时间
+            self._open_run(self.current_process)
+
+            # 对于RR算法，添加时间片到期事件
+            if self.algorithm == "RR":
+                p = self.current_process
+                if self._can_coalesce(p):
+                    # 没有其他就绪进程，直接把到期事件放在完成时刻，新进程到达时再拆分
+                    entry = self._push(self.current_time + p.remaining, self.TIME_SLICE_EXPIRED, p)
+                    self._coalesced = (p, entry, self.current_time, p.remaining)
+                else:
+                    run_time = min(p.remaining, self.quantum)
+                    self._push(self.current_time + run_time, self.TIME_SLICE_EXPIRED, p)
+            elif self.algorithm == "CFS":
+                # CFS 按权重分得的时间片到期后重新按 vruntime 排队，最后一片直接完成
+                p = self.current_process
+                run_time = self.ready_queue.slice_for(p)
+                if p.remaining <= run_time:
+                    self._push(self.current_time + p.remaining, self.PROCESS_COMPLETE, p)
+                else:
+                    self._push(self.current_time + run_time, self.TIME_SLICE_EXPIRED, p)
+            else:
+                # 非RR算法，直接添加完成事件
+                self._running_entry = self._push(self.current_time + self.current_process.remaining,
+                                                 self.PROCESS_COMPLETE, self.current_process)
+
+        elif event_type == self.PROCESS_COMPLETE:
+            # 进程完成
+            p.finish_time = self.current_time
+            p.remaining = 0
+            self._finish(p)
+            if self.fairness is not None:
+                self.fairness.leave(p)
+
+            # 记录运行结束时间
+            self._close_run(p)
+
+            # 从就绪队列中移除（如果存在）
+            if p in self.ready_queue:
+                self._remove(p)
+
+            if self.current_process == p:
+                self.current_process = None
+
+        elif event_type == self.TIME_SLICE_EXPIRED:
+            # RR算法时间片到期
+            if self._coalesced is not None and self._coalesced[0] is p:
+                self._expand_coalesced(self.current_time)
+
+            # 更新剩余时间
+            time_run = self.current_time - p.last_run
+            p.remaining -= time_run
+            p.last_run = self.current_time
+            if self.algorithm == "CFS":
+                self.ready_queue.charge(p, time_run)
+
+            # 记录运行结束时间
+            self._close_run(p)
+
+            # 浮点时间下剩余量可能只剩舍入误差（如 1e-16），加到当前时刻上已不再前进，
+            # 继续调度会在同一时刻无限重复同一片，按完成处理
+            if p.remaining <= 0 or self.current_time + p.remaining == self.current_time:
+                # 进程完成
+                p.remaining = 0
+                p.finish_time = self.current_time
+                self._finish(p)
+                if self.fairness is not None:
+                    self.fairness.leave(p)
+
+                # 从就绪队列中移除（如果存在）
+                if p in self.ready_queue:
+                    self._remove(p)
+
+                if self.current_process == p:
+                    self.current_process = None
+            else:
+                # 时间片用完但未完成，重新加入就绪队列
+                self._enqueue(p)
+
+                # 开始等待状态
+                self._open_wait(p)
+
+                if self.current_process == p:
+                    self.current_process = None
+
+        # CPU 空闲时安排一个当前时刻的调度事件
+        if self.current_process is None and not self._dispatch_pending and self.ready_queue:
+            # 同一时刻的到达事件先于它处理，调度事件出堆时再从就绪队列（FCFS/RR 为先进先出，
+            # SJF/SRTF 为按执行时间/剩余时间的堆，HRRF 为按响应比的锦标赛树）取出下一个运行的进程，
+            # 不会因为列表中靠前的进程先到达就选中它
+            self._dispatch_pending = True
+            heapq.heappush(self.event_queue, (self.current_time, next(self._event_seq), self.PROCESS_START, -1))
+
+    def result_of(self, p):
+        turnaround = p.finish_time - p.arrival
+        return {
+            'name': p.name,
+            'arrival': p.arrival,
+            'burst': p.burst,
+            'start': p.start_time,
+            'finish': p.finish_time,
+            'turnaround': turnaround,
+            'waiting': turnaround - p.burst
+        }
+
+    def _run_vectorized(self):
+        """FCFS/SJF 不需要逐事件仿真，直接用 NumPy 按闭式递推求解；时间不全是整数时返回 None，改走事件仿真"""
+        from fast_path import is_exact, run_vectorized
+
+        arrival = [p.arrival for p in self.processes]
+        burst = [p.burst for p in self.processes]
+        if not is_exact(arrival, burst):
+            return None
+        result = run_vectorized(arrival, burst,
+                                self.algorithm,
+                                names=[p.name for p in self.processes])
+        table = result['results']
+        for p, start, finish in zip(self.processes, table.start.tolist(), table.finish.tolist()):
+            p.start_time = start
+            p.finish_time = finish
+            p.remaining = 0
+        self.current_time = table.finish.max().item()
+        self.gantt_data = result['gantt_data']
+        self.metrics.record_arrays(table.arrival, table.burst, table.start, table.finish)
+        result['percentiles'] = self.metrics.report()
+        return result
+
+    def run(self):
+        # 不需要时间线时，非抢占的 FCFS/SJF 直接走向量化求解（时间都是整数时，结果与事件仿真逐位相同）
+        periodic = [p for p in self.processes if p.period is not None]
+        if (self.timeline is None and self.processes and self.algorithm in self.VECTORIZED_ALGORITHMS
+                and not periodic):
+            result = self._run_vectorized()
+            if result is not None:
+                return result
+        if periodic and self.horizon is None:
+            # 默认仿真一个超周期（从最晚的任务起点算起）
+            self.horizon = max(p.arrival for p in periodic) + hyperperiod(p.period for p in periodic)
+
+        # 按到达时间送入所有进程（到达时间相同则保持列表顺序）
+        for p in sorted(self.processes, key=lambda p: p.arrival):
+            self.feed(p)
+        self.close()
+
+        # 处理未结束的区间
+        for p in self.processes:
+            self._close_wait(p)
+            self._close_run(p)
+
+        # 计算结果
+        results = []
+        for p in self.processes:
+            if p.finish_time != -1:
+                #逐个添加结果
+                results.append(self.result_of(p))
+
+        # 平均值和分位数来自完成时在线记录的草图（周期任务的每个作业都计入）
+        sketches = self.metrics.sketches
+        #返回所有结果
+        result = {
+            'results': results,
+            'avg_turnaround': sketches['turnaround'].mean(),
+            'avg_waiting': sketches['waiting'].mean(),
+            'percentiles': self.metrics.report(),
+            'gantt_data': self.gantt_data,
+            'timeline': self.timeline if self.timeline is not None else []
+        }
+        if self.fairness is not None:
+            result['fairness'] = self.fairness.report()
+        if self.deadlines.jobs or self.algorithm in REALTIME_ALGORITHMS:
+            # 实时算法总是给出截止期统计，没有带截止期的任务时各项为 0
+            result['deadlines'] = self.deadlines.report()
+        return result
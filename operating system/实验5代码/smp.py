@@ -0,0 +1,290 @@
+import heapq
+
+from gantt import RUNNING, WAITING, LaneGanttTable
+from ready_queue import make_ready_queue
+from simulator import SchedulerSimulator
+
+# 多核调度方式：
+#   global      所有 CPU 共用一个就绪队列，空闲 CPU 取队首
+#   partitioned 每个 CPU 一个就绪队列，新进程放到负载最小的 CPU 上，之后不再迁移
+#   steal       同 partitioned，另外 CPU 本地队列为空时从排队最多的 CPU 窃取一个进程
+SMP_MODES = ("global", "partitioned", "steal")
+
+
+class _LoadIndex:
+    """按 (负载, CPU 号) 取最小值的惰性堆，负载变化时压入新条目，过期条目在取值时丢弃"""
+
+    def __init__(self, loads, sign=1):
+        self.loads = loads
+        self.sign = sign  # 1 取最小负载，-1 取最大负载
+        self._heap = [(0, c) for c in range(len(loads))]
+
+    def update(self, cpu):
+        heapq.heappush(self._heap, (self.sign * self.loads[cpu], cpu))
+        if len(self._heap) > 4 * len(self.loads) + 64:
+            self._heap = [(self.sign * load, c) for c, load in enumerate(self.loads)]
+            heapq.heapify(self._heap)
+
+    def top(self):
+        heap = self._heap
+        while heap[0][0] != self.sign * self.loads[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0][1]
+
+
+class SMPSimulator(SchedulerSimulator):
+    """多核（SMP）调度仿真
+
+    与 SchedulerSimulator 使用相同的算法名、进程和结果结构，另外给出每个 CPU 的利用率和迁移次数，
+    甘特图为 LaneGanttTable（运行区间带 CPU 号）。空闲 CPU、最小负载、最大负载都用惰性堆维护，
+    每个事件的代价为 O(log n + log cpus)，不随 CPU 数线性增长。不支持时间线记录。
+    """
+
+    VECTORIZED_ALGORITHMS = ()
+
+    def __init__(self, processes, algorithm, quantum=1, cpus=2, mode="global", record_gantt=True, aging=0,
+                 latency=6, min_granularity=0.75, horizon=None):
+        if cpus < 1:
+            raise ValueError("CPU 数必须是正整数")
+        if mode not in SMP_MODES:
+            raise ValueError(f"不支持的多核调度方式: {mode}")
+        super().__init__(processes, algorithm, quantum, timeline="off", record_gantt=record_gantt, aging=aging,
+                         latency=latency, min_granularity=min_granularity, horizon=horizon)
+        self.cpus = cpus
+        self.mode = mode
+        if record_gantt:
+            self.gantt_data = LaneGanttTable(cpus=cpus)
+        self.running = [None] * cpus
+        self._running_entry = [None] * cpus
+        self._pending = [False] * cpus  # 已安排调度事件、尚未选出进程的 CPU
+        self._pending_count = 0
+        self.busy_time = [0] * cpus
+        self.migrations = 0
+        # 多核下按权重应得的份额还受 CPU 数限制，不给出公平性统计
+        self.fairness = None
+
+        if mode == "global":
+            self.queues = None
+            # 空闲 CPU 堆（CPU 号最小者优先），_idle 标记用于丢弃过期条目
+            self._idle = [True] * cpus
+            self._idle_heap = list(range(cpus))
+            # 抢占式算法按运行进程的抢占键找抢占对象：(-键, CPU 号, 进程号)
+            self._running_heap = []
+        else:
+            self.queues = [self.ready_queue] + [make_ready_queue(algorithm, aging, self.latency, self.min_granularity)
+                                                for _ in range(cpus - 1)]
+            self._load = [0] * cpus  # 排队数 + 是否在运行
+            self._queued = [0] * cpus
+            self._least_loaded = _LoadIndex(self._load)
+            self._most_queued = _LoadIndex(self._queued, sign=-1)
+
+    # ---- 队列与负载 ----
+
+    def _queue_of(self, cpu):
+        return self.ready_queue if self.queues is None else self.queues[cpu]
+
+    def _touch(self, cpu, queued=0, running=0):
+        """CPU 的排队数/运行数变化后更新负载索引"""
+        if self.queues is None:
+            return
+        if queued:
+            self._queued[cpu] += queued
+            self._most_queued.update(cpu)
+        self._load[cpu] += queued + running
+        self._least_loaded.update(cpu)
+
+    def _enqueue_on(self, p, cpu):
+        self._queue_of(cpu).push(p, self.current_time)
+        if self.queues is not None:
+            p.cpu = cpu  # 分到哪个 CPU 的队列，被其他 CPU 窃取时计为一次迁移
+        self._touch(cpu, queued=1)
+
+    def _idle_cpu(self):
+        """global 模式下返回一个空闲 CPU，没有则返回 None"""
+        heap = self._idle_heap
+        while heap and not self._idle[heap[0]]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _set_idle(self, cpu):
+        if self.queues is None and not self._idle[cpu]:
+            self._idle[cpu] = True
+            heapq.heappush(self._idle_heap, cpu)
+
+    # ---- 区间记录 ----
+
+    def _close_wait(self, p):
+        if p.wait_since is not None:
+            if self.gantt_data is not None:
+                self.gantt_data.append(p.pid, p.wait_since, self.current_time, WAITING)
+            p.wait_since = None
+
+    def _close_run(self, p):
+        if p.run_since is not None:
+            self.busy_time[p.cpu] += self.current_time - p.run_since
+            if self.gantt_data is not None:
+                self.gantt_data.append(p.pid, p.run_since, self.current_time, RUNNING, p.cpu)
+            p.run_since = None
+
+    # ---- 调度 ----
+
+    def _dispatch(self, cpu):
+        """cpu 空闲：安排一个当前时刻的调度事件，同一时刻到达的进程都入队后再选下一个进程"""
+        self._pending[cpu] = True
+        self._pending_count += 1
+        if self.queues is None:
+            self._idle[cpu] = False
+        heapq.heappush(self.event_queue, (self.current_time, next(self._event_seq), self.PROCESS_START, -1 - cpu))
+
+    def _pick(self, cpu):
+        """在 cpu 上选下一个进程运行，本地没有可运行进程时按方式窃取或保持空闲"""
+        self._pending[cpu] = False
+        self._pending_count -= 1
+        queue = self._queue_of(cpu)
+        source = cpu
+        if not queue and self.mode == "steal":
+            victim = self._most_queued.top()
+            if self._queued[victim] > 0:
+                source = victim
+                queue = self.queues[victim]
+        if not queue:
+            self._set_idle(cpu)
+            return
+
+        p = queue.pop_next(self.current_time)
+        self._touch(source, queued=-1)
+        self._touch(cpu, running=1)
+        if p.cpu != -1 and p.cpu != cpu:
+            self.migrations += 1
+        p.cpu = cpu
+        p.last_run = self.current_time
+        self.running[cpu] = p
+        if self.queues is None and self.algorithm in self.PREEMPTIVE_ALGORITHMS:
+            heapq.heappush(self._running_heap, (-self._preempt_key(p), cpu, p.pid))
+        return p
+
+    def _release(self, cpu):
+        """cpu 上的进程让出 CPU（完成、时间片到期或被抢占）后调度下一个"""
+        self.running[cpu] = None
+        self._running_entry[cpu] = None
+        self._touch(cpu, running=-1)
+        self._dispatch(cpu)
+
+    def _preempt(self, cpu):
+        p = self.running[cpu]
+        self._cancelled.add(self._running_entry[cpu][1])
+        if p.run_since is not None:
+            p.remaining -= self.current_time - p.last_run
+            self._close_run(p)
+        p.last_run = self.current_time
+        self._enqueue_on(p, cpu)
+        self._open_wait(p)
+        self._release(cpu)
+
+    def _preempt_target(self, p, cpu):
+        """抢占式算法：返回应被新到达进程 p 抢占的 CPU，没有则返回 None"""
+        key = self._preempt_key(p)
+        if self.queues is not None:
+            running = self.running[cpu]
+            if running is None or self._completes_now(self._running_entry[cpu]):
+                return None
+            return cpu if key < self._preempt_key(running) else None
+        heap = self._running_heap
+        while heap:
+            neg_priority, c, pid = heap[0]
+            running = self.running[c]
+            if running is None or running.pid != pid:
+                heapq.heappop(heap)
+                continue
+            if self._completes_now(self._running_entry[c]):
+                return None
+            return c if key < -neg_priority else None
+        return None
+
+    def _handle(self, time, seq, event_type, pid):
+        self.current_time = time
+        if event_type == self.PROCESS_START and pid < 0:
+            # 调度事件，进程号编码了 CPU 号
+            p = self._pick(-1 - pid)
+            if p is None:
+                return
+            pid = p.pid
+        if event_type == self.JOB_RELEASE:
+            pid = self._release_job(pid).pid
+            event_type = self.PROCESS_ARRIVAL
+        p = self._active[pid]
+
+        if event_type == self.PROCESS_ARRIVAL:
+            # global 模式放入公共队列；其余方式放到负载最小的 CPU 上（负载相同取编号小的）
+            cpu = self._idle_cpu() if self.queues is None else self._least_loaded.top()
+            if self.algorithm == "CFS":
+                self._queue_of(0 if cpu is None else cpu).place(p)
+            self._enqueue_on(p, 0 if cpu is None else cpu)
+            p.last_run = self.current_time
+            self._open_wait(p)
+            if cpu is not None and self.running[cpu] is None and not self._pending[cpu]:
+                self._dispatch(cpu)
+            elif self.algorithm in self.PREEMPTIVE_ALGORITHMS and not (
+                    self.queues is None and len(self.ready_queue) <= self._pending_count):
+                # global 模式下待调度的 CPU 足以接走所有排队进程时不必抢占
+                target = self._preempt_target(p, cpu)
+                if target is not None:
+                    self._preempt(target)
+            return
+
+        cpu = p.cpu
+        if event_type == self.PROCESS_START:
+            if p.start_time == -1:
+                p.start_time = self.current_time
+            self._close_wait(p)
+            self._open_run(p)
+            if self.algorithm == "RR":
+                self._push(self.current_time + min(p.remaining, self.quantum), self.TIME_SLICE_EXPIRED, p)
+            else:
+                run_time = self._queue_of(cpu).slice_for(p) if self.algorithm == "CFS" else p.remaining
+                if p.remaining > run_time:
+                    self._push(self.current_time + run_time, self.TIME_SLICE_EXPIRED, p)
+                else:
+                    self._running_entry[cpu] = self._push(self.current_time + p.remaining, self.PROCESS_COMPLETE, p)
+
+        elif event_type == self.PROCESS_COMPLETE:
+            p.finish_time = self.current_time
+            p.remaining = 0
+            self._finish(p)
+            self._close_run(p)
+            self._release(cpu)
+
+        elif event_type == self.TIME_SLICE_EXPIRED:
+            ran = self.current_time - p.last_run
+            p.remaining -= ran
+            p.last_run = self.current_time
+            self._close_run(p)
+            if self.algorithm == "CFS":
+                self._queue_of(cpu).charge(p, ran)
+            # 浮点剩余量只剩舍入误差、不再推进时间时按完成处理，与 SchedulerSimulator 相同
+            if p.remaining <= 0 or self.current_time + p.remaining == self.current_time:
+                p.remaining = 0
+                p.finish_time = self.current_time
+                self._finish(p)
+            else:
+                # 时间片用完，回到本 CPU 的队列（global 模式为公共队列）队尾
+                self._enqueue_on(p, cpu)
+                self._open_wait(p)
+            self._release(cpu)
+
+    def result_of(self, p):
+        result = super().result_of(p)
+        result['cpu'] = p.cpu
+        return result
+
+    def utilization(self):
+        """各 CPU 从时刻 0 到当前时刻的忙碌比例"""
+        span = self.current_time
+        return [busy / span if span > 0 else 0 for busy in self.busy_time]
+
+    def run(self):
+        result = super().run()
+        result['cpus'] = self.cpus
+        result['utilization'] = self.utilization()
+        result['migrations'] = self.migrations
+        return result
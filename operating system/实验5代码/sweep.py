@@ -0,0 +1,236 @@
+"""调度算法/时间片参数扫描
+
+在本目录下运行：
+    python -m sweep trace.csv -a all -q 1,2,4,8 -j 8
+    python -m sweep a.csv b.jsonl -a RR,SRTF -q 1,2,3 --output-format csv -o table.csv
+
+每个负载只读入一次并放进共享内存，工作进程按名字映射后直接使用，
+(算法, 时间片, 负载) 组合分发到进程池中并行运行，最后输出对比表。
+工作进程只返回分位数草图，不传回逐个进程的结果；给出多个负载时，
+另外把同一 (算法, 时间片) 下各负载的草图合并，输出 workload 为 * 的汇总行。
+指定 --cache 时每个组合的草图按负载内容缓存在 SQLite 文件中，再次扫描相同的组合时直接读出：
+    python -m sweep trace.csv -a all -q 1,2,4,8 --cache sweep_cache.sqlite
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from quantiles import METRICS, PERCENTILES, LatencyMetrics
+from result_cache import ResultCache, columns_digest, fingerprint
+from scheduler_cli import ALGORITHMS, parse_algorithms
+from simulator import Process, SchedulerSimulator
+from trace_io import read_trace
+
+
+class SharedWorkload:
+    """放在共享内存中的负载：arrival/burst/priority 三列连续存放"""
+
+    def __init__(self, arrival, burst, priority=None, name=None):
+        arrival = np.asarray(arrival, dtype=np.float64)
+        n = len(arrival)
+        columns = [arrival, np.asarray(burst, dtype=np.float64),
+                   np.zeros(n) if priority is None else np.asarray(priority, dtype=np.float64)]
+        # 全为整数时保持整数语义，结果与逐个输入进程时一致
+        self.integral = all(np.all(np.mod(c, 1) == 0) for c in columns)
+        self.name = name
+        self.n = n
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, 3 * n * 8))
+        view = np.ndarray((3, n), dtype=np.float64, buffer=self.shm.buf)
+        for i, column in enumerate(columns):
+            view[i] = column
+
+    def processes(self):
+        return _processes_from(self.shm, self.n, self.integral)
+
+    def spec(self):
+        """传给工作进程的描述（只有共享内存名和长度，不含数据本身）"""
+        return self.shm.name, self.n, self.integral
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _processes_from(shm, n, integral):
+    view = np.ndarray((3, n), dtype=np.float64, buffer=shm.buf)
+    columns = [c.astype(np.int64).tolist() if integral else c.tolist() for c in view]
+    return [Process(f"P{i}", a, b, p) for i, (a, b, p) in enumerate(zip(*columns))]
+
+
+# 工作进程内缓存：共享内存名 -> (共享内存, 进程列表)，每个负载在每个工作进程中只展开一次
+_attached = {}
+
+
+def _attach(spec):
+    shm_name, n, integral = spec
+    if shm_name not in _attached:
+        # 工作进程与主进程共用同一个资源跟踪器，共享内存统一由主进程在 sweep() 结束时释放
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _attached[shm_name] = (shm, _processes_from(shm, n, integral))
+    return _attached[shm_name][1]
+
+
+def summarize(metrics):
+    """从分位数草图得到完成数、平均值和分位数"""
+    sketches = metrics.sketches
+    summary = {
+        'count': metrics.count,
+        'avg_turnaround': sketches['turnaround'].mean(),
+        'avg_waiting': sketches['waiting'].mean(),
+    }
+    summary.update(metrics.report())
+    return summary
+
+
+def run_case(spec, algorithm, quantum):
+    """在工作进程中运行一个 (负载, 算法, 时间片) 组合，返回它的分位数草图"""
+    processes = _attach(spec)
+    sim = SchedulerSimulator(processes, algorithm, quantum or 1, timeline="off", record_gantt=False)
+    sim.run()
+    return sim.metrics
+
+
+def cases(workloads, algorithms, quanta):
+    """展开参数组合；时间片只影响 RR，其余算法每个负载只运行一次"""
+    for (index, _), algorithm in itertools.product(enumerate(workloads), algorithms):
+        for quantum in (quanta if algorithm == "RR" else [None]):
+            yield index, algorithm, quantum
+
+
+def sweep(workloads, algorithms=ALGORITHMS, quanta=(1, 2, 4), jobs=None, cache=None):
+    """并行运行参数扫描，返回对比表（每个组合一行的字典列表）
+
+    workloads 为 [(名称, (arrival, burst, priority)), ...]。
+    cache 为 ResultCache 时先按 (负载内容, 算法, 时间片) 查找草图，只运行缺少的组合。
+    """
+    todo = list(cases(workloads, algorithms, quanta))
+    metrics = [None] * len(todo)
+    keys = None
+    if cache is not None:
+        digests = [columns_digest(*(c if c is not None else [] for c in columns)) for _, columns in workloads]
+        keys = [fingerprint(digests[i], a, q or 1, result='metrics') for i, a, q in todo]
+        metrics = [cache.get(key) for key in keys]
+    missing = [k for k, m in enumerate(metrics) if m is None]
+
+    # 按下标对应负载，同名负载（例如同一文件给出两次）也各自保存；只放入还需要运行的负载
+    shared = {}
+    try:
+        for i in sorted({todo[k][0] for k in missing}):
+            shared[i] = SharedWorkload(*workloads[i][1], name=workloads[i][0])
+        jobs = jobs or os.cpu_count() or 1
+        if jobs == 1:
+            # 单进程时直接使用主进程中的共享内存
+            for workload in shared.values():
+                _attached[workload.shm.name] = (workload.shm, workload.processes())
+            computed = [run_case(shared[todo[k][0]].spec(), *todo[k][1:]) for k in missing]
+        elif missing:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(run_case, shared[todo[k][0]].spec(), *todo[k][1:]) for k in missing]
+                computed = [f.result() for f in futures]
+        else:
+            computed = []
+    finally:
+        for workload in shared.values():
+            workload.close()
+        _attached.clear()
+    for k, m in zip(missing, computed):
+        metrics[k] = m
+        if cache is not None:
+            cache.put(keys[k], m)
+
+    rows = []
+    merged = {}  # (算法, 时间片) -> 各负载合并后的草图
+    for (i, algorithm, quantum), m in zip(todo, metrics):
+        rows.append({'workload': workloads[i][0], 'algorithm': algorithm, 'quantum': quantum, **summarize(m)})
+        key = (algorithm, quantum)
+        if key in merged:
+            merged[key].merge(m)
+        else:
+            merged[key] = LatencyMetrics().merge(m)
+    if len(workloads) > 1:
+        for (algorithm, quantum), m in merged.items():
+            rows.append({'workload': '*', 'algorithm': algorithm, 'quantum': quantum, **summarize(m)})
+    return rows
+
+
+def load_workload(path, fmt=None):
+    arrival, burst, priority = [], [], []
+    for _, a, b, p in read_trace(path, fmt):
+        arrival.append(a)
+        burst.append(b)
+        priority.append(p)
+    return arrival, burst, priority
+
+
+def format_table(rows):
+    headers = ['workload', 'algorithm', 'quantum', 'count', 'avg_turnaround', 'avg_waiting'] + \
+              [f'{m}_p{p:g}' for m in METRICS for p in PERCENTILES]
+    cells = [[str(r[h]) if not isinstance(r[h], float) else f"{r[h]:.2f}" for h in headers] for r in rows]
+    cells = [[('-' if c == 'None' else c) for c in row] for row in cells]
+    widths = [max(len(h), *(len(row[i]) for row in cells)) for i, h in enumerate(headers)]
+    lines = ['  '.join(h.ljust(w) for h, w in zip(headers, widths))]
+    lines += ['  '.join(c.ljust(w) for c, w in zip(row, widths)) for row in cells]
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m sweep', description='调度算法与时间片的并行参数扫描')
+    parser.add_argument('traces', nargs='+', help='轨迹文件（CSV/JSONL）')
+    parser.add_argument('-a', '--algorithms', type=parse_algorithms, default=list(ALGORITHMS),
+                        help='逗号分隔的算法列表或 all，默认 all')
+    parser.add_argument('-q', '--quanta', default='1,2,4',
+                        help='逗号分隔的 RR 时间片列表，默认 1,2,4')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='工作进程数，默认为 CPU 核数')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='输入格式，默认按扩展名判断')
+    parser.add_argument('--output-format', choices=['table', 'csv', 'jsonl'], default='table')
+    parser.add_argument('-o', '--output', default='-', help='输出文件，默认标准输出')
+    parser.add_argument('--cache', default=None, help='SQLite 结果缓存文件，多次扫描共用')
+    args = parser.parse_args(argv)
+
+    try:
+        quanta = [int(q) for q in args.quanta.split(',') if q.strip()]
+    except ValueError:
+        parser.error("时间片必须是正整数")
+    if not quanta or min(quanta) <= 0:
+        parser.error("时间片必须是正整数")
+
+    try:
+        workloads = [(path, load_workload(path, args.format)) for path in args.traces]
+    except (OSError, ValueError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+
+    cache = ResultCache(path=args.cache, encode=LatencyMetrics.to_dict,
+                        decode=LatencyMetrics.from_dict) if args.cache else None
+    try:
+        rows = sweep(workloads, args.algorithms, quanta, args.jobs, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    out = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    try:
+        if args.output_format == 'table':
+            out.write(format_table(rows) + '\n')
+        elif args.output_format == 'jsonl':
+            for row in rows:
+                out.write(json.dumps(row, ensure_ascii=False) + '\n')
+        else:
+            writer = csv.DictWriter(out, fieldnames=list(rows[0]) if rows else [], lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
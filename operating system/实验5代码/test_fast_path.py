@@ -0,0 +1,42 @@
+"""fast_path 与事件驱动仿真的一致性测试，在本目录下运行：python -m pytest -q test_fast_path.py"""
+import numpy as np
+
+from fast_path import ResultTable
+from simulator import Process, SchedulerSimulator
+
+
+def schedule(arrival, burst, algorithm, timeline):
+    processes = [Process(f"P{i}", a, b) for i, (a, b) in enumerate(zip(arrival, burst))]
+    result = SchedulerSimulator(processes, algorithm, timeline=timeline).run()
+    return sorted((r['name'], r['start'], r['finish']) for r in result['results'])
+
+
+def test_tied_arrivals_match_event_loop():
+    """到达时间大量相同的负载上，闭式解（timeline="off"）与逐事件仿真逐位一致"""
+    rng = np.random.default_rng(0)
+    for trial in range(200):
+        n = int(rng.integers(1, 40))
+        arrival = np.sort(rng.integers(0, 20, n)).tolist()
+        burst = rng.integers(1, 6, n).tolist()
+        if trial % 2:
+            arrival = [a * 0.5 for a in arrival]
+            burst = [b * 0.25 for b in burst]
+        for algorithm in ("FCFS", "SJF"):
+            assert schedule(arrival, burst, algorithm, "off") == schedule(arrival, burst, algorithm, "full")
+
+
+def test_sjf_simultaneous_arrivals():
+    assert schedule([0, 0, 0], [8, 1, 2], "SJF", "off") == [('P0', 3, 11), ('P1', 0, 1), ('P2', 1, 3)]
+
+
+def test_decimal_times_match_event_loop():
+    """一位小数的到达和执行时间不走闭式解，timeline="off" 与逐事件仿真逐位一致；整数时间仍走闭式解"""
+    rng = np.random.default_rng(1)
+    for _ in range(100):
+        n = int(rng.integers(1, 40))
+        arrival = np.round(np.sort(rng.uniform(0, 20, n)), 1).tolist()
+        burst = np.round(rng.uniform(0.1, 5, n), 1).tolist()
+        for algorithm in ("FCFS", "SJF"):
+            assert schedule(arrival, burst, algorithm, "off") == schedule(arrival, burst, algorithm, "full")
+    integral = [Process('A', 0.0, 2.0), Process('B', 1.0, 1.0)]
+    assert isinstance(SchedulerSimulator(integral, "SJF", timeline="off").run()['results'], ResultTable)
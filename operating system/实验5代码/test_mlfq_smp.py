@@ -0,0 +1,42 @@
+"""MultiCoreMLFQScheduler 的测试，在本目录下运行：python -m pytest -q test_mlfq_smp.py"""
+import numpy as np
+
+from mlfq import Job, MLFQScheduler
+from mlfq_smp import MultiCoreMLFQScheduler
+
+
+def test_single_core_matches_mlfq():
+    """单核时与 MLFQScheduler（不启用优先级提升）结果相同，包括同一时刻到达的作业"""
+    rng = np.random.default_rng(2)
+    for _ in range(100):
+        n = int(rng.integers(1, 30))
+        rows = list(zip(np.sort(rng.integers(0, 15, n)).tolist(), rng.integers(1, 9, n).tolist()))
+        single = MLFQScheduler(log_level="silent")
+        multi = MultiCoreMLFQScheduler(cores=1)
+        for i, (arrival, burst) in enumerate(rows):
+            single.add_job(Job(f"J{i}", arrival, burst))
+            multi.add_job(Job(f"J{i}", arrival, burst))
+        single.run()
+        multi.run()
+        fields = ('name', 'finish', 'response', 'slices')
+        expected = sorted(tuple(r[f] for f in fields) for r in single.results())
+        assert sorted(tuple(r[f] for f in fields) for r in multi.results()) == expected
+
+
+def test_work_conserving_with_boost_and_steal():
+    """启用窃取和优先级提升时，任一时刻运行中的核数等于 min(核数, 已到达未完成的作业数)"""
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        cores = 4
+        n = int(rng.integers(30, 60))
+        rows = list(zip(np.sort(rng.integers(0, 60, n)).tolist(), rng.integers(1, 12, n).tolist()))
+        scheduler = MultiCoreMLFQScheduler(cores=cores, boost_interval=3, steal=True, record_history=True)
+        for i, (arrival, burst) in enumerate(rows):
+            scheduler.add_job(Job(f"J{i}", arrival, burst))
+        scheduler.run()
+        slices = [piece for job in scheduler.jobs for piece in job.execution_history]
+        for t in range(scheduler.current_time):
+            mid = t + 0.5
+            busy = {core for start, end, _, core in slices if start < mid < end}
+            present = sum(1 for job in scheduler.jobs if job.arrival_time < mid < job.end_time)
+            assert len(busy) == min(cores, present), (rows, t)
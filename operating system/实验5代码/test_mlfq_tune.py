@@ -0,0 +1,60 @@
+"""mlfq_tune 的测试，在本目录下运行：python -m pytest -q test_mlfq_tune.py"""
+import numpy as np
+
+import mlfq_tune
+from mlfq_tune import configurations, tune
+from workload import generate
+
+SPACE = configurations(levels=(2, 3), base_slices=(1, 2), growth=(1, 2), boost_thresholds=(None, 20))
+
+
+def workload(n=300):
+    w = generate(n, seed=5, integer=True)
+    return w.arrival, w.burst
+
+
+def test_halving_schedule(monkeypatch):
+    """27 个配置、eta=3：作业数 100/300/900/2700，每轮保留最好的 1/3，最后一轮只剩最佳配置"""
+    calls = []
+
+    def fake_evaluate(spec, time_slices, boost_threshold, size):
+        calls.append((tuple(time_slices), boost_threshold, size))
+        score = float(sum(time_slices) + (boost_threshold or 0))
+        return {'turnaround': score, 'turnaround_p99': score, 'response': score, 'response_p99': score,
+                'waiting': score, 'waiting_p99': score}
+
+    monkeypatch.setattr(mlfq_tune, 'evaluate', fake_evaluate)
+    space = configurations(levels=(2, 3, 4), base_slices=(1, 2, 4), growth=(1,), boost_thresholds=(None, 5, 10))
+    assert len(space) == 27
+    arrival = np.arange(2700)
+    rows, evaluations = tune(arrival, np.ones(2700), method='halving', space=space, samples=27, jobs=1,
+                             seed=0, eta=3, min_jobs=10)
+
+    rounds = {}
+    for time_slices, threshold, size in calls:
+        rounds.setdefault(size, []).append((time_slices, threshold))
+    assert list(rounds) == [100, 300, 900, 2700]
+    assert [len(configs) for configs in rounds.values()] == [27, 9, 3, 1]
+    assert evaluations == 40
+    scores = {c: sum(c[0]) + (c[1] or 0) for c in space}
+    for size, survivors in zip([100, 300, 900], [9, 3, 1]):
+        expected = sorted(rounds[size], key=scores.get)[:survivors]
+        assert sorted(rounds[size * 3], key=scores.get) == expected
+    assert len(rows) == 1 and rows[0]['jobs'] == 2700
+    assert (tuple(rows[0]['time_slices']), rows[0]['boost_threshold']) == min(space, key=scores.get)
+
+
+def test_grid_and_random():
+    """grid 评估全部配置，random 不重复地抽取 samples 个；结果按目标值排序，并行与单进程结果相同"""
+    arrival, burst = workload()
+    rows, evaluations = tune(arrival, burst, 'p99-turnaround', 'grid', SPACE, jobs=1)
+    assert evaluations == len(rows) == len(SPACE)
+    assert {(tuple(r['time_slices']), r['boost_threshold']) for r in rows} == set(SPACE)
+    objectives = [r['objective'] for r in rows]
+    assert objectives == sorted(objectives)
+    assert all(r['objective'] == r['turnaround_p99'] and r['jobs'] == len(arrival) for r in rows)
+
+    sampled, evaluations = tune(arrival, burst, 'mean-response', 'random', SPACE, samples=5, jobs=1, seed=3)
+    configs = [(tuple(r['time_slices']), r['boost_threshold']) for r in sampled]
+    assert evaluations == 5 and len(set(configs)) == 5 and set(configs) <= set(SPACE)
+    assert tune(arrival, burst, 'mean-response', 'random', SPACE, samples=5, jobs=2, seed=3)[0] == sampled
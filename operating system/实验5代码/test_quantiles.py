@@ -0,0 +1,87 @@
+"""QuantileSketch 的测试，在本目录下运行：python -m pytest -q test_quantiles.py"""
+import math
+
+import numpy as np
+
+from quantiles import PERCENTILES, QuantileSketch
+
+
+def nearest_rank(values, p):
+    """最近秩分位数：从小到大第 ceil(p·n/100) 个值（从 1 开始计），取整前先把 p·n/100 舍入到 9 位小数
+
+    与 np.percentile(values, p, method='inverted_cdf') 的定义相同，但 numpy 不舍入，
+    p = 99.9、n = 20000 时 p·n/100 算成 19980.000000000004，会多取一位。
+    """
+    return np.sort(values)[max(math.ceil(round(p * len(values) / 100, 9)) - 1, 0)]
+
+
+def quantiles(sketch):
+    return [sketch.quantile(p / 100) for p in PERCENTILES]
+
+
+def test_exact_mode_nearest_rank():
+    """不超过 exact_limit 个值时分位数精确，取最近秩；不足 100 个值时 p99 即最大值"""
+    rng = np.random.default_rng(1)
+    for n in (1, 2, 17, 99, 1000):
+        values = rng.integers(-5, 50, n)
+        sketch = QuantileSketch(exact_limit=1024)
+        sketch.add_many(values)
+        for p in PERCENTILES:
+            assert sketch.quantile(p / 100) == nearest_rank(values, p), (n, p)
+        if n < 100:
+            assert sketch.quantile(0.99) == values.max()
+
+
+def test_switch_to_bins():
+    """超过 exact_limit 个值后改为分桶，分位数的相对误差不超过 relative_accuracy"""
+    rng = np.random.default_rng(2)
+    values = rng.lognormal(1.0, 1.5, 20000)
+    for chunk in (1, 300, 20000):
+        sketch = QuantileSketch(relative_accuracy=0.01, exact_limit=500)
+        for start in range(0, len(values), chunk):
+            if chunk == 1:
+                sketch.add(values[start])
+            else:
+                sketch.add_many(values[start:start + chunk])
+            if start + chunk <= 500:
+                assert sketch._exact is not None
+        assert sketch._exact is None
+        for p in PERCENTILES:
+            expected = nearest_rank(values, p)
+            assert abs(sketch.quantile(p / 100) - expected) <= 0.01 * expected, (chunk, p)
+
+
+def test_merge_matches_single_feed():
+    """分成几份分别记录再合并，与全部放进同一个草图的结果相同"""
+    rng = np.random.default_rng(3)
+    for n, parts in ((50, 3), (3000, 2), (3000, 7)):
+        values = np.concatenate([rng.exponential(4.0, n), -rng.exponential(1.0, n // 10), np.zeros(5)])
+        rng.shuffle(values)
+        single = QuantileSketch(exact_limit=1024)
+        single.add_many(values)
+        merged = QuantileSketch(exact_limit=1024)
+        for part in np.array_split(values, parts):
+            sketch = QuantileSketch(exact_limit=1024)
+            sketch.add_many(part)
+            merged.merge(sketch)
+        assert quantiles(merged) == quantiles(single), (n, parts)
+        assert (merged.count, merged.min, merged.max) == (single.count, single.min, single.max)
+        assert merged.positive == single.positive and merged.negative == single.negative
+        assert merged.zero_count == single.zero_count
+
+
+def test_bucketed_quantiles_stay_in_range():
+    """分桶后的分位数不超出 [min, max]，并且总是 float：常数和全为负数的输入"""
+    for value in (1, -1, 7, -1000000):
+        sketch = QuantileSketch(exact_limit=100)
+        for _ in range(5000):
+            sketch.add(value)
+        assert sketch._exact is None
+        for q in quantiles(sketch) + [sketch.quantile(1.0)]:
+            assert q == value and type(q) is float, (value, q)
+    rng = np.random.default_rng(4)
+    values = -rng.lognormal(0.0, 1.0, 5000) - 1
+    sketch = QuantileSketch(exact_limit=100)
+    sketch.add_many(values)
+    for q in quantiles(sketch):
+        assert values.min() <= q <= values.max() and type(q) is float
@@ -0,0 +1,17 @@
+"""realtime 命令行的回归测试，在本目录下运行：python -m pytest -q test_realtime.py"""
+import json
+
+from realtime import main
+
+
+def test_trace_without_deadlines(tmp_path, capsys):
+    """没有截止期和周期的普通任务文件也能输出全 0 的截止期统计"""
+    trace = tmp_path / 't.csv'
+    trace.write_text('name,arrival,burst\nA,0,3\nB,1,2\n', encoding='utf-8')
+    assert main([str(trace), '--output-format', 'jsonl']) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    deadlines = [r for r in records if r['record'] == 'deadlines']
+    assert [r['algorithm'] for r in deadlines] == ['EDF', 'RM']
+    for r in deadlines:
+        assert r['jobs'] == 0 and r['misses'] == 0 and r['miss_ratio'] == 0.0
+    assert main([str(trace)]) == 0
@@ -0,0 +1,30 @@
+"""ResultCache 磁盘缓存的测试，在本目录下运行：python -m pytest -q test_result_cache.py"""
+import json
+import sqlite3
+import zlib
+
+import numpy as np
+
+from quantiles import LatencyMetrics
+from result_cache import ResultCache
+
+
+def test_disk_cache_stores_json(tmp_path):
+    """磁盘上的值是 JSON；新会话读出的草图与写入的相同"""
+    path = str(tmp_path / 'cache.sqlite')
+    rng = np.random.default_rng(0)
+    metrics = LatencyMetrics()
+    for size in (10, 5000):
+        finish = rng.uniform(1, 100, size)
+        metrics.record_arrays(np.zeros(size), np.full(size, 0.5), finish / 2, finish)
+    cache = ResultCache(path=path, encode=LatencyMetrics.to_dict, decode=LatencyMetrics.from_dict)
+    cache.put('key', metrics)
+    cache.close()
+
+    blob = sqlite3.connect(path).execute("SELECT value FROM results").fetchone()[0]
+    assert set(json.loads(zlib.decompress(blob))) == {'turnaround', 'waiting', 'response'}
+    cache = ResultCache(path=path, encode=LatencyMetrics.to_dict, decode=LatencyMetrics.from_dict)
+    restored = cache.get('key')
+    assert cache.disk_hits == 1
+    assert restored.report() == metrics.report() and restored.count == metrics.count
+    cache.close()
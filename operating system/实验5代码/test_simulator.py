@@ -0,0 +1,36 @@
+"""SchedulerSimulator 的回归测试，在本目录下运行：python -m pytest -q test_simulator.py"""
+from simulator import Process, SchedulerSimulator
+from workload import generate
+
+
+def starts(algorithm, processes):
+    result = SchedulerSimulator(processes, algorithm, timeline="full").run()
+    return {r['name']: r['start'] for r in result['results']}
+
+
+def tied():
+    return [Process('A', 0, 8, 5), Process('B', 0, 1, 1), Process('C', 0, 2, 0)]
+
+
+def test_simultaneous_arrivals():
+    """同一时刻到达的进程都入队后才选出第一个运行的进程，而不是列表中靠前的那个"""
+    assert starts('SJF', tied()) == {'B': 0, 'C': 1, 'A': 3}
+    assert starts('SRTF', tied()) == {'B': 0, 'C': 1, 'A': 3}
+    assert starts('PRIORITY', tied()) == {'C': 0, 'B': 2, 'A': 3}
+    assert starts('PPRIORITY', tied()) == {'C': 0, 'B': 2, 'A': 3}
+    assert starts('FCFS', tied()) == {'A': 0, 'B': 8, 'C': 9}
+
+
+def test_round_robin_float_remainder_terminates():
+    """浮点负载下剩余量只剩舍入误差时按完成处理，不会在同一时刻无限调度"""
+    workload = generate(2000, seed=1)
+    result = SchedulerSimulator(workload.processes(), 'RR', timeline="off", record_gantt=False).run()
+    assert len(result['results']) == 2000
+
+
+def test_cfs_slice_ending_at_completion_leaves_fairness_ledger():
+    """CFS 时间片恰好在完成时到期（这里剩余量只剩浮点舍入误差）时，进程同样从公平性统计中移除"""
+    simulator = SchedulerSimulator([Process('A', 3.7, 12.0, 0), Process('B', 30, 1, 0)], 'CFS', timeline="off")
+    result = simulator.run()
+    assert simulator.fairness.weight == 0
+    assert [task['name'] for task in result['fairness']['tasks']] == ['A', 'B']
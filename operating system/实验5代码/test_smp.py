@@ -0,0 +1,36 @@
+"""SMPSimulator 的测试，在本目录下运行：python -m pytest -q test_smp.py"""
+import numpy as np
+
+from simulator import Process, SchedulerSimulator
+from smp import SMP_MODES, SMPSimulator
+
+ALGORITHMS = ("FCFS", "SJF", "SRTF", "HRRF", "PRIORITY", "PPRIORITY", "RR", "EDF", "RM")
+
+
+def schedule(simulator):
+    return sorted((r['name'], r['start'], r['finish']) for r in simulator.run()['results'])
+
+
+def test_single_cpu_matches_simulator():
+    """单 CPU 时各方式与 SchedulerSimulator 结果相同，包括同一时刻到达的进程"""
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        n = int(rng.integers(1, 30))
+        rows = list(zip(np.sort(rng.integers(0, 15, n)).tolist(), rng.integers(1, 6, n).tolist(),
+                        rng.integers(0, 4, n).tolist()))
+
+        def processes():
+            return [Process(f"P{i}", a, b, c, deadline=3 * b) for i, (a, b, c) in enumerate(rows)]
+
+        for algorithm in ALGORITHMS:
+            expected = schedule(SchedulerSimulator(processes(), algorithm, timeline="full"))
+            for mode in SMP_MODES:
+                assert schedule(SMPSimulator(processes(), algorithm, cpus=1, mode=mode)) == expected, (algorithm, mode)
+
+
+def test_simultaneous_arrivals_two_cpus():
+    """同一时刻到达时两个 CPU 先运行执行时间最短的两个进程"""
+    processes = [Process('A', 0, 8), Process('B', 0, 1), Process('C', 0, 2), Process('D', 0, 3)]
+    result = SMPSimulator(processes, "SJF", cpus=2).run()
+    starts = {r['name']: r['start'] for r in result['results']}
+    assert starts == {'B': 0, 'C': 0, 'D': 1, 'A': 2}
@@ -0,0 +1,16 @@
+"""workload 的测试，在本目录下运行：python -m pytest -q test_workload.py"""
+import numpy as np
+
+from workload import generate, stream
+
+
+def test_stream_matches_generate():
+    """不同块大小的流式生成与一次生成逐位相同"""
+    for arrivals in ("poisson", "bursty"):
+        for integer in (False, True):
+            whole = generate(5000, arrivals=arrivals, integer=integer, seed=7)
+            for chunk_size in (1, 7, 64, 1000, 4999):
+                chunks = list(stream(5000, chunk_size=chunk_size, arrivals=arrivals, integer=integer, seed=7))
+                for column in ("arrival", "burst", "priority"):
+                    joined = np.concatenate([getattr(c, column) for c in chunks])
+                    assert np.array_equal(joined, getattr(whole, column)), (arrivals, integer, chunk_size, column)
@@ -0,0 +1,173 @@
+import bisect
+from array import array
+from collections.abc import Sequence
+from itertools import islice
+
+TIMELINE_MODES = ("off", "sampled", "full")
+
+
+class TimelineRecorder(Sequence):
+    """调度时间线记录器
+
+    full 模式下每个事件只记录 (时间, 事件类型, 进程号) 三个数，以及就绪队列的入队/出队增量，
+    全部存放在紧凑的 array 中；需要某一时刻的就绪队列时再从最近的检查点重放增量得到。
+    sampled 模式每隔 every 个事件保存一份完整快照，用于只需要大致过程的长时间仿真。
+
+    按下标访问时返回与原先 timeline 列表相同格式的字典：
+    {'time', 'event', 'process', 'ready_queue'}，其中 ready_queue 为处理该事件之前的就绪队列。
+    """
+
+    CHECKPOINT_EVERY = 1024  # full 模式每隔多少个事件保存一次完整快照，用于快速定位
+
+    def __init__(self, mode="full", every=1):
+        if mode not in ("sampled", "full"):
+            raise ValueError(f"不支持的时间线模式: {mode}")
+        if every < 1:
+            raise ValueError("采样间隔必须是正整数")
+        self.mode = mode
+        self.every = every
+        self.names = []  # 进程号 -> 进程名
+        self._count = 0  # 已发生的事件数（sampled 模式下包括未保存的事件）
+
+        # full 模式的列存储
+        self.times = array('d')
+        self.events = array('b')
+        self.pids = array('q')  # -1 表示没有关联进程
+        self.delta_pos = array('q')  # 每个事件发生前已有的增量条数
+        self.deltas = array('q')  # pid * 2 + 0 表示入队，pid * 2 + 1 表示出队
+        self._checkpoints = []  # 每 CHECKPOINT_EVERY 个事件一份就绪队列快照（进程号元组）
+        self._live = {}  # 当前就绪队列，保持入队顺序
+
+        # sampled 模式直接保存快照字典
+        self._samples = []
+
+        # 顺序访问时复用上一次重放的结果
+        self._cursor = None
+
+    def register(self, process):
+        """登记新进程，返回分配给它的进程号"""
+        self.names.append(process.name)
+        return len(self.names) - 1
+
+    def enqueue(self, pid):
+        if self.mode == "full":
+            self.deltas.append(pid * 2)
+            self._live[pid] = None
+
+    def dequeue(self, pid):
+        if self.mode == "full":
+            self.deltas.append(pid * 2 + 1)
+            del self._live[pid]
+
+    def record(self, time, event_type, pid, ready_queue):
+        """记录一个事件，ready_queue 仅在 sampled 模式的采样点被遍历"""
+        index = self._count
+        self._count += 1
+        if self.mode == "sampled":
+            if index % self.every == 0:
+                self._samples.append({
+                    'time': time,
+                    'event': event_type,
+                    'process': self.names[pid] if pid >= 0 else None,
+                    'ready_queue': [p.name for p in ready_queue]
+                })
+            return
+
+        if index % self.CHECKPOINT_EVERY == 0:
+            self._checkpoints.append(tuple(self._live))
+        self.times.append(time)
+        self.events.append(event_type)
+        self.pids.append(pid)
+        self.delta_pos.append(len(self.deltas))
+
+    def __len__(self):
+        if self.mode == "sampled":
+            return len(self._samples)
+        return len(self.times)
+
+    def _queue_before(self, index):
+        """重建第 index 个事件发生前的就绪队列（进程号，按入队顺序）"""
+        base = index // self.CHECKPOINT_EVERY * self.CHECKPOINT_EVERY
+        cursor = self._cursor
+        if cursor is not None and base <= cursor[0] <= index:
+            # 顺序向后访问时从上一次的位置继续重放
+            pos, live = self.delta_pos[cursor[0]], cursor[1]
+        else:
+            pos = self.delta_pos[base]
+            live = dict.fromkeys(self._checkpoints[base // self.CHECKPOINT_EVERY])
+        end = self.delta_pos[index]
+        deltas = self.deltas
+        while pos < end:
+            code = deltas[pos]
+            if code & 1:
+                del live[code >> 1]
+            else:
+                live[code >> 1] = None
+            pos += 1
+        self._cursor = (index, live)
+        return live
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("时间线下标越界")
+        if self.mode == "sampled":
+            return self._samples[index]
+
+        pid = self.pids[index]
+        names = self.names
+        time = self.times[index]
+        return {
+            'time': int(time) if time.is_integer() else time,
+            'event': self.events[index],
+            'process': names[pid] if pid >= 0 else None,
+            'ready_queue': [names[p] for p in self._queue_before(index)]
+        }
+
+    def event_times(self):
+        """各条记录的时刻（按发生顺序），供按时间定位"""
+        if self.mode == "sampled":
+            return [s['time'] for s in self._samples]
+        return self.times
+
+    def summary(self, index, limit):
+        """第 index 条记录的 (时间, 事件类型, 进程名, 就绪队列前 limit 个进程名, 就绪队列长度)
+
+        与 self[index] 内容相同，但不构造完整的就绪队列列表，队列很长时开销只与 limit 有关。
+        """
+        if self.mode == "sampled":
+            entry = self._samples[index]
+            queue = entry['ready_queue']
+            return entry['time'], entry['event'], entry['process'], queue[:limit], len(queue)
+
+        pid = self.pids[index]
+        names = self.names
+        time = self.times[index]
+        live = self._queue_before(index)
+        return (int(time) if time.is_integer() else time, self.events[index], names[pid] if pid >= 0 else None,
+                [names[p] for p in islice(live, limit)], len(live))
+
+    def snapshot_at(self, time):
+        """返回时刻 time 处理完所有事件后的就绪队列（进程名列表）"""
+        if self.mode == "sampled":
+            times = [s['time'] for s in self._samples]
+            i = bisect.bisect_right(times, time) - 1
+            return list(self._samples[i]['ready_queue']) if i >= 0 else []
+
+        # 找到第一个晚于 time 的事件，它发生之前的队列即为所求
+        index = bisect.bisect_right(self.times, time)
+        if index == len(self.times):
+            return [self.names[p] for p in self._live]
+        return [self.names[p] for p in self._queue_before(index)]
+
+
+def make_timeline(mode, every=1):
+    """根据模式创建时间线记录器，off 模式返回 None"""
+    if mode in (None, False, "off"):
+        return None
+    if mode is True:
+        mode = "full"
+    return TimelineRecorder(mode, every)
@@ -0,0 +1,129 @@
+import numpy as np
+from matplotlib import animation
+
+EVENT_NAMES = {
+    0: "进程到达",
+    1: "进程开始",
+    2: "进程完成",
+    3: "时间片到期"
+}
+
+MIN_INTERVAL = 50  # 每帧最短间隔（毫秒），即最高 20 帧/秒
+MAX_INTERVAL = 500  # 事件少时每帧的间隔（毫秒）
+MAX_DURATION = 60  # 动画的最长播放时间（秒）
+MAX_FRAMES = MAX_DURATION * 1000 // MIN_INTERVAL
+QUEUE_SLOTS = 5  # 图中最多画出的就绪进程数
+QUEUE_NAMES = 10  # 就绪队列文字中最多列出的进程名
+
+
+class TimelineFrames:
+    """时间线动画每一帧要显示的内容，在播放之前一次算好
+
+    time_step 为空时每个事件一帧；给出时按时间缩放，每帧前进 time_step 个时间单位，
+    显示该时刻之前最后一个事件。帧数超过 max_frames 时等间隔跳帧（逐事件时跳过事件，
+    按时间缩放时加大每帧的时间步长），因此帧数和播放时间与时间线长度无关。
+    timeline 为 TimelineRecorder，就绪队列只取出前若干个，不构造完整列表。
+    """
+
+    def __init__(self, timeline, time_step=None, max_frames=MAX_FRAMES):
+        if time_step is not None and time_step <= 0:
+            raise ValueError("每帧时间必须是正数")
+        times = np.asarray(timeline.event_times(), dtype=np.float64)
+        n = len(times)
+        max_frames = max(2, max_frames)
+        if time_step:
+            span = times[-1] - times[0]
+            step = max(time_step, span / (max_frames - 1))
+            count = int(np.ceil(span / step)) + 1 if span > 0 else 1
+            self.time = np.minimum(times[0] + np.arange(count) * step, times[-1])
+            # 同一时刻有多个事件时显示最后一个
+            self.index = np.searchsorted(times, self.time, side='right') - 1
+        else:
+            stride = -(-n // max_frames)
+            self.index = np.arange(0, n, stride)
+            if self.index[-1] != n - 1:
+                self.index[-1] = n - 1  # 最后一帧总是最后一个事件
+            self.time = times[self.index]
+        self.start, self.end = float(times[0]), float(times[-1])
+
+        self.labels = []  # (时间, 事件, 当前进程, 就绪队列) 四行文字
+        self.queue = []  # 图中画出的就绪进程名
+        self.process = []  # 当前进程名或 None
+        for frame, i in zip(self.time.tolist(), self.index.tolist()):
+            time, event, process, head, length = timeline.summary(i, QUEUE_NAMES)
+            if time_step:
+                time = int(frame) if frame.is_integer() else round(frame, 6)
+            queue_list = ", ".join(head) or "空"
+            if length > len(head):
+                queue_list += f" ...（共 {length} 个）"
+            self.labels.append((f'时间: {time}', f'事件: {EVENT_NAMES.get(event, "未知事件")}',
+                                f'当前进程: {process or "无"}', f'就绪队列: {queue_list}'))
+            self.queue.append(head[:QUEUE_SLOTS])
+            self.process.append(process)
+
+    def __len__(self):
+        return len(self.index)
+
+    def interval(self):
+        """每帧间隔（毫秒）：帧少时保持原来的 500 毫秒，帧多时缩短，总时长不超过 MAX_DURATION"""
+        return int(np.clip(MAX_DURATION * 1000 / len(self), MIN_INTERVAL, MAX_INTERVAL))
+
+
+class TimelineAnimation:
+    """用 blit 播放 TimelineFrames
+
+    坐标轴、标题等静态内容只画一次并缓存为背景；每帧只修改内容有变化的文字和竖线，
+    由 blit 把这些动态元素画到背景上，每帧的开销不随仿真长度增长。
+    """
+
+    def __init__(self, fig, ax, frames, interval=None):
+        self.frames = frames
+        self.ax = ax
+        ax.set_xlim(0, frames.end + 5)
+        ax.set_ylim(-0.5, 2.5)
+        ax.set_xlabel('时间')
+        ax.set_title('进程调度时间线动画')
+
+        # 当前时间点
+        self.cursor = ax.axvline(x=frames.start, color='r', linestyle='--', alpha=0.5, animated=True)
+        # 状态文本
+        self.texts = [ax.text(0.02, y, '', transform=ax.transAxes, fontsize=12, animated=True)
+                      for y in (0.95, 0.90, 0.85, 0.80)]
+        # 就绪队列（最多显示 QUEUE_SLOTS 个就绪进程）
+        self.queue_positions = np.linspace(1.5, 0.5, QUEUE_SLOTS)
+        self.queue_boxes = [ax.text(0, y, '', bbox=dict(boxstyle="round", fc="lightblue", ec="blue", alpha=0.7),
+                                    fontsize=10, ha='center', visible=False, animated=True)
+                            for y in self.queue_positions]
+        # 当前运行的进程
+        self.running = ax.text(0, 2, '', bbox=dict(boxstyle="round", fc="lightgreen", ec="green", alpha=0.7),
+                               fontsize=12, ha='center', visible=False, animated=True)
+        self.artists = (self.cursor, *self.texts, *self.queue_boxes, self.running)
+        self._shown = {}  # 元素 -> 当前显示的内容，内容不变时不修改
+
+        self.animation = animation.FuncAnimation(
+            fig, self.draw_frame, frames=len(frames), init_func=lambda: self.artists, blit=True,
+            interval=frames.interval() if interval is None else interval, repeat=False)
+
+    def _set(self, artist, value, update):
+        if self._shown.get(artist) != value:
+            self._shown[artist] = value
+            update(value)
+
+    def _set_box(self, box, text, x):
+        if text is None:
+            self._set(box, None, lambda _: box.set_visible(False))
+        else:
+            self._set(box, (text, x), lambda v: (box.set_text(v[0]), box.set_x(v[1]), box.set_visible(True)))
+
+    def draw_frame(self, i):
+        frames = self.frames
+        time = float(frames.time[i])
+        self._set(self.cursor, time, lambda t: self.cursor.set_xdata([t, t]))
+        for text, label in zip(self.texts, frames.labels[i]):
+            self._set(text, label, text.set_text)
+
+        queue = frames.queue[i]
+        for j, box in enumerate(self.queue_boxes):
+            self._set_box(box, queue[j] if j < len(queue) else None, time + 1)
+        self._set_box(self.running, frames.process[i], time)
+        return self.artists
@@ -1,393 +1,13 @@
 import sys
-import matplotlib.pyplot as plt
-import pandas as pd
-import numpy as np
-from matplotlib.patches import Patch
+
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QTableWidget, QTableWidgetItem, QPushButton, QLabel,
                              QHeaderView, QMessageBox, QGroupBox, QLineEdit, QComboBox)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QIntValidator
 
-# 设置中文字体支持
-plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'WenQuanYi Micro Hei', 'sans-serif']
-plt.rcParams['axes.unicode_minus'] = False
-
-
-class Job:
-    """作业类"""
-
-    def __init__(self, name: str, arrival_time: int, service_time: int):
-        self.name = name
-        self.arrival_time = arrival_time
-        self.service_time = service_time
-        self.remaining_time = service_time
-        self.start_time = -1
-        self.end_time = -1
-        self.current_queue = 0  # 当前所在的队列(0,1,2)
-        self.execution_history = []  # 记录执行历史，用于可视化
-        self.queue_entry_time = {}  # 记录进入每个队列的时间
-        self.last_queue_change_time = 0  # 最后一次队列变化的时间
-
-
-class MLFQScheduler:
-    """多级反馈队列调度器类"""
-
-    def __init__(self, enable_priority_boost=False, boost_threshold=5):
-        self.jobs = []  # 所有作业
-        self.ready_queues = [[] for _ in range(3)]  # 3个就绪队列
-        self.current_job = None  # 当前正在运行的作业
-        self.current_time = 0  # 当前系统时间
-        self.next_job_index = 0  # 下一个要处理的作业索引
-        self.time_slices = [1, 2, 4]  # 时间片大小配置
-        self.scheduling_log = []  # 调度日志，用于可视化
-        self.enable_priority_boost = enable_priority_boost  # 是否启用优先级提升
-        self.boost_threshold = boost_threshold  # 优先级提升阈值
-
-    def add_job(self, job: Job) -> None:
-        """添加作业"""
-        self.jobs.append(job)
-
-    def run(self) -> None:
-        """运行调度器"""
-        # 按到达时间排序
-        self.jobs.sort(key=lambda x: x.arrival_time)
-
-        print("多级反馈队列调度过程:")
-        print(f"算法: {'变种算法' if self.enable_priority_boost else '原版算法'}")
-        if self.enable_priority_boost:
-            print(f"优先级提升阈值: {self.boost_threshold}时间单位")
-        print("时间\t事件")
-        print("----------------")
-
-        # 记录初始状态
-        self._log_state("开始调度")
-
-        # 主循环
-        while True:
-            # 添加所有已到达但未处理的作业到就绪队列0
-            while (self.next_job_index < len(self.jobs) and
-                   self.jobs[self.next_job_index].arrival_time <= self.current_time):
-
-                job = self.jobs[self.next_job_index]
-                print(f"{self.current_time}\t{job.name} 到达，进入队列0")
-                self._log_state(f"{job.name}到达")
-
-                if job.start_time == -1:
-                    job.start_time = self.current_time
-
-                # 记录进入队列0的时间
-                job.queue_entry_time[0] = self.current_time
-                job.last_queue_change_time = self.current_time
-
-                self.ready_queues[0].append(job)
-                self.next_job_index += 1
-
-                # 检查是否需要抢占当前作业
-                if (self.current_job is not None and
-                        self.current_job.current_queue > 0):
-                    print(f"{self.current_time}\t抢占 {self.current_job.name}，新作业{job.name}有更高优先级")
-                    self.ready_queues[self.current_job.current_queue].append(self.current_job)
-                    self._log_state(f"抢占{self.current_job.name}")
-                    self.current_job = None
-
-            # 检查并处理优先级提升（变种算法）
-            if self.enable_priority_boost:
-                self._check_priority_boost()
-
-            # 如果CPU空闲，从就绪队列中选择作业
-            if self.current_job is None:
-                # 找到最高优先级的非空队列
-                queue_idx = -1
-                for i in range(3):
-                    if self.ready_queues[i]:
-                        queue_idx = i
-                        break
-
-                if queue_idx == -1:
-                    # 如果没有作业在等待，但有作业未到达，跳到下一个作业的到达时间
-                    if self.next_job_index < len(self.jobs):
-                        self.current_time = self.jobs[self.next_job_index].arrival_time
-                        continue
-                    else:
-                        # 所有作业都处理完毕
-                        break
-
-                # 从队列中取出作业
-                self.current_job = self.ready_queues[queue_idx].pop(0)
-                self.current_job.current_queue = queue_idx
-
-                # 计算本次运行时间
-                allocated_time = min(self.time_slices[queue_idx], self.current_job.remaining_time)
-                print(
-                    f"{self.current_time}\t{self.current_job.name} 从队列{queue_idx}开始运行 ({allocated_time}时间单位)")
-                self._log_state(f"{self.current_job.name}开始运行")
-
-                # 记录执行开始
-                execution_start = self.current_time
-
-                # 检查是否有新作业会在此期间到达
-                actual_run_time = allocated_time
-                if self.next_job_index < len(self.jobs):
-                    next_arrival = self.jobs[self.next_job_index].arrival_time
-                    if self.current_time + actual_run_time > next_arrival:
-                        actual_run_time = next_arrival - self.current_time
-                        print(f"{self.current_time}\t注意: {self.current_job.name} 的运行将被新作业到达中断")
-
-                # 推进时间
-                self.current_time += actual_run_time
-                self.current_job.remaining_time -= actual_run_time
-
-                # 记录执行历史
-                self.current_job.execution_history.append(
-                    (execution_start, self.current_time, self.current_job.current_queue)
-                )
-
-                # 检查作业是否完成
-                if self.current_job.remaining_time == 0:
-                    print(f"{self.current_time}\t{self.current_job.name} 完成")
-                    self.current_job.end_time = self.current_time
-                    self._log_state(f"{self.current_job.name}完成")
-                    self.current_job = None
-                elif actual_run_time < allocated_time:
-                    # 作业被新作业到达中断
-                    print(
-                        f"{self.current_time}\t{self.current_job.name} 被新作业中断，剩余时间: {self.current_job.remaining_time}")
-
-                    # 记录进入队列的时间
-                    self.current_job.queue_entry_time[self.current_job.current_queue] = self.current_time
-                    self.current_job.last_queue_change_time = self.current_time
-
-                    self.ready_queues[self.current_job.current_queue].append(self.current_job)
-                    self._log_state(f"{self.current_job.name}被中断")
-                    self.current_job = None
-                else:
-                    # 时间片用完，但作业未完成
-                    print(
-                        f"{self.current_time}\t{self.current_job.name} 在队列{self.current_job.current_queue}时间片用完，剩余时间: {self.current_job.remaining_time}")
-
-                    # 降级到下一队列
-                    next_queue = min(self.current_job.current_queue + 1, 2)
-                    print(f"{self.current_time}\t{self.current_job.name} 降级到队列{next_queue}")
-
-                    self.current_job.current_queue = next_queue
-
-                    # 记录进入新队列的时间
-                    self.current_job.queue_entry_time[next_queue] = self.current_time
-                    self.current_job.last_queue_change_time = self.current_time
-
-                    self.ready_queues[next_queue].append(self.current_job)
-                    self._log_state(f"{self.current_job.name}降级到队列{next_queue}")
-                    self.current_job = None
-            else:
-                # 这不应该发生，因为我们在上面已经处理了所有情况
-                break
-
-        # 输出结果
-        self.print_results()
-
-        # 生成可视化
-        self.visualize_scheduling()
-
-    def _check_priority_boost(self):
-        """检查并处理优先级提升（变种算法）"""
-        # 只检查队列1和队列2（低优先级队列）
-        for queue_idx in [1, 2]:
-            jobs_to_boost = []
-
-            # 遍历队列中的每个作业
-            for job in self.ready_queues[queue_idx]:
-                # 计算在当前队列的等待时间
-                if queue_idx in job.queue_entry_time:
-                    wait_time = self.current_time - job.queue_entry_time[queue_idx]
-
-                    # 如果等待时间超过阈值，则提升优先级
-                    if wait_time >= self.boost_threshold:
-                        jobs_to_boost.append(job)
-
-            # 提升符合条件的作业优先级
-            for job in jobs_to_boost:
-                # 从当前队列移除
-                self.ready_queues[queue_idx].remove(job)
-
-                # 提升到上一级队列（但不能超过队列0）
-                new_queue = max(0, queue_idx - 1)
-                job.current_queue = new_queue
-
-                # 记录进入新队列的时间
-                job.queue_entry_time[new_queue] = self.current_time
-                job.last_queue_change_time = self.current_time
-
-                # 添加到新队列
-                self.ready_queues[new_queue].append(job)
-
-                print(f"{self.current_time}\t{job.name} 在队列{queue_idx}等待时间超过阈值，提升到队列{new_queue}")
-                self._log_state(f"{job.name}优先级提升")
-
-    def _log_state(self, event: str) -> None:
-        """记录调度状态"""
-        queue_states = []
-        for i, queue in enumerate(self.ready_queues):
-            queue_states.append([job.name for job in queue])
-
-        current_job_name = self.current_job.name if self.current_job else "None"
-
-        self.scheduling_log.append({
-            'time': self.current_time,
-            'event': event,
-            'current_job': current_job_name,
-            'queue0': queue_states[0].copy(),
-            'queue1': queue_states[1].copy(),
-            'queue2': queue_states[2].copy()
-        })
-
-    def print_results(self) -> None:
-        """输出调度结果"""
-        print("\n调度结果:")
-        print("作业\t到达时间\t开始时间\t完成时间\t周转时间")
-        print("----------------------------------------")
-
-        total_turnaround = 0
-        for job in self.jobs:
-            turnaround = job.end_time - job.arrival_time
-            total_turnaround += turnaround
-
-            print(f"{job.name}\t{job.arrival_time}\t\t{job.start_time}\t\t{job.end_time}\t\t{turnaround}")
-
-        print(f"\n平均周转时间: {total_turnaround / len(self.jobs):.2f}")
-        print(f"总周转时间: {total_turnaround}")
-
-    def visualize_scheduling(self) -> None:
-        """生成调度过程可视化"""
-        if not self.jobs:
-            return
-
-        # 创建图形
-        fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 10))
-        fig.suptitle('多级反馈队列调度算法可视化', fontsize=16, fontweight='bold')
-
-        # 1. 甘特图
-        self._create_gantt_chart(ax1)
-
-        # 2. 队列状态随时间变化图
-        self._create_queue_status_chart(ax2)
-
-        # 3. 统计信息图
-        self._create_statistics_chart(ax3)
-
-        plt.tight_layout()
-        plt.show()
-
-        # 打印详细调度日志
-        self._print_detailed_log()
-
-    def _create_gantt_chart(self, ax) -> None:
-        """创建甘特图"""
-        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57', '#FF9AA2', '#FFB7B2', '#FFDAC1', '#E2F0CB',
-                  '#B5EAD7']  # 不同作业的颜色
-
-        for i, job in enumerate(self.jobs):
-            for start, end, queue in job.execution_history:
-                # 使用作业颜色，但根据队列调整亮度
-                color = colors[i % len(colors)]
-                # 根据队列深度调整颜色亮度
-                brightness = 0.7 + queue * 0.1
-                color = self._adjust_color_brightness(color, brightness)
-
-                # 绘制执行条
-                bar = ax.barh(job.name, end - start, left=start, height=0.6,
-                              color=color, edgecolor='black', alpha=0.8)
-
-                # 在条形中间添加队列信息
-                ax.text((start + end) / 2, i, f'Q{queue}',
-                        ha='center', va='center', fontweight='bold')
-
-                # 在条形上方添加时间范围
-                time_range = f"{start}-{end}"
-                ax.text((start + end) / 2, i + 0.25, time_range,
-                        ha='center', va='center', fontsize=8)
-
-        ax.set_xlabel('时间')
-        ax.set_ylabel('作业')
-        ax.set_title('作业执行甘特图')
-        ax.grid(True, alpha=0.3)
-
-        # 创建图例
-        legend_elements = [
-            Patch(facecolor=colors[i], label=f'作业 {job.name}')
-            for i, job in enumerate(self.jobs)
-        ]
-        ax.legend(handles=legend_elements, loc='upper right')
-
-    def _create_queue_status_chart(self, ax) -> None:
-        """创建队列状态图"""
-        times = [log['time'] for log in self.scheduling_log]
-        queue0_lengths = [len(log['queue0']) for log in self.scheduling_log]
-        queue1_lengths = [len(log['queue1']) for log in self.scheduling_log]
-        queue2_lengths = [len(log['queue2']) for log in self.scheduling_log]
-
-        ax.plot(times, queue0_lengths, label='队列0', color='red', linewidth=2, marker='o')
-        ax.plot(times, queue1_lengths, label='队列1', color='blue', linewidth=2, marker='s')
-        ax.plot(times, queue2_lengths, label='队列2', color='green', linewidth=2, marker='^')
-
-        ax.set_xlabel('时间')
-        ax.set_ylabel('队列长度')
-        ax.set_title('队列状态随时间变化')
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        ax.set_ylim(bottom=0)
-
-    def _create_statistics_chart(self, ax) -> None:
-        """创建统计信息图"""
-        # 计算统计信息
-        job_names = [job.name for job in self.jobs]
-        turnaround_times = [job.end_time - job.arrival_time for job in self.jobs]
-        wait_times = [turnaround - job.service_time for job, turnaround in zip(self.jobs, turnaround_times)]
-
-        x = np.arange(len(job_names))
-        width = 0.35
-
-        bars1 = ax.bar(x - width / 2, turnaround_times, width, label='周转时间', color='lightblue', alpha=0.7)
-        bars2 = ax.bar(x + width / 2, wait_times, width, label='等待时间', color='lightcoral', alpha=0.7)
-
-        ax.set_xlabel('作业')
-        ax.set_ylabel('时间')
-        ax.set_title('作业调度统计信息')
-        ax.set_xticks(x)
-        ax.set_xticklabels(job_names)
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-
-        # 在柱子上添加数值
-        for bar in bars1:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width() / 2., height,
-                    f'{height:.0f}', ha='center', va='bottom')
-
-        for bar in bars2:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width() / 2., height,
-                    f'{height:.0f}', ha='center', va='bottom')
-
-    def _adjust_color_brightness(self, color, factor):
-        """调整颜色亮度"""
-        import matplotlib.colors as mc
-        import colorsys
-        try:
-            c = mc.cnames[color]
-        except:
-            c = color
-        c = colorsys.rgb_to_hls(*mc.to_rgb(c))
-        return colorsys.hls_to_rgb(c[0], max(0, min(1, factor * c[1])), c[2])
-
-    def _print_detailed_log(self) -> None:
-        """打印详细调度日志"""
-        print("\n" + "=" * 60)
-        print("详细调度日志")
-        print("=" * 60)
-
-        df_log = pd.DataFrame(self.scheduling_log)
-        print(df_log.to_string(index=False))
+# 调度核心在 mlfq.py 中（不依赖图形界面），这里只是输入界面
+from mlfq import Job, MLFQScheduler
 
 
 class JobInputWindow(QMainWindow):
@@ -432,6 +52,12 @@ class JobInputWindow(QMainWindow):
         self.threshold_input.setFixedWidth(50)
         algorithm_layout.addWidget(self.threshold_input)
 
+        # 各级队列的时间片（逗号分隔，个数即队列数）
+        algorithm_layout.addWidget(QLabel("各级时间片:"))
+        self.time_slices_input = QLineEdit("1,2,4")
+        self.time_slices_input.setFixedWidth(100)
+        algorithm_layout.addWidget(self.time_slices_input)
+
         algorithm_layout.addStretch()
         self.main_layout.addWidget(algorithm_group)
 
@@ -639,8 +265,18 @@ class JobInputWindow(QMainWindow):
             QMessageBox.warning(self, "输入错误", "优先级提升阈值必须是整数")
             return
 
+        # 获取各级时间片
+        try:
+            time_slices = [int(s) for s in self.time_slices_input.text().split(',') if s.strip()]
+            if not time_slices or min(time_slices) <= 0:
+                raise ValueError
+        except ValueError:
+            QMessageBox.warning(self, "输入错误", "各级时间片必须是逗号分隔的正整数")
+            return
+
         # 创建调度器并添加作业
-        scheduler = MLFQScheduler(enable_priority_boost=enable_priority_boost, boost_threshold=threshold)
+        scheduler = MLFQScheduler(enable_priority_boost=enable_priority_boost, boost_threshold=threshold,
+                                  time_slices=time_slices, log_level="full", visualize=True)
         for name, arrival, service in jobs:
             scheduler.add_job(Job(name, arrival, service))
 
@@ -0,0 +1,108 @@
+import csv
+import json
+import os
+import sys
+
+
+def _number(value, field, line_no):
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"第{line_no}行: 字段 {field} 不是有效的数字: {value!r}")
+
+
+def _detect_format(path, fmt):
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.jsonl', '.ndjson', '.json'):
+        return 'jsonl'
+    return 'csv'
+
+
+def _open_input(path):
+    if path == '-':
+        return sys.stdin
+    return open(path, newline='', encoding='utf-8')
+
+
+def _records(stream, fmt):
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for line_no, row in enumerate(reader, start=2):
+            yield line_no, row
+    elif fmt == 'jsonl':
+        for line_no, line in enumerate(stream, start=1):
+            line = line.strip()
+            if line:
+                yield line_no, json.loads(line)
+    else:
+        raise ValueError(f"不支持的文件格式: {fmt}")
+
+
+def _optional(record, field, line_no):
+    value = record.get(field)
+    if value is None or value == '':
+        return None
+    value = _number(value, field, line_no)
+    if value <= 0:
+        raise ValueError(f"第{line_no}行: {field} 必须大于0")
+    return value
+
+
+def read_trace(path, fmt=None, realtime=False):
+    """逐行读取进程轨迹文件，产出 (name, arrival, burst, priority)
+
+    支持带表头的 CSV（name,arrival,burst[,priority]）和每行一个 JSON 对象的 JSONL，
+    path 为 '-' 时从标准输入读取。文件按需读取，不会一次性载入内存。
+    realtime 为 True 时另外读取可选的 deadline、period 两列，产出六元组。
+    """
+    fmt = _detect_format(path, fmt)
+    stream = _open_input(path)
+    try:
+        for index, (line_no, record) in enumerate(_records(stream, fmt)):
+            name = record.get('name') or f"P{index}"
+            arrival = _number(record.get('arrival'), 'arrival', line_no)
+            burst = _number(record.get('burst'), 'burst', line_no)
+            priority = _number(record.get('priority') or 0, 'priority', line_no)
+            if arrival < 0:
+                raise ValueError(f"第{line_no}行: 到达时间不能为负数")
+            if burst <= 0:
+                raise ValueError(f"第{line_no}行: 执行时间必须大于0")
+            if realtime:
+                yield (name, arrival, burst, priority,
+                       _optional(record, 'deadline', line_no), _optional(record, 'period', line_no))
+            else:
+                yield name, arrival, burst, priority
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+class ResultWriter:
+    """将结果逐条写出为 CSV 或 JSONL"""
+
+    FIELDS = ['record', 'algorithm', 'name', 'arrival', 'burst', 'start', 'finish', 'turnaround', 'waiting', 'count']
+
+    def __init__(self, stream, fmt='csv', extra_fields=()):
+        if fmt not in ('csv', 'jsonl'):
+            raise ValueError(f"不支持的输出格式: {fmt}")
+        self.stream = stream
+        self.fmt = fmt
+        self._csv = None
+        if fmt == 'csv':
+            self._csv = csv.DictWriter(stream, fieldnames=self.FIELDS + list(extra_fields), extrasaction='ignore',
+                                       lineterminator='\n')
+            self._csv.writeheader()
+
+    def write(self, record):
+        if self._csv is not None:
+            self._csv.writerow(record)
+        else:
+            self.stream.write(json.dumps(record, ensure_ascii=False) + '\n')
@@ -0,0 +1,187 @@
+"""可复现的合成负载生成
+
+在本目录下运行：
+    python -m workload -n 100000 --seed 1 -o trace.csv
+    python -m workload -n 1000000 --arrivals bursty --service pareto --load 0.9 --integer -o big.csv
+
+用 NumPy 批量生成 arrival/burst/priority 数组，同一个种子总是得到相同的负载，
+分块流式生成与一次生成的结果逐位相同。生成的负载可以直接交给 SchedulerSimulator
+（processes()）、多级反馈队列调度器 MLFQScheduler（jobs() / add_to()）和 sweep。
+
+负载因子 ρ = λ · E[S] / cpus，给定 ρ 和平均服务时间 E[S] 即确定到达率 λ。
+"""
+import argparse
+import sys
+
+import numpy as np
+
+ARRIVALS = ("poisson", "bursty")
+SERVICES = ("exponential", "lognormal", "pareto")
+
+
+class Workload:
+    """一块负载：三列 NumPy 数组，进程名为 P{first + 下标}"""
+
+    def __init__(self, arrival, burst, priority, first=0):
+        self.arrival = arrival
+        self.burst = burst
+        self.priority = priority
+        self.first = first
+
+    def __len__(self):
+        return len(self.arrival)
+
+    def columns(self):
+        """(arrival, burst, priority)，可直接传给 fast_path.run_vectorized 或 sweep.SharedWorkload"""
+        return self.arrival, self.burst, self.priority
+
+    def rows(self):
+        """逐个产出 (name, arrival, burst, priority)，与 trace_io.read_trace 的格式相同"""
+        columns = [c.tolist() for c in self.columns()]
+        for i, (a, b, p) in enumerate(zip(*columns)):
+            yield f"P{self.first + i}", a, b, p
+
+    def processes(self):
+        """SchedulerSimulator 使用的进程列表"""
+        from simulator import Process
+
+        return [Process(*row) for row in self.rows()]
+
+    def jobs(self):
+        """MLFQScheduler 使用的作业列表，时间取整（服务时间至少为 1）"""
+        from mlfq import Job
+
+        arrival = np.floor(self.arrival).astype(np.int64).tolist()
+        service = np.maximum(1, np.rint(self.burst)).astype(np.int64).tolist()
+        return [Job(f"P{self.first + i}", a, s) for i, (a, s) in enumerate(zip(arrival, service))]
+
+    def add_to(self, scheduler):
+        """把作业加入 MLFQScheduler"""
+        for job in self.jobs():
+            scheduler.add_job(job)
+
+    def write_csv(self, stream, header=True):
+        """写成 scheduler_cli / sweep 可读的轨迹文件"""
+        if header:
+            stream.write("name,arrival,burst,priority\n")
+        for name, a, b, p in self.rows():
+            stream.write(f"{name},{a},{b},{p}\n")
+
+
+def _service(rng, kind, mean, size, sigma, alpha):
+    """均值为 mean 的服务时间"""
+    if kind == "exponential":
+        return rng.exponential(mean, size)
+    if kind == "lognormal":
+        # E[S] = exp(μ + σ²/2)
+        return rng.lognormal(np.log(mean) - sigma * sigma / 2, sigma, size)
+    if kind == "pareto":
+        # E[S] = xm · α / (α - 1)，numpy 的 pareto 为 Lomax 分布，加 1 后乘 xm
+        return (rng.pareto(alpha, size) + 1) * (mean * (alpha - 1) / alpha)
+    raise ValueError(f"不支持的服务时间分布: {kind}")
+
+
+def stream(n, chunk_size=65536, arrivals="poisson", service="exponential", load=0.8, mean_service=4.0,
+           cpus=1, priority_levels=5, seed=None, burst_size=8.0, sigma=1.0, alpha=2.5, integer=False):
+    """惰性地按块生成 n 个进程，每块为一个 Workload
+
+    - arrivals：poisson 为指数间隔；bursty 为成批到达，每批平均 burst_size 个进程同时到达，
+      批与批之间为指数间隔，总到达率与 poisson 相同。
+    - service：exponential / lognormal（对数标准差 sigma）/ pareto（形状 alpha，需大于 1）。
+    - priority_levels：优先级在 [0, priority_levels) 中均匀取整数。
+    - integer：到达时间向下取整、服务时间四舍五入且至少为 1，适合整数时间的调度器。
+    """
+    if arrivals not in ARRIVALS:
+        raise ValueError(f"不支持的到达过程: {arrivals}")
+    if service not in SERVICES:
+        raise ValueError(f"不支持的服务时间分布: {service}")
+    if load <= 0 or mean_service <= 0 or cpus < 1 or chunk_size < 1 or priority_levels < 1:
+        raise ValueError("负载因子、平均服务时间、CPU 数、块大小和优先级个数必须为正数")
+    if service == "pareto" and alpha <= 1:
+        raise ValueError("Pareto 分布的形状参数必须大于 1，否则均值不存在")
+    if arrivals == "bursty" and burst_size < 1:
+        raise ValueError("平均批大小不能小于 1")
+    # 参数在调用时检查，生成过程惰性进行
+    return _chunks(n, chunk_size, arrivals, service, load, mean_service, cpus, priority_levels, seed,
+                   burst_size, sigma, alpha, integer)
+
+
+def _chunks(n, chunk_size, arrivals, service, load, mean_service, cpus, priority_levels, seed,
+            burst_size, sigma, alpha, integer):
+    # 每一列用独立的随机数流，分块生成与一次生成的结果相同
+    gap_rng, batch_rng, service_rng, priority_rng = (
+        np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(4))
+    mean_gap = mean_service / (load * cpus)
+    last = 0.0
+    for first in range(0, n, chunk_size):
+        size = min(chunk_size, n - first)
+        if arrivals == "poisson":
+            gaps = gap_rng.exponential(mean_gap, size)
+        else:
+            # 每个进程以 1/burst_size 的概率开始新的一批，否则与上一个进程同时到达
+            new_batch = batch_rng.random(size) < 1 / burst_size
+            gaps = np.where(new_batch, gap_rng.exponential(mean_gap * burst_size, size), 0.0)
+        # 把上一块的最后到达时刻并入第一个间隔，累加顺序与一次生成时相同，结果逐位一致
+        gaps[0] += last
+        arrival = np.cumsum(gaps)
+        last = arrival[-1]
+        burst = _service(service_rng, service, mean_service, size, sigma, alpha)
+        priority = priority_rng.integers(0, priority_levels, size)
+        if integer:
+            arrival = np.floor(arrival).astype(np.int64)
+            burst = np.maximum(1, np.rint(burst)).astype(np.int64)
+        yield Workload(arrival, burst, priority, first)
+
+
+def generate(n, **options):
+    """一次生成 n 个进程，参数同 stream()"""
+    chunks = list(stream(n, chunk_size=max(n, 1), **options))
+    if not chunks:
+        empty = np.empty(0, dtype=np.int64 if options.get('integer') else np.float64)
+        return Workload(empty, empty, np.empty(0, dtype=np.int64))
+    return chunks[0]
+
+
+def arrivals_of(chunks):
+    """把分块负载展开成按到达时间排序的进程，用于 SchedulerSimulator.stream()"""
+    for chunk in chunks:
+        yield from chunk.processes()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m workload', description='生成可复现的合成调度负载')
+    parser.add_argument('-n', type=int, default=10000, help='进程数，默认 10000')
+    parser.add_argument('--arrivals', choices=ARRIVALS, default='poisson', help='到达过程，默认 poisson')
+    parser.add_argument('--service', choices=SERVICES, default='exponential', help='服务时间分布，默认 exponential')
+    parser.add_argument('--load', type=float, default=0.8, help='负载因子 ρ，默认 0.8')
+    parser.add_argument('--mean-service', type=float, default=4.0, help='平均服务时间，默认 4')
+    parser.add_argument('--cpus', type=int, default=1, help='负载因子按多少个 CPU 计算，默认 1')
+    parser.add_argument('--priority-levels', type=int, default=5, help='优先级个数，默认 5')
+    parser.add_argument('--burst-size', type=float, default=8.0, help='bursty 到达的平均批大小，默认 8')
+    parser.add_argument('--sigma', type=float, default=1.0, help='lognormal 的对数标准差，默认 1')
+    parser.add_argument('--alpha', type=float, default=2.5, help='pareto 的形状参数，默认 2.5')
+    parser.add_argument('--integer', action='store_true', help='时间取整')
+    parser.add_argument('--seed', type=int, default=None, help='随机种子')
+    parser.add_argument('--chunk-size', type=int, default=65536, help='每块生成的进程数，默认 65536')
+    parser.add_argument('-o', '--output', default='-', help='输出 CSV 文件，默认标准输出')
+    args = parser.parse_args(argv)
+
+    try:
+        chunks = stream(args.n, args.chunk_size, args.arrivals, args.service, args.load, args.mean_service,
+                        args.cpus, args.priority_levels, args.seed, args.burst_size, args.sigma, args.alpha,
+                        args.integer)
+        out = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+        try:
+            for i, chunk in enumerate(chunks):
+                chunk.write_csv(out, header=i == 0)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""word_counter 的测试，在本目录下运行：python -m pytest -q test_word_counter.py"""
+from word_counter import WordCounter2, WordCounter3
+
+
+def test_process_pool_matches_independent(tmp_path):
+    """进程池计数器与独立计数的多线程计数器结果相同，包括读取失败的文件"""
+    files = ['test1.txt', 'test2.txt']
+    for i in range(6):
+        path = tmp_path / f'w{i}.txt'
+        path.write_text(f"Word word{i} 2024, the THE the-end {'x ' * i}", encoding='utf-8')
+        files.append(str(path))
+    files.append(str(tmp_path / 'missing.txt'))
+
+    expected = WordCounter2()
+    expected.process_files(files)
+    for workers in (1, 3):
+        counter = WordCounter3(workers)
+        progress = []
+        counter.set_progress_callback(lambda filename, count: progress.append(filename))
+        counter.process_files(files)
+        assert counter.get_statistics() == expected.get_statistics()
+        assert progress == files
@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""词频统计的三种计数器，不依赖图形界面
+
+main.py 的命令行模式和 gui.py 的图形界面都从这里创建计数器。
+WordCounter3 的工作进程以 spawn/forkserver 方式启动，只需导入本模块（以及不含图形界面的 main.py），
+不会加载 PyQt5 和 matplotlib。
+"""
+import threading
+import re
+import os
+import multiprocessing
+from collections import Counter
+from typing import Dict, List, Callable, Optional
+import queue
+
+
+class WordCounter:
+    def __init__(self):
+        self.total_words = 0
+        self.lock = threading.Lock()
+        self.file_stats = {}
+        self.progress_callback = None
+
+    def set_progress_callback(self, callback):
+        """设置进度回调函数"""
+        self.progress_callback = callback
+
+    def count_words_in_file(self, filename: str) -> Dict:
+        """统计单个文件的词频 - 符合图片中的原则"""
+        try:
+            with open(filename, 'r', encoding='utf-8') as file:
+                content = file.read()
+
+            # 修改正则表达式以符合图片原则：匹配连续的字母或数字字符
+            words = re.findall(r'[a-zA-Z0-9]+', content)
+            word_count = len(words)
+
+            # 获取词频统计（转换为小写以便合并相同单词）
+            word_freq = Counter([word.lower() for word in words])
+
+            # 使用锁保护共享资源
+            with self.lock:
+                self.total_words += word_count
+                self.file_stats[filename] = {
+                    'word_count': word_count,
+                    'word_frequency': word_freq,
+                    'top_words': word_freq.most_common(10)
+                }
+
+            # 更新进度
+            if self.progress_callback:
+                self.progress_callback(filename, word_count)
+
+            return self.file_stats[filename]
+
+        except Exception as e:
+            print(f"Error processing {filename}: {str(e)}")
+            return {}
+
+    def process_files_multithreaded(self, file_list: List[str]) -> None:
+        """使用多线程处理多个文件"""
+        threads = []
+
+        for filename in file_list:
+            thread = threading.Thread(target=self.count_words_in_file, args=(filename,))
+            threads.append(thread)
+            thread.start()
+
+        # 等待所有线程完成
+        for thread in threads:
+            thread.join()
+
+    # 三种计数器统一的入口
+    process_files = process_files_multithreaded
+
+    def get_statistics(self) -> Dict:
+        """获取完整的统计信息"""
+        return {
+            'total_words': self.total_words,
+            'files_processed': len(self.file_stats),
+            'file_statistics': self.file_stats,
+            'combined_word_frequency': self.get_combined_word_frequency(),
+            'average_words_per_file': self.total_words / len(self.file_stats) if self.file_stats else 0
+        }
+
+    def get_combined_word_frequency(self) -> Counter:
+        """获取所有文件的合并词频统计"""
+        combined_freq = Counter()
+        for stats in self.file_stats.values():
+            combined_freq.update(stats['word_frequency'])
+        return combined_freq
+
+
+
+class WordCounter2:
+    def __init__(self):
+        self.total_words = 0
+        self.file_stats = {}
+        self.progress_callback = None
+        self.result_queue = queue.Queue()  # 用于收集线程结果
+
+    def set_progress_callback(self, callback: Callable[[str, int], None]):
+        """设置进度回调函数"""
+        self.progress_callback = callback
+
+    def count_words_in_file(self, filename: str) -> Dict:
+        """统计单个文件的词频 - 独立统计，不更新共享变量"""
+        try:
+            with open(filename, 'r', encoding='utf-8') as file:
+                content = file.read()
+
+            # 匹配连续的字母或数字字符
+            words = re.findall(r'[a-zA-Z0-9]+', content)
+            word_count = len(words)
+            
+            # 获取词频统计（转换为小写以便合并相同单词）
+            word_freq = Counter([word.lower() for word in words])
+            
+            # 创建独立的结果字典
+            result = {
+                'word_count': word_count,
+                'word_frequency': word_freq,
+                'top_words': word_freq.most_common(10)
+            }
+            
+            # 将结果放入队列
+            self.result_queue.put((filename, result))
+            
+            # 更新进度
+            if self.progress_callback:
+                self.progress_callback(filename, word_count)
+                
+            return result
+            
+        except Exception as e:
+            print(f"Error processing {filename}: {str(e)}")
+            # 即使出错也放入空结果，保持队列完整
+            self.result_queue.put((filename, {
+                'word_count': 0,
+                'word_frequency': Counter(),
+                'top_words': []
+            }))
+            return {}
+
+    def process_files_multithreaded(self, file_list: List[str]) -> None:
+        """使用多线程处理多个文件，独立统计，最后合并结果"""
+        threads = []
+        
+        # 重置队列
+        self.result_queue = queue.Queue()
+        
+        for filename in file_list:
+            thread = threading.Thread(target=self.count_words_in_file, args=(filename,))
+            threads.append(thread)
+            thread.start()
+            
+        # 等待所有线程完成
+        for thread in threads:
+            thread.join()
+            
+        # 从队列中收集所有结果并合并
+        self._merge_results(len(file_list))
+
+    # 三种计数器统一的入口
+    process_files = process_files_multithreaded
+
+    def _merge_results(self, file_count: int):
+        """从队列中收集结果并合并到类属性中"""
+        self.file_stats = {}
+        self.total_words = 0
+        
+        # 收集所有文件的结果
+        for _ in range(file_count):
+            filename, result = self.result_queue.get()
+            self.file_stats[filename] = result
+            self.total_words += result['word_count']
+
+    def get_statistics(self) -> Dict:
+        """获取完整的统计信息"""
+        return {
+            'total_words': self.total_words,
+            'files_processed': len(self.file_stats),
+            'file_statistics': self.file_stats,
+            'combined_word_frequency': self.get_combined_word_frequency(),
+            'average_words_per_file': self.total_words / len(self.file_stats) if self.file_stats else 0
+        }
+
+    def get_combined_word_frequency(self) -> Counter:
+        """获取所有文件的合并词频统计"""
+        combined_freq = Counter()
+        for stats in self.file_stats.values():
+            combined_freq.update(stats['word_frequency'])
+        return combined_freq
+
+
+WORD_PATTERN = re.compile(r'[a-zA-Z0-9]+')
+
+
+def _count_words_worker(filename: str):
+    """进程池中统计单个文件，只返回 (文件名, 词数, 词频表, 前10词, 错误信息)
+
+    词频表为普通 dict，传回父进程时序列化的数据量只与不同单词数有关。
+    """
+    try:
+        with open(filename, 'r', encoding='utf-8') as file:
+            content = file.read()
+        words = WORD_PATTERN.findall(content)
+        word_freq = Counter(map(str.lower, words))
+        return filename, len(words), dict(word_freq), word_freq.most_common(10), None
+    except Exception as e:
+        return filename, 0, {}, [], str(e)
+
+
+def _pool_context():
+    """进程池的启动方式：不 fork 图形界面中已有多个线程的进程，有 forkserver 时用 forkserver，否则用 spawn"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+class WordCounter3:
+    """进程池计数器：文件分给多个工作进程统计，避开 GIL，父进程合并各文件的词频表"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.total_words = 0
+        self.file_stats = {}
+        self.progress_callback = None
+        # 工作进程数有上限，默认为 CPU 核数
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def set_progress_callback(self, callback: Callable[[str, int], None]):
+        """设置进度回调函数"""
+        self.progress_callback = callback
+
+    def process_files_multiprocess(self, file_list: List[str]) -> None:
+        """使用进程池处理多个文件，结果按文件顺序合并"""
+        self.file_stats = {}
+        self.total_words = 0
+        if not file_list:
+            return
+
+        workers = min(self.max_workers, len(file_list))
+        # 文件多时每次分发一批，减少进程间通信次数
+        chunksize = max(1, len(file_list) // (workers * 4))
+        with _pool_context().Pool(processes=workers) as pool:
+            for filename, word_count, table, top_words, error in pool.imap(
+                    _count_words_worker, file_list, chunksize):
+                if error is not None:
+                    print(f"Error processing {filename}: {error}")
+                self.file_stats[filename] = {
+                    'word_count': word_count,
+                    'word_frequency': Counter(table),
+                    'top_words': top_words
+                }
+                self.total_words += word_count
+
+                # 更新进度
+                if self.progress_callback:
+                    self.progress_callback(filename, word_count)
+
+    # 三种计数器统一的入口
+    process_files = process_files_multiprocess
+
+    def get_statistics(self) -> Dict:
+        """获取完整的统计信息"""
+        return {
+            'total_words': self.total_words,
+            'files_processed': len(self.file_stats),
+            'file_statistics': self.file_stats,
+            'combined_word_frequency': self.get_combined_word_frequency(),
+            'average_words_per_file': self.total_words / len(self.file_stats) if self.file_stats else 0
+        }
+
+    def get_combined_word_frequency(self) -> Counter:
+        """获取所有文件的合并词频统计"""
+        combined_freq = Counter()
+        for stats in self.file_stats.values():
+            combined_freq.update(stats['word_frequency'])
+        return combined_freq
+
+
+def create_counter(counter_type: str, workers: Optional[int] = None):
+    """按类型创建计数器：shared 共享计数，independent 独立计数，process 进程池（workers 为工作进程数）"""
+    if counter_type == "shared":
+        return WordCounter()
+    if counter_type == "process":
+        return WordCounter3(workers)
+    return WordCounter2()